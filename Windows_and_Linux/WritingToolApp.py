@@ -1,11 +1,15 @@
+import copy
 import gettext
+import importlib
 import json
 import logging
+import mmap
 import os
 import signal
 import sys
 import threading
 import time
+from collections import deque
 
 import darkdetect
 import pyperclip
@@ -15,53 +19,148 @@ from PySide6.QtCore import QLocale, Signal, Slot
 from PySide6.QtGui import QCursor, QGuiApplication
 from PySide6.QtWidgets import QApplication, QMessageBox
 
-import ui.AboutWindow
-import ui.CustomPopupWindow
-import ui.OnboardingWindow
-import ui.ResponseWindow
-import ui.SettingsWindow
-from aiprovider import GeminiProvider, OllamaProvider, OpenAICompatibleProvider
+from aiprovider import GeminiProvider, OllamaProvider, OpenAICompatibleProvider, build_cacheable_messages
+from ui.UIUtils import APP_DIR, APP_ICON_PATH
 from update_checker import UpdateChecker
 
+try:
+    import orjson
+except ImportError:  # orjson é opcional; sem ele usamos o json da biblioteca padrão
+    orjson = None
+
 _ = gettext.gettext
 
+# Abaixo deste tamanho, um read() simples é mais barato que montar um mmap
+MMAP_MIN_SIZE = 4096
+
+# Marcador que o modelo retorna quando o texto é incompatível com a solicitação
+ERROR_MESSAGE = 'ERROR_TEXT_INCOMPATIBLE_WITH_REQUEST'
+ERROR_MESSAGE_CLEAN = ''.join(ERROR_MESSAGE.split())
+# Marcador temporário da área de transferência e parâmetros da consulta após o Ctrl+C (segundos)
+CLIPBOARD_SENTINEL = '\x00WT_CLIP\x00'
+CLIPBOARD_POLL_INTERVAL = 0.005
+# Mesmo tempo total que a leitura original dava a aplicativos lentos (0,2 s + nova tentativa de 0,5 s);
+# pode ser alterado com "clipboard_timeout" no config.json
+CLIPBOARD_POLL_TIMEOUT = 0.7
+# Módulos de interface importados sob demanda e que recebem a função de tradução
+UI_MODULES = ('AboutWindow', 'CustomPopupWindow', 'OnboardingWindow', 'ResponseWindow', 'SettingsWindow')
+# Instrução do sistema das perguntas de acompanhamento; mantida idêntica entre as chamadas
+# para que o prefixo da conversa possa ser reaproveitado pelo cache de prompts dos servidores
+FOLLOWUP_SYSTEM_INSTRUCTION = ("Você é um assistente de IA útil. Forneça respostas claras e diretas, mantendo o mesmo formato e estilo de suas respostas anteriores. "
+                               "Se apropriado, use formatação Markdown para tornar sua resposta mais legível.")
+# Número máximo de trocas (pergunta + resposta) reenviadas nas perguntas de acompanhamento
+MAX_HISTORY_TURNS = 12
+# Papéis do histórico de chat convertidos para os papéis esperados pelo Gemini
+GEMINI_ROLE_MAP = {"user": "user", "assistant": "model"}
+# Intervalo (ms) em que o loop do Qt devolve o controle ao Python para tratar o Ctrl+C
+CTRL_C_CHECK_INTERVAL_MS = 500
+# Número máximo de chamadas simultâneas aos provedores de IA
+MAX_PROVIDER_THREADS = 4
+# Intervalo (ms) para agrupar trechos de saída antes de processá-los na interface
+OUTPUT_FLUSH_INTERVAL_MS = 16
+
+# Caminhos resolvidos uma única vez na importação
+# (APP_DIR e APP_ICON_PATH vêm de ui.UIUtils, a única definição do diretório do aplicativo)
+CONFIG_PATH = os.path.join(APP_DIR, 'config.json')
+OPTIONS_PATH = os.path.join(APP_DIR, 'options.json')
+LOCALE_DIR = os.path.join(os.path.dirname(__file__), 'locales')
+
+
+def read_json_file(path):
+    """
+    Lê e interpreta um arquivo JSON.
+    Arquivos grandes são mapeados em memória e entregues direto ao orjson, sem cópia intermediária.
+    """
+    with open(path, 'rb') as f:
+        if orjson is None:
+            return json.loads(f.read())
+        if os.fstat(f.fileno()).st_size < MMAP_MIN_SIZE:
+            return orjson.loads(f.read())
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+            return orjson.loads(view)
+
+
+class ProviderTask(QtCore.QRunnable):
+    """
+    Tarefa executada em um pool de threads (chamadas aos provedores de IA e gravações em segundo plano).
+    """
+    def __init__(self, fn, *args):
+        super().__init__()
+        self.fn = fn
+        self.args = args
+
+    def run(self):
+        self.fn(*self.args)
+
 
 class WritingToolApp(QtWidgets.QApplication):
     """
     A classe principal do aplicativo Writing Tools.
     """
     output_ready_signal = Signal(str)
+    output_done_signal = Signal()  # emitido pelo provedor após o último trecho de saída
     show_message_signal = Signal(str, str)  # sinal para exibir caixas de mensagem
     hotkey_triggered_signal = Signal()
-    followup_response_signal = Signal(str)
+    followup_response_signal = Signal(object, str)  # (janela de resposta que fez a pergunta, texto)
+    theme_changed_signal = Signal(str)  # emitido pelo listener do darkdetect ao mudar o tema do sistema
 
     def __init__(self, argv):
         super().__init__(argv)
+        # O ícone do aplicativo nunca muda; carrega-o uma única vez
+        self.app_icon = QtGui.QIcon(APP_ICON_PATH) if os.path.exists(APP_ICON_PATH) else None
+        if self.app_icon:
+            # Ícone padrão para todas as janelas do aplicativo
+            self.setWindowIcon(self.app_icon)
         self.current_response_window = None
         logging.debug('Inicializando WritingToolApp')
         self.output_ready_signal.connect(self.replace_text)
+        self.output_done_signal.connect(self.on_output_done)
         self.show_message_signal.connect(self.show_message_box)
         self.hotkey_triggered_signal.connect(self.on_hotkey_pressed)
+        self.theme_changed_signal.connect(self.on_theme_changed)
+        # Tema do sistema consultado uma única vez; mantido atualizado pelo listener abaixo
+        self.is_dark_mode = darkdetect.isDark()
+        threading.Thread(target=self.listen_theme_changes, daemon=True).start()
+        # Paletas do menu da bandeja, montadas uma única vez
+        self.DARK_PALETTE = self.make_palette("#2d2d2d", "#ffffff")
+        self.LIGHT_PALETTE = self.make_palette("#ffffff", "#000000")
         self.config = None
         self.config_path = None
+        # Serializa as gravações do config.json feitas em segundo plano
+        self.config_write_lock = threading.Lock()
+        # Incrementado a cada salvamento; gravações com geração antiga são descartadas
+        self.config_generation = 0
         self.load_config()
         self.options = None
         self.options_path = None
         self.load_options()
         self.onboarding_window = None
         self.popup_window = None
+        # Posição do cursor quando o pop-up foi aberto; usada para reposicioná-lo quando seu tamanho muda
+        self.popup_anchor = None
         self.tray_icon = None
         self.tray_menu = None
         self.settings_window = None
         self.about_window = None
         self.registered_hotkey = None
         self.output_queue = ""
+        self.pending_output = []  # Trechos recebidos e ainda não processados
+        self.output_flush_timer = QtCore.QTimer(self)
+        self.output_flush_timer.setSingleShot(True)
+        self.output_flush_timer.setInterval(OUTPUT_FLUSH_INTERVAL_MS)
+        self.output_flush_timer.timeout.connect(self.flush_output)
         self.last_replace = 0
+        # Pool reutilizado para as chamadas aos provedores, limitando as requisições simultâneas
+        self.thread_pool = QtCore.QThreadPool(self)
+        self.thread_pool.setMaxThreadCount(MAX_PROVIDER_THREADS)
+        # Mantém os workers vivos entre as requisições (o padrão os encerra após 30 s ociosos)
+        self.thread_pool.setExpiryTimeout(-1)
         self.hotkey_listener = None
         self.paused = False
         self.toggle_action = None
 
         self._ = gettext.gettext
+        self.translations = {}  # Traduções já carregadas, por idioma
 
         # Inicializa o listener de tecla Ctrl+C
         self.ctrl_c_timer = None
@@ -98,31 +197,50 @@ class WritingToolApp(QtWidgets.QApplication):
             self.update_checker = UpdateChecker(self)
             self.update_checker.check_updates_async()
 
-        self.recent_triggers = []  # Armazena os acionamentos recentes da tecla de atalho
+            # Pré-cria a janela "Sobre" depois que o loop de eventos já estiver rodando
+            QtCore.QTimer.singleShot(2000, self.prewarm_about)
+
         self.TRIGGER_WINDOW = 1.5  # Janela de tempo em segundos
         self.MAX_TRIGGERS = 3  # Máximo de acionamentos permitidos na janela
+        # Armazena os acionamentos recentes da tecla de atalho; os mais antigos são descartados automaticamente
+        self.recent_triggers = deque(maxlen=self.MAX_TRIGGERS)
+        # Acionamentos repetidos dentro deste intervalo são descartados antes de qualquer trabalho
+        self.HOTKEY_THROTTLE_MS = 250
+        self.last_hotkey_time = 0.0
 
     def setup_translations(self, lang=None):
         if not lang:
             lang = QLocale.system().name().split('_')[0]
 
-        try:
-            translation = gettext.translation(
-                'messages',
-                localedir=os.path.join(os.path.dirname(__file__), 'locales'),
-                languages=[lang]
-            )
-        except FileNotFoundError:
-            translation = gettext.NullTranslations()
+        # Cada idioma é carregado do disco apenas uma vez
+        translation = self.translations.get(lang)
+        if translation is None:
+            try:
+                translation = gettext.translation(
+                    'messages',
+                    localedir=LOCALE_DIR,
+                    languages=[lang]
+                )
+            except FileNotFoundError:
+                translation = gettext.NullTranslations()
+            self.translations[lang] = translation
 
         translation.install()
         # Atualiza a função de tradução para todos os componentes da interface
         self._ = translation.gettext
-        ui.AboutWindow._ = self._
-        ui.SettingsWindow._ = self._
-        ui.ResponseWindow._ = self._
-        ui.OnboardingWindow._ = self._
-        ui.CustomPopupWindow._ = self._
+        # Os módulos ainda não importados recebem a função em load_ui_module
+        for name in UI_MODULES:
+            module = sys.modules.get(f'ui.{name}')
+            if module is not None:
+                module._ = self._
+
+    def load_ui_module(self, name):
+        """
+        Importa um módulo de interface na primeira vez em que é necessário e aplica a tradução atual.
+        """
+        module = importlib.import_module(f'ui.{name}')
+        module._ = self._
+        return module
 
     def retranslate_ui(self):
         self.update_tray_menu()
@@ -142,24 +260,22 @@ class WritingToolApp(QtWidgets.QApplication):
         Retorna True se spam for detectado.
         """
         current_time = time.time()
-        # Adiciona o acionamento atual
-        self.recent_triggers.append(current_time)
-        # Remove acionamentos antigos fora da janela
-        self.recent_triggers = [t for t in self.recent_triggers if current_time - t <= self.TRIGGER_WINDOW]
-        # Verifica se há acionamentos demais na janela
-        return len(self.recent_triggers) >= self.MAX_TRIGGERS
+        triggers = self.recent_triggers
+        # Adiciona o acionamento atual (o deque descarta o mais antigo ao atingir maxlen)
+        triggers.append(current_time)
+        # Há spam se o buffer está cheio e o acionamento mais antigo ainda está dentro da janela
+        return len(triggers) == triggers.maxlen and current_time - triggers[0] <= self.TRIGGER_WINDOW
 
     def load_config(self):
         """
         Carrega o arquivo de configuração.
         """
-        self.config_path = os.path.join(os.path.dirname(sys.argv[0]), 'config.json')
+        self.config_path = CONFIG_PATH
         logging.debug(f'Carregando configuração de {self.config_path}')
-        if os.path.exists(self.config_path):
-            with open(self.config_path, 'r') as f:
-                self.config = json.load(f)
-                logging.debug('Configuração carregada com sucesso')
-        else:
+        try:
+            self.config = read_json_file(self.config_path)
+            logging.debug('Configuração carregada com sucesso')
+        except FileNotFoundError:
             logging.debug('Arquivo de configuração não encontrado')
             self.config = None
 
@@ -167,31 +283,61 @@ class WritingToolApp(QtWidgets.QApplication):
         """
         Carrega o arquivo de opções.
         """
-        self.options_path = os.path.join(os.path.dirname(sys.argv[0]), 'options.json')
+        self.options_path = OPTIONS_PATH
         logging.debug(f'Carregando opções de {self.options_path}')
-        if os.path.exists(self.options_path):
-            with open(self.options_path, 'r') as f:
-                self.options = json.load(f)
-                logging.debug('Opções carregadas com sucesso')
-        else:
+        try:
+            self.options = read_json_file(self.options_path)
+            logging.debug('Opções carregadas com sucesso')
+        except FileNotFoundError:
             logging.debug('Arquivo de opções não encontrado')
             self.options = None
 
+    def apply_options(self, options):
+        """
+        Aplica opções que acabaram de ser salvas, sem reler o arquivo do disco.
+        """
+        self.options = options
+
+    def write_config_file(self, config, generation):
+        """
+        Grava a configuração no disco, a menos que um salvamento mais recente já tenha sido pedido.
+        """
+        if orjson is not None:
+            data = orjson.dumps(config, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE)
+        else:
+            data = (json.dumps(config, indent=2) + '\n').encode('utf-8')
+        with self.config_write_lock:
+            if generation != self.config_generation:
+                logging.debug('Gravação da configuração descartada: há um salvamento mais recente')
+                return
+            with open(self.config_path, 'wb') as f:
+                f.write(data)
+            logging.debug('Configuração salva com sucesso')
+
     def save_config(self, config):
         """
         Salva o arquivo de configuração.
         """
-        with open(self.config_path, 'w') as f:
-            json.dump(config, f, indent=4)
-            logging.debug('Configuração salva com sucesso')
+        self.config_generation += 1
+        self.write_config_file(config, self.config_generation)
+        self.config = config
+
+    def save_config_in_background(self, config):
+        """
+        Atualiza a configuração em memória e grava uma cópia dela fora da thread da GUI.
+        """
         self.config = config
+        self.config_generation += 1
+        QtCore.QThreadPool.globalInstance().start(
+            ProviderTask(self.write_config_file, copy.deepcopy(config), self.config_generation)
+        )
 
     def show_onboarding(self):
         """
         Exibe a janela de boas-vindas para usuários de primeira viagem.
         """
         logging.debug('Exibindo a janela de boas-vindas')
-        self.onboarding_window = ui.OnboardingWindow.OnboardingWindow(self)
+        self.onboarding_window = self.load_ui_module('OnboardingWindow').OnboardingWindow(self)
         self.onboarding_window.close_signal.connect(self.exit_app)
         self.onboarding_window.show()
 
@@ -213,20 +359,10 @@ class WritingToolApp(QtWidgets.QApplication):
                 logging.debug('Tecla de atalho acionada')
                 self.hotkey_triggered_signal.emit()  # Emite o sinal quando a tecla é pressionada
 
-            # Define a combinação de tecla de atalho
-            hotkey = pykeyboard.HotKey(pykeyboard.HotKey.parse(shortcut), on_activate)
+            # Cria um listener para a combinação e armazena como atributo para poder pará-lo depois
+            self.hotkey_listener = pykeyboard.GlobalHotKeys({shortcut: on_activate})
             self.registered_hotkey = orig_shortcut
 
-            # Função auxiliar para padronizar o evento de tecla
-            def for_canonical(f):
-                return lambda k: f(self.hotkey_listener.canonical(k))
-
-            # Cria um listener e armazena como atributo para poder pará-lo depois
-            self.hotkey_listener = pykeyboard.Listener(
-                on_press=for_canonical(hotkey.press),
-                on_release=for_canonical(hotkey.release)
-            )
-
             # Inicia o listener
             self.hotkey_listener.start()
         except Exception as e:
@@ -240,12 +376,20 @@ class WritingToolApp(QtWidgets.QApplication):
         self.start_hotkey_listener()
         logging.debug('Tecla de atalho registrada')
 
+    @Slot()
     def on_hotkey_pressed(self):
         """
         Trata o evento de pressionar a tecla de atalho.
         """
         logging.debug('Tecla de atalho pressionada')
-        # Verifica se há spam de acionamentos
+        # Descarta acionamentos repetidos em sequência (throttle na borda de subida)
+        now = time.monotonic()
+        if (now - self.last_hotkey_time) * 1000 < self.HOTKEY_THROTTLE_MS:
+            logging.debug('Acionamento da tecla de atalho ignorado (throttle)')
+            return
+        self.last_hotkey_time = now
+
+        # Proteção contra execuções descontroladas: verifica se há spam de acionamentos
         if self.check_trigger_spam():
             logging.warning('Spam de tecla de atalho detectado - encerrando o aplicativo')
             self.exit_app()
@@ -256,6 +400,7 @@ class WritingToolApp(QtWidgets.QApplication):
             logging.debug("Cancelando a solicitação do provedor atual")
             self.current_provider.cancel()
             self.output_queue = ""
+            self.pending_output.clear()
 
         # Chama o método _show_popup de forma segura em thread
         QtCore.QMetaObject.invokeMethod(self, "_show_popup", QtCore.Qt.ConnectionType.QueuedConnection)
@@ -266,72 +411,74 @@ class WritingToolApp(QtWidgets.QApplication):
         Exibe a janela pop-up quando a tecla de atalho é pressionada.
         """
         logging.debug('Exibindo janela pop-up')
-        # Primeira tentativa com tempo de espera padrão
         selected_text = self.get_selected_text()
 
-        # Tenta novamente com tempo de espera maior se nenhum texto foi capturado
-        if not selected_text:
-            logging.debug('Nenhum texto capturado, tentando novamente com tempo de espera maior')
-            selected_text = self.get_selected_text(sleep_duration=0.5)
-
-        logging.debug(f'Texto selecionado: "{selected_text}"')
+        logging.debug('Texto selecionado: "%s"', selected_text)
         try:
-            if self.popup_window is not None:
-                logging.debug('Janela pop-up existente encontrada')
-                if self.popup_window.isVisible():
-                    logging.debug('Fechando janela pop-up visível existente')
-                    self.popup_window.close()
-                self.popup_window = None
-            logging.debug('Criando nova janela pop-up')
-            self.popup_window = ui.CustomPopupWindow.CustomPopupWindow(self, selected_text)
-
-            # Define o ícone da janela
-            icon_path = os.path.join(os.path.dirname(sys.argv[0]), 'icons', 'app_icon.png')
-            if os.path.exists(icon_path):
-                self.setWindowIcon(QtGui.QIcon(icon_path))
-            # Obtém a tela onde o cursor está localizado
-            cursor_pos = QCursor.pos()
-            screen = QGuiApplication.screenAt(cursor_pos)
-            if screen is None:
-                screen = QGuiApplication.primaryScreen()
-            screen_geometry = screen.geometry()
-            logging.debug(f'Cursor está na tela: {screen.name()}')
-            logging.debug(f'Geometria da tela: {screen_geometry}')
+            if self.popup_window is None:
+                logging.debug('Criando nova janela pop-up')
+                self.popup_window = self.load_ui_module('CustomPopupWindow').CustomPopupWindow(self, selected_text)
+                self.popup_window.destroyed.connect(lambda: setattr(self, 'popup_window', None))
+            else:
+                logging.debug('Reutilizando a janela pop-up existente')
+                self.popup_window.reset(selected_text)
+
+            self.popup_anchor = QCursor.pos()
             # Exibe a janela pop-up para obter seu tamanho
             self.popup_window.show()
             self.popup_window.adjustSize()
-            # Garante que a janela pop-up receba foco, mesmo em máquinas de baixo desempenho
+            # Garante que a janela pop-up receba foco; a entrada é focada no showEvent da própria janela
             self.popup_window.activateWindow()
-            QtCore.QTimer.singleShot(100, self.popup_window.custom_input.setFocus)
-
-            popup_width = self.popup_window.width()
-            popup_height = self.popup_window.height()
-            # Calcula a posição
-            x = cursor_pos.x()
-            y = cursor_pos.y() + 20  # 20 pixels abaixo do cursor
-            # Ajusta se a janela pop-up extrapolar a borda direita da tela
-            if x + popup_width > screen_geometry.right():
-                x = screen_geometry.right() - popup_width
-            # Ajusta se a janela pop-up extrapolar a borda inferior da tela
-            if y + popup_height > screen_geometry.bottom():
-                y = cursor_pos.y() - popup_height - 10  # 10 pixels acima do cursor
-            self.popup_window.move(x, y)
-            logging.debug(f'Janela pop-up movida para a posição: ({x}, {y})')
+            self.position_popup()
         except Exception as e:
             logging.error(f'Erro ao exibir a janela pop-up: {e}', exc_info=True)
 
-    def get_selected_text(self, sleep_duration=0.2):
+    def position_popup(self):
+        """
+        Posiciona a janela pop-up junto ao cursor, mantendo-a dentro da tela.
+        Chamado ao exibi-la e de novo quando os botões carregados em segundo plano mudam seu tamanho.
+        """
+        if self.popup_window is None or self.popup_anchor is None:
+            return
+        # Obtém a tela onde o cursor estava ao abrir o pop-up
+        cursor_pos = self.popup_anchor
+        screen = QGuiApplication.screenAt(cursor_pos)
+        if screen is None:
+            screen = QGuiApplication.primaryScreen()
+        screen_geometry = screen.geometry()
+        logging.debug('Cursor está na tela: %s', screen.name())
+        logging.debug('Geometria da tela: %s', screen_geometry)
+
+        popup_width = self.popup_window.width()
+        popup_height = self.popup_window.height()
+        # Calcula a posição
+        x = cursor_pos.x()
+        y = cursor_pos.y() + 20  # 20 pixels abaixo do cursor
+        # Ajusta se a janela pop-up extrapolar a borda direita da tela
+        if x + popup_width > screen_geometry.right():
+            x = screen_geometry.right() - popup_width
+        # Ajusta se a janela pop-up extrapolar a borda inferior da tela
+        if y + popup_height > screen_geometry.bottom():
+            y = cursor_pos.y() - popup_height - 10  # 10 pixels acima do cursor
+        self.popup_window.move(x, y)
+        logging.debug('Janela pop-up movida para a posição: (%d, %d)', x, y)
+
+    def get_selected_text(self, timeout=None):
         """
         Obtém o texto atualmente selecionado em qualquer aplicativo.
         Args:
-            sleep_duration (float): Tempo de espera para a atualização da área de transferência.
+            timeout (float): Tempo máximo de espera pela atualização da área de transferência
+                (padrão: "clipboard_timeout" do config.json ou CLIPBOARD_POLL_TIMEOUT).
         """
+        if timeout is None:
+            timeout = float(self.config.get('clipboard_timeout', CLIPBOARD_POLL_TIMEOUT))
+
         # Faz backup da área de transferência
         clipboard_backup = pyperclip.paste()
-        logging.debug(f'Backup da área de transferência: "{clipboard_backup}" (aguardar: {sleep_duration}s)')
+        logging.debug('Backup da área de transferência: "%s" (limite: %ss)', clipboard_backup, timeout)
 
-        # Limpa a área de transferência
-        self.clear_clipboard()
+        # Marca a área de transferência para detectar quando a cópia chegar
+        pyperclip.copy(CLIPBOARD_SENTINEL)
 
         # Simula Ctrl+C
         logging.debug('Simulando Ctrl+C')
@@ -345,33 +492,26 @@ class WritingToolApp(QtWidgets.QApplication):
 
         press_ctrl_c()
 
-        # Aguarda a atualização da área de transferência
-        time.sleep(sleep_duration)
-        logging.debug(f'Aguardou {sleep_duration}s para a atualização da área de transferência')
-
-        # Obtém o texto selecionado
-        selected_text = pyperclip.paste()
+        # Consulta a área de transferência até que ela mude ou o limite seja atingido
+        selected_text = ''
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            current = pyperclip.paste()
+            if current and current != CLIPBOARD_SENTINEL:
+                selected_text = current
+                break
+            time.sleep(CLIPBOARD_POLL_INTERVAL)
 
         # Restaura a área de transferência
         pyperclip.copy(clipboard_backup)
 
         return selected_text
 
-    @staticmethod
-    def clear_clipboard():
-        """
-        Limpa a área de transferência do sistema.
-        """
-        try:
-            pyperclip.copy('')
-        except Exception as e:
-            logging.error(f'Erro ao limpar a área de transferência: {e}')
-
     def process_option(self, option, selected_text, custom_change=None):
         """
         Processa a opção de escrita selecionada em uma thread separada.
         """
-        logging.debug(f'Opção de processamento: {option}')
+        logging.debug('Opção de processamento: %s', option)
 
         # Para Summary, Key Points, Table e prompts custom com texto vazio, cria uma janela de resposta
         if (option == 'Custom' and not selected_text.strip()) or self.options[option]['open_in_window']:
@@ -391,16 +531,20 @@ class WritingToolApp(QtWidgets.QApplication):
                 ]
         else:
             # Remove qualquer referência de janela de resposta existente para opções sem janela
-            if hasattr(self, 'current_response_window'):
-                delattr(self, 'current_response_window')
+            self.current_response_window = None
 
-        threading.Thread(target=self.process_option_thread, args=(option, selected_text, custom_change), daemon=True).start()
+        # A janela desta opção é repassada à thread: outra opção pode substituir
+        # current_response_window (ou zerá-la) enquanto esta ainda está em andamento
+        self.thread_pool.start(ProviderTask(self.process_option_thread, option, selected_text, custom_change,
+                                            self.current_response_window))
 
-    def process_option_thread(self, option, selected_text, custom_change=None):
+    def process_option_thread(self, option, selected_text, custom_change=None, response_window=None):
         """
         Função da thread para processar a opção de escrita selecionada utilizando o modelo de IA.
+        Args:
+            response_window: Janela de resposta criada para esta opção, ou None se o resultado for colado.
         """
-        logging.debug(f'Iniciando thread de processamento para a opção: {option}')
+        logging.debug('Iniciando thread de processamento para a opção: %s', option)
         try:
             if selected_text.strip() == '':
                 # Nenhum texto selecionado
@@ -424,24 +568,24 @@ class WritingToolApp(QtWidgets.QApplication):
                     prompt = f"{prompt_prefix}{selected_text}"
 
             self.output_queue = ""
-            logging.debug(f'Obtendo resposta do provedor para a opção: {option}')
+            logging.debug('Obtendo resposta do provedor para a opção: %s', option)
 
             if (option == 'Custom' and not selected_text.strip()) or self.options[option]['open_in_window']:
                 logging.debug('Obtendo resposta para exibição em janela')
                 response = self.current_provider.get_response(system_instruction, prompt, return_response=True)
-                logging.debug(f'Obtive resposta de comprimento: {len(response) if response else 0}')
+                logging.debug('Obtive resposta de comprimento: %d', len(response) if response else 0)
 
                 # Para prompts custom sem texto, adiciona a pergunta ao histórico de chat
                 if option == 'Custom' and not selected_text.strip():
-                    self.current_response_window.chat_history.append({
+                    response_window.chat_history.append({
                         "role": "user",
                         "content": custom_change
                     })
 
                 # Define a resposta inicial usando QMetaObject.invokeMethod para garantir segurança de thread
-                if hasattr(self, 'current_response_window'):
+                if response_window is not None:
                     QtCore.QMetaObject.invokeMethod(
-                        self.current_response_window,
+                        response_window,
                         'set_text',
                         QtCore.Qt.ConnectionType.QueuedConnection,
                         QtCore.Q_ARG(str, response)
@@ -453,18 +597,19 @@ class WritingToolApp(QtWidgets.QApplication):
                 logging.debug('Resposta processada')
 
         except Exception as e:
-            logging.error(f'Ocorreu um erro: {e}', exc_info=True)
-            if "Resource has been exhausted" in str(e):
+            # Cada provedor classifica suas próprias exceções; o app não importa nenhum SDK
+            if self.current_provider.is_rate_limited(e):
+                logging.error(f'Limite de taxa atingido: {e}')
                 self.show_message_signal.emit(
                     'Erro - Limite de Taxa Atingido',
                     ("Ops! Você atingiu o limite de taxa por minuto da API Gemini. "
                      "Por favor, tente novamente em alguns instantes.\n\nSe isso ocorrer com frequência, "
                      "simplesmente altere para um modelo Gemini com um limite de uso maior em Configurações.")
                 )
-                self.followup_response_signal.emit("Desculpe, ocorreu um erro ao processar sua pergunta.")
             else:
+                logging.error(f'Ocorreu um erro: {e}', exc_info=True)
                 self.show_message_signal.emit('Erro', f'Ocorreu um erro: {e}')
-                self.followup_response_signal.emit("Desculpe, ocorreu um erro ao processar sua pergunta.")
+            self.followup_response_signal.emit(response_window, "Desculpe, ocorreu um erro ao processar sua pergunta.")
 
     @Slot(str, str)
     def show_message_box(self, title, message):
@@ -477,70 +622,104 @@ class WritingToolApp(QtWidgets.QApplication):
         """
         Exibe a resposta em uma nova janela em vez de colá-la.
         """
-        response_window = ui.ResponseWindow.ResponseWindow(self, f"{option} Result")
+        response_window = self.load_ui_module('ResponseWindow').ResponseWindow(self, f"{option} Result")
         response_window.selected_text = text  # Armazena o texto para regeneração
         response_window.show()
         return response_window
 
+    @Slot(str)
     def replace_text(self, new_text):
         """
-        Substitui o texto colando o texto gerado pela IA. Para "Key Points" e "Summary", invoca uma janela com a saída.
+        Recebe um trecho de saída da IA. Os trechos são agrupados e processados de uma só vez
+        por flush_output, evitando uma atualização da interface para cada emissão do sinal.
         """
-        error_message = 'ERROR_TEXT_INCOMPATIBLE_WITH_REQUEST'
-
         # Verifica se new_text existe e é uma string
         if new_text and isinstance(new_text, str):
-            self.output_queue += new_text
+            self.pending_output.append(new_text)
+            if not self.output_flush_timer.isActive():
+                self.output_flush_timer.start()
+        else:
+            logging.debug('Nenhum novo texto para processar')
+
+    @Slot()
+    def flush_output(self):
+        """
+        Processa os trechos acumulados. Para "Key Points" e "Summary", acrescenta a saída à janela de resposta.
+        """
+        if not self.pending_output:
+            return
+        new_text = ''.join(self.pending_output)
+        self.pending_output.clear()
+        self.output_queue += new_text
+
+        # Só é possível estar formando a mensagem de erro enquanto a saída ainda é curta;
+        # depois disso, evita varrer o buffer inteiro a cada trecho
+        if len(self.output_queue) <= len(ERROR_MESSAGE) + 8:
             current_output = self.output_queue.strip()  # Remove espaços para comparação
 
             # Se o novo texto for a mensagem de erro, exibe uma caixa de mensagem
-            if current_output == error_message:
+            if current_output == ERROR_MESSAGE:
                 self.show_message_signal.emit('Erro', 'O texto é incompatível com a alteração solicitada.')
                 return
 
             # Verifica se estamos formando a mensagem de erro (para evitar colagens parciais)
-            if len(current_output) <= len(error_message):
+            if len(current_output) <= len(ERROR_MESSAGE):
                 clean_current = ''.join(current_output.split())
-                clean_error = ''.join(error_message.split())
-                if clean_current == clean_error[:len(clean_current)]:
+                if clean_current == ERROR_MESSAGE_CLEAN[:len(clean_current)]:
                     return
 
-            logging.debug('Processando o texto de saída')
-            try:
-                # Para Summary e Key Points, exibe na janela de resposta
-                if hasattr(self, 'current_response_window'):
-                    self.current_response_window.append_text(new_text)
-                    # Se for a resposta inicial, adiciona ao histórico de chat
-                    if len(self.current_response_window.chat_history) == 1:  # Apenas o texto original existe
-                        self.current_response_window.chat_history.append({
-                            "role": "assistant",
-                            "content": self.output_queue.rstrip('\n')
-                        })
-                else:
-                    # Para outras opções, usa a substituição baseada na área de transferência
-                    clipboard_backup = pyperclip.paste()
-                    cleaned_text = self.output_queue.rstrip('\n')
-                    pyperclip.copy(cleaned_text)
+        # Para Summary e Key Points, exibe na janela de resposta; nos demais casos o texto
+        # apenas se acumula em output_queue e é colado uma única vez em on_output_done
+        if self.current_response_window is None:
+            return
+
+        logging.debug('Processando o texto de saída')
+        try:
+            self.current_response_window.append_text(new_text)
+            # Se for a resposta inicial, adiciona ao histórico de chat
+            if len(self.current_response_window.chat_history) == 1:  # Apenas o texto original existe
+                self.current_response_window.chat_history.append({
+                    "role": "assistant",
+                    "content": self.output_queue.rstrip('\n')
+                })
+        except Exception as e:
+            logging.error(f'Erro ao processar a saída: {e}')
+
+    @Slot()
+    def on_output_done(self):
+        """
+        Chamado quando o provedor termina de enviar a saída. Cola o texto acumulado de uma só vez.
+        """
+        self.output_flush_timer.stop()
+        self.flush_output()
+        if self.current_response_window is not None:
+            return
 
-                    kbrd = pykeyboard.Controller()
+        cleaned_text = self.output_queue.rstrip('\n')
+        self.output_queue = ""
+        if not cleaned_text.strip() or cleaned_text.strip() == ERROR_MESSAGE:
+            return
 
-                    def press_ctrl_v():
-                        kbrd.press(pykeyboard.Key.ctrl.value)
-                        kbrd.press('v')
-                        kbrd.release('v')
-                        kbrd.release(pykeyboard.Key.ctrl.value)
+        logging.debug('Colando o texto de saída')
+        try:
+            # Usa a substituição baseada na área de transferência
+            clipboard_backup = pyperclip.paste()
+            pyperclip.copy(cleaned_text)
 
-                    press_ctrl_v()
-                    time.sleep(0.2)
-                    pyperclip.copy(clipboard_backup)
+            kbrd = pykeyboard.Controller()
 
-                if not hasattr(self, 'current_response_window'):
-                    self.output_queue = ""
+            def press_ctrl_v():
+                kbrd.press(pykeyboard.Key.ctrl.value)
+                kbrd.press('v')
+                kbrd.release('v')
+                kbrd.release(pykeyboard.Key.ctrl.value)
 
-            except Exception as e:
-                logging.error(f'Erro ao processar a saída: {e}')
-        else:
-            logging.debug('Nenhum novo texto para processar')
+            press_ctrl_v()
+            time.sleep(0.2)
+            pyperclip.copy(clipboard_backup)
+
+        except Exception as e:
+            logging.error(f'Erro ao colar a saída: {e}')
 
     def create_tray_icon(self):
         """
@@ -551,12 +730,11 @@ class WritingToolApp(QtWidgets.QApplication):
             return
 
         logging.debug('Criando ícone da bandeja')
-        icon_path = os.path.join(os.path.dirname(sys.argv[0]), 'icons', 'app_icon.png')
-        if not os.path.exists(icon_path):
-            logging.warning(f'Ícone da bandeja não encontrado em {icon_path}')
+        if not self.app_icon:
+            logging.warning(f'Ícone da bandeja não encontrado em {APP_ICON_PATH}')
             self.tray_icon = QtWidgets.QSystemTrayIcon(self)
         else:
-            self.tray_icon = QtWidgets.QSystemTrayIcon(QtGui.QIcon(icon_path), self)
+            self.tray_icon = QtWidgets.QSystemTrayIcon(self.app_icon, self)
         # Define o tooltip (nome ao passar o mouse) para o ícone da bandeja
         self.tray_icon.setToolTip("WritingTools")
         self.tray_menu = QtWidgets.QMenu()
@@ -594,30 +772,49 @@ class WritingToolApp(QtWidgets.QApplication):
         self.toggle_action.setText(self._('Retomar') if self.paused else self._('Pausar'))
         logging.debug('Aplicativo em pausa' if self.paused else 'Aplicativo retomado')
 
-    @staticmethod
-    def apply_dark_mode_styles(menu):
+    def listen_theme_changes(self):
+        """
+        Aguarda mudanças de tema do sistema (executado em uma thread própria).
+        """
+        try:
+            darkdetect.listener(self.theme_changed_signal.emit)
+        except Exception as e:
+            logging.debug(f'Listener de tema indisponível nesta plataforma: {e}')
+
+    @Slot(str)
+    def on_theme_changed(self, theme):
         """
-        Aplica estilos ao menu da bandeja com base no tema do sistema usando darkdetect.
+        Atualiza o tema em cache e reaplica os estilos do menu da bandeja.
         """
-        is_dark_mode = darkdetect.isDark()
-        palette = menu.palette()
+        self.is_dark_mode = theme == 'Dark'
+        if self.tray_menu:
+            self.apply_dark_mode_styles(self.tray_menu)
 
-        if is_dark_mode:
+    def make_palette(self, window_color, text_color):
+        """
+        Cria uma paleta baseada na do aplicativo com as cores de fundo e texto fornecidas.
+        """
+        palette = QtGui.QPalette(self.palette())
+        palette.setColor(QtGui.QPalette.Window, QtGui.QColor(window_color))
+        palette.setColor(QtGui.QPalette.WindowText, QtGui.QColor(text_color))
+        return palette
+
+    def apply_dark_mode_styles(self, menu):
+        """
+        Aplica estilos ao menu da bandeja com base no tema do sistema detectado pelo darkdetect.
+        """
+        if self.is_dark_mode:
             logging.debug('Ícone da bandeja em modo escuro')
-            palette.setColor(QtGui.QPalette.Window, QtGui.QColor("#2d2d2d"))
-            palette.setColor(QtGui.QPalette.WindowText, QtGui.QColor("#ffffff"))
+            menu.setPalette(self.DARK_PALETTE)
         else:
             logging.debug('Ícone da bandeja em modo claro')
-            palette.setColor(QtGui.QPalette.Window, QtGui.QColor("#ffffff"))
-            palette.setColor(QtGui.QPalette.WindowText, QtGui.QColor("#000000"))
-
-        menu.setPalette(palette)
+            menu.setPalette(self.LIGHT_PALETTE)
 
     def process_followup_question(self, response_window, question):
         """
         Processa uma pergunta de acompanhamento na janela de chat.
         """
-        logging.debug(f'Processando pergunta de acompanhamento: {question}')
+        logging.debug('Processando pergunta de acompanhamento: %s', question)
         
         def process_thread():
             logging.debug('Iniciando thread de processamento de acompanhamento')
@@ -633,59 +830,36 @@ class WritingToolApp(QtWidgets.QApplication):
                     "content": question
                 })
                 
-                # Obtém o histórico de chat
-                history = response_window.chat_history.copy()
-                
-                # Instrução do sistema baseada na opção original
-                system_instruction = ("Você é um assistente de IA útil. Forneça respostas claras e diretas, mantendo o mesmo formato e estilo de suas respostas anteriores. "
-                                        "Se apropriado, use formatação Markdown para tornar sua resposta mais legível.")
+                # Obtém o histórico de chat sem copiá-lo: durante o acompanhamento, apenas esta thread
+                # acrescenta mensagens, e cada provedor abaixo já monta sua própria lista a partir dele
+                history = response_window.chat_history
+                # Envia apenas as últimas trocas, mantendo a primeira mensagem (texto original ou pergunta inicial)
+                if len(history) > MAX_HISTORY_TURNS * 2 + 1:
+                    history = [history[0], *history[-MAX_HISTORY_TURNS * 2:]]
                 
                 logging.debug('Enviando requisição para o provedor de IA')
                 
                 # Formata a conversa de forma diferente com base no provedor
                 if isinstance(self.current_provider, GeminiProvider):
-                    chat_messages = []
                     # Converte nossos papéis para os papéis esperados pelo Gemini
-                    for msg in history:
-                        gemini_role = "model" if msg["role"] == "assistant" else "user"
-                        chat_messages.append({
-                            "role": gemini_role,
-                            "parts": msg["content"]
-                        })
+                    chat_messages = [{"role": GEMINI_ROLE_MAP[msg["role"]], "parts": msg["content"]} for msg in history]
                     # Inicia a conversa com o histórico
                     chat = self.current_provider.model.start_chat(history=chat_messages)
                     # Obtém a resposta usando a conversa
                     response = chat.send_message(question)
                     response_text = response.text
 
-                elif isinstance(self.current_provider, OllamaProvider):
-                    # Para Ollama, prepara as mensagens com a instrução do sistema e o histórico
-                    messages = [{"role": "system", "content": system_instruction}]
-                    for msg in history:
-                        messages.append({
-                            "role": msg["role"],
-                            "content": msg["content"]
-                        })
-                    # Obtém a resposta do Ollama
-                    response_text = self.current_provider.get_response(
-                        system_instruction,
-                        messages,
-                        return_response=True
-                    )
-
                 else:
-                    # Para provedores OpenAI/compatíveis, prepara um array de mensagens com a mensagem do sistema
-                    messages = [{"role": "system", "content": system_instruction}]
-                    for msg in history:
-                        role = "assistant" if msg["role"] == "assistant" else "user"
-                        messages.append({"role": role, "content": msg["content"]})
+                    # Para Ollama e provedores OpenAI/compatíveis, a instrução do sistema vem primeiro e o
+                    # histórico (já com os papéis "user"/"assistant" esperados) é apenas acrescentado
+                    messages = build_cacheable_messages(FOLLOWUP_SYSTEM_INSTRUCTION, history)
                     response_text = self.current_provider.get_response(
-                        system_instruction,
+                        FOLLOWUP_SYSTEM_INSTRUCTION,
                         messages,
                         return_response=True
                     )
 
-                logging.debug(f'Recebida resposta de comprimento: {len(response_text)}')
+                logging.debug('Recebida resposta de comprimento: %d', len(response_text))
                 
                 # Adiciona a resposta ao histórico de chat
                 response_window.chat_history.append({
@@ -694,40 +868,51 @@ class WritingToolApp(QtWidgets.QApplication):
                 })
                 
                 # Emite a resposta via sinal
-                self.followup_response_signal.emit(response_text)
+                self.followup_response_signal.emit(response_window, response_text)
 
             except Exception as e:
-                logging.error(f'Erro ao processar a pergunta de acompanhamento: {e}', exc_info=True)
-                if "Resource has been exhausted" in str(e):
+                if self.current_provider.is_rate_limited(e):
+                    logging.error(f'Limite de taxa atingido na pergunta de acompanhamento: {e}')
                     self.show_message_signal.emit(
                         'Erro - Limite de Taxa Atingido',
                         ("Ops! Você atingiu o limite de taxa por minuto da API Gemini. Por favor, tente novamente em alguns instantes.\n\n"
                          "Se isso ocorrer com frequência, altere para um modelo Gemini com um limite de uso maior em Configurações.")
                     )
-                    self.followup_response_signal.emit("Desculpe, ocorreu um erro ao processar sua pergunta.")
                 else:
+                    logging.error(f'Erro ao processar a pergunta de acompanhamento: {e}', exc_info=True)
                     self.show_message_signal.emit('Erro', f'Ocorreu um erro: {e}')
-                    self.followup_response_signal.emit("Desculpe, ocorreu um erro ao processar sua pergunta.")
+                self.followup_response_signal.emit(response_window, "Desculpe, ocorreu um erro ao processar sua pergunta.")
 
-        threading.Thread(target=process_thread, daemon=True).start()
+        self.thread_pool.start(ProviderTask(process_thread))
 
     def show_settings(self, providers_only=False):
         """
         Exibe a janela de configurações.
         """
         logging.debug('Exibindo janela de configurações')
-        self.settings_window = ui.SettingsWindow.SettingsWindow(self, providers_only=providers_only)
-        self.settings_window.close_signal.connect(self.exit_app)
+        # A janela já montada no mesmo modo é reaproveitada; basta atualizar os campos com a configuração atual
+        if self.settings_window and self.settings_window.built_providers_only == providers_only:
+            self.settings_window.sync_from_config()
+        else:
+            self.settings_window = self.load_ui_module('SettingsWindow').SettingsWindow(self, providers_only=providers_only)
+            self.settings_window.close_signal.connect(self.exit_app)
         self.settings_window.retranslate_ui()
         self.settings_window.show()
 
+    def prewarm_about(self):
+        """
+        Cria a janela "Sobre" com o aplicativo ocioso, para que a primeira abertura seja imediata.
+        """
+        if not self.about_window:
+            logging.debug('Pré-criando janela Sobre')
+            self.about_window = self.load_ui_module('AboutWindow').AboutWindow()
+
     def show_about(self):
         """
         Exibe a janela "Sobre".
         """
         logging.debug('Exibindo janela Sobre')
-        if not self.about_window:
-            self.about_window = ui.AboutWindow.AboutWindow()
+        self.prewarm_about()
         self.about_window.show()
 
     def setup_ctrl_c_listener(self):
@@ -735,10 +920,17 @@ class WritingToolApp(QtWidgets.QApplication):
         Listener para Ctrl+C para encerrar o aplicativo.
         """
         signal.signal(signal.SIGINT, lambda signum, frame: self.handle_sigint(signum, frame))
-        # Este timer vazio é necessário para garantir que o handler de SIGINT seja verificado no loop principal:
-        self.ctrl_c_timer = QtCore.QTimer()
-        self.ctrl_c_timer.start(100)
-        self.ctrl_c_timer.timeout.connect(lambda: None)
+        # Este timer vazio é necessário para garantir que o handler de SIGINT seja verificado no loop principal.
+        # Um intervalo longo e impreciso basta para o Ctrl+C e deixa a CPU ociosa entre os disparos.
+        self.ctrl_c_timer = QtCore.QTimer(self)
+        self.ctrl_c_timer.setTimerType(QtCore.Qt.TimerType.CoarseTimer)
+        self.ctrl_c_timer.timeout.connect(self.on_ctrl_c_timer)
+        self.ctrl_c_timer.start(CTRL_C_CHECK_INTERVAL_MS)
+
+    def on_ctrl_c_timer(self):
+        """
+        Não faz nada: apenas devolve o controle ao interpretador para que ele processe o SIGINT.
+        """
 
     def handle_sigint(self, signum, frame):
         """
@@ -754,5 +946,7 @@ class WritingToolApp(QtWidgets.QApplication):
         logging.debug('Parando o listener')
         if self.hotkey_listener is not None:
             self.hotkey_listener.stop()
+        # Descarta as requisições que ainda não começaram
+        self.thread_pool.clear()
         logging.debug('Encerrando o aplicativo')
         self.quit()
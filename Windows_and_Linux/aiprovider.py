@@ -25,25 +25,90 @@ Fluxo de Resposta:
    • O aplicativo principal chama get_response() com uma instrução do sistema e um prompt.
    • O provedor formata e envia a requisição para seu endpoint de API.
    • Para operações que exigem uma janela (por exemplo, Resumo, Pontos-Chave), o provedor retorna o texto completo.
-   • Para substituição direta de texto, o provedor emite o texto completo via output_ready_signal.
+   • Para substituição direta de texto, o provedor emite o texto completo via output_ready_signal,
+     seguido de output_done_signal para que o aplicativo cole o resultado uma única vez.
    • O histórico de conversação (para perguntas de acompanhamento) é mantido pelo aplicativo principal.
 
 Nota: O streaming foi completamente removido ao longo do código.
 """
 
+import functools
 import logging
-import webbrowser
 from abc import ABC, abstractmethod
 from typing import List
 
-# Bibliotecas externas
-import google.generativeai as genai
-from google.generativeai.types import HarmBlockThreshold, HarmCategory
-from ollama import Client as OllamaClient
-from openai import OpenAI
+# Bibliotecas externas (os SDKs dos provedores são importados em after_load, apenas para o provedor em uso)
+import httpx
 from PySide6 import QtWidgets
 from PySide6.QtWidgets import QVBoxLayout
-from ui.UIUtils import colorMode
+from llmcache import LLMCache
+from ui.UIUtils import BORDER, INPUT_BG, INPUT_TEXT, TEXT_COLOR, UIUtils
+
+# Pool de conexões HTTP mantidas abertas entre requisições, evitando novo handshake TCP/TLS a cada chamada
+HTTP_LIMITS = httpx.Limits(max_keepalive_connections=16, max_connections=32, keepalive_expiry=60)
+HTTP_TIMEOUT = httpx.Timeout(60.0, connect=10.0)
+
+# Estilos dos campos de configuração, montados uma única vez em vez de a cada widget
+SETTING_LABEL_STYLE = f"font-size: 16px; color: {TEXT_COLOR};"
+SETTING_INPUT_STYLE = f"""
+    font-size: 16px;
+    padding: 5px;
+    background-color: {INPUT_BG};
+    color: {INPUT_TEXT};
+    border: 1px solid {BORDER};
+"""
+
+# Temperatura usada nas requisições; faz parte da chave do cache de respostas
+TEMPERATURE = 0.5
+
+# Cache de respostas compartilhado por todos os provedores
+response_cache = LLMCache()
+
+
+def build_cacheable_messages(system_instruction: str, history: list = (), user_prompt: str = None) -> list:
+    """
+    Monta a lista de mensagens com a parte estática (instrução do sistema) sempre em primeiro lugar
+    e o conteúdo variável apenas acrescentado depois, permitindo acertos no cache de prompts do servidor.
+    """
+    messages = [{"role": "system", "content": system_instruction}, *history]
+    if user_prompt is not None:
+        messages.append({"role": "user", "content": user_prompt})
+    return messages
+
+
+@functools.lru_cache(maxsize=1)
+def gemini_request_options():
+    """
+    Cria uma única vez a configuração de geração, as configurações de segurança e as opções de requisição do Gemini.
+    Fica em uma função (e não em constantes do módulo) para que o SDK só seja importado quando usado.
+    """
+    import google.generativeai as genai
+    from google.api_core import retry
+    from google.api_core.exceptions import ResourceExhausted
+    from google.generativeai.types import HarmBlockThreshold, HarmCategory
+
+    generation_config = genai.types.GenerationConfig(
+        candidate_count=1,
+        max_output_tokens=1000,
+        temperature=TEMPERATURE
+    )
+    safety_settings = {
+        HarmCategory.HARM_CATEGORY_HARASSMENT: HarmBlockThreshold.BLOCK_NONE,
+        HarmCategory.HARM_CATEGORY_HATE_SPEECH: HarmBlockThreshold.BLOCK_NONE,
+        HarmCategory.HARM_CATEGORY_SEXUALLY_EXPLICIT: HarmBlockThreshold.BLOCK_NONE,
+        HarmCategory.HARM_CATEGORY_DANGEROUS_CONTENT: HarmBlockThreshold.BLOCK_NONE,
+    }
+    # Repete com espera exponencial (1 s, 2 s, 4 s...) apenas quando o limite de taxa é atingido
+    request_options = {
+        "retry": retry.Retry(
+            predicate=retry.if_exception_type(ResourceExhausted),
+            initial=1.0,
+            maximum=8.0,
+            multiplier=2.0,
+            timeout=15.0
+        )
+    }
+    return generation_config, safety_settings, request_options
 
 
 class AIProviderSetting(ABC):
@@ -71,6 +136,10 @@ class AIProviderSetting(ABC):
         """Retorna o valor atual do widget."""
         pass
 
+    def update_widget(self):
+        """Reflete o valor interno no widget já renderizado, se houver."""
+        pass
+
 
 class TextSetting(AIProviderSetting):
     """
@@ -84,16 +153,10 @@ class TextSetting(AIProviderSetting):
     def render_to_layout(self, layout: QVBoxLayout):
         row_layout = QtWidgets.QHBoxLayout()
         label = QtWidgets.QLabel(self.display_name)
-        label.setStyleSheet(f"font-size: 16px; color: {'#ffffff' if colorMode=='dark' else '#333333'};")
+        label.setStyleSheet(SETTING_LABEL_STYLE)
         row_layout.addWidget(label)
         self.input = QtWidgets.QLineEdit(self.internal_value)
-        self.input.setStyleSheet(f"""
-            font-size: 16px;
-            padding: 5px;
-            background-color: {'#444' if colorMode=='dark' else 'white'};
-            color: {'#ffffff' if colorMode=='dark' else '#000000'};
-            border: 1px solid {'#666' if colorMode=='dark' else '#ccc'};
-        """)
+        self.input.setStyleSheet(SETTING_INPUT_STYLE)
         self.input.setPlaceholderText(self.description)
         row_layout.addWidget(self.input)
         layout.addLayout(row_layout)
@@ -104,6 +167,10 @@ class TextSetting(AIProviderSetting):
     def get_value(self):
         return self.input.text()
 
+    def update_widget(self):
+        if self.input is not None:
+            self.input.setText(self.internal_value)
+
 
 class DropdownSetting(AIProviderSetting):
     """
@@ -119,16 +186,10 @@ class DropdownSetting(AIProviderSetting):
     def render_to_layout(self, layout: QVBoxLayout):
         row_layout = QtWidgets.QHBoxLayout()
         label = QtWidgets.QLabel(self.display_name)
-        label.setStyleSheet(f"font-size: 16px; color: {'#ffffff' if colorMode=='dark' else '#333333'};")
+        label.setStyleSheet(SETTING_LABEL_STYLE)
         row_layout.addWidget(label)
         self.dropdown = QtWidgets.QComboBox()
-        self.dropdown.setStyleSheet(f"""
-            font-size: 16px;
-            padding: 5px;
-            background-color: {'#444' if colorMode=='dark' else 'white'};
-            color: {'#ffffff' if colorMode=='dark' else '#000000'};
-            border: 1px solid {'#666' if colorMode=='dark' else '#ccc'};
-        """)
+        self.dropdown.setStyleSheet(SETTING_INPUT_STYLE)
         for option, value in self.options:
             self.dropdown.addItem(option, value)
         index = self.dropdown.findData(self.internal_value)
@@ -143,6 +204,12 @@ class DropdownSetting(AIProviderSetting):
     def get_value(self):
         return self.dropdown.currentData()
 
+    def update_widget(self):
+        if self.dropdown is not None:
+            index = self.dropdown.findData(self.internal_value)
+            if index != -1:
+                self.dropdown.setCurrentIndex(index)
+
 
 class AIProvider(ABC):
     """
@@ -153,6 +220,9 @@ class AIProvider(ABC):
       • after_load() para criar seu cliente ou instância de modelo
       • before_load() para limpar qualquer cliente existente
       • cancel() para cancelar uma requisição em andamento
+
+    As mensagens enviadas devem começar pela instrução do sistema, idêntica entre as chamadas,
+    seguida do conteúdo variável (veja build_cacheable_messages).
     """
     def __init__(self, app, provider_name: str, settings: List[AIProviderSetting],
                  description: str = "Um provedor de IA inacabado!",
@@ -178,6 +248,7 @@ class AIProvider(ABC):
         """
         Carrega as configurações no provedor.
         """
+        self.before_load()
         for setting in self.settings:
             if setting.name in config:
                 setattr(self, setting.name, config[setting.name])
@@ -186,6 +257,21 @@ class AIProvider(ABC):
                 setattr(self, setting.name, setting.default_value)
         self.after_load()
 
+    def is_rate_limited(self, exc: Exception) -> bool:
+        """
+        Indica se a exceção levantada pelo provedor corresponde a um limite de taxa atingido.
+        """
+        return False
+
+    def cache_key(self, model, system_instruction, prompt):
+        """
+        Retorna a chave de cache da requisição, ou None se o usuário desativou o cache.
+        Todos os provedores enviam TEMPERATURE, que entra na chave para invalidá-la se o valor mudar.
+        """
+        if self.app.config.get('disable_cache', False):
+            return None
+        return LLMCache.cache_key(self.provider_name, model, TEMPERATURE, system_instruction, prompt)
+
     def save_config(self):
         """
         Salva as configurações do provedor no arquivo de configuração principal.
@@ -228,6 +314,10 @@ class GeminiProvider(AIProvider):
     def __init__(self, app):
         self.close_requested = False
         self.model = None
+        self.model_options = None
+        self.request_options = None
+        self.model_key = None  # (api_key, model_name) usados para criar os modelos atuais
+        self.instruction_models = {}  # Modelos já criados por instrução do sistema
 
         settings = [
             TextSetting(name="api_key", display_name="Chave de API", description="Cole sua chave da API Gemini aqui"),
@@ -250,7 +340,7 @@ class GeminiProvider(AIProvider):
             "• Clique no botão abaixo para obter sua chave de API.",
             "gemini",
             "Obter Chave de API",
-            lambda: webbrowser.open("https://aistudio.google.com/app/apikey"))
+            lambda: UIUtils.open_url_async("https://aistudio.google.com/app/apikey"))
 
     def get_response(self, system_instruction: str, prompt: str, return_response: bool = False) -> str:
         """
@@ -262,49 +352,79 @@ class GeminiProvider(AIProvider):
         """
         self.close_requested = False
 
-        # Chamada única com streaming desativado
-        response = self.model.generate_content(
-            contents=[system_instruction, prompt],
-            stream=False
-        )
+        def generate():
+            # Chamada única com streaming desativado
+            response = self.get_model(system_instruction).generate_content(
+                contents=[prompt],
+                stream=False,
+                request_options=self.request_options
+            )
+            try:
+                return response.text.strip()
+            except Exception as e:
+                logging.error("Erro ao processar resposta do Gemini: %s", e)
+                return None
 
         try:
-            response_text = response.text.rstrip('\n')
-            if not return_response and not hasattr(self.app, 'current_response_window'):
+            cache_key = self.cache_key(self.model_name, system_instruction, prompt)
+            response_text = response_cache.get_or_fetch(cache_key, generate)
+            if response_text is None:
+                self.app.output_ready_signal.emit("Ocorreu um erro ao processar a resposta.")
+                self.app.output_done_signal.emit()
+                return ""
+            if not return_response and self.app.current_response_window is None:
                 self.app.output_ready_signal.emit(response_text)
-                self.app.replace_text(True)
+                self.app.output_done_signal.emit()
                 return ""
             return response_text
-        except Exception as e:
-            logging.error(f"Erro ao processar resposta do Gemini: {e}")
-            self.app.output_ready_signal.emit("Ocorreu um erro ao processar a resposta.")
         finally:
             self.close_requested = False
 
-        return ""
-
     def after_load(self):
         """
         Configura o cliente do google.generativeai e cria o modelo generativo.
         """
+        model_key = (self.api_key, self.model_name)
+        if self.model is not None and model_key == self.model_key:
+            # Mesma chave e modelo: mantém os modelos (e a conexão já aberta) em vez de recriá-los
+            return
+
+        import google.generativeai as genai
+
         genai.configure(api_key=self.api_key)
-        self.model = genai.GenerativeModel(
+        self.model_key = model_key
+        self.instruction_models.clear()
+        generation_config, safety_settings, self.request_options = gemini_request_options()
+        self.model_options = dict(
             model_name=self.model_name,
-            generation_config=genai.types.GenerationConfig(
-                candidate_count=1,
-                max_output_tokens=1000,
-                temperature=0.5
-            ),
-            safety_settings={
-                HarmCategory.HARM_CATEGORY_HARASSMENT: HarmBlockThreshold.BLOCK_NONE,
-                HarmCategory.HARM_CATEGORY_HATE_SPEECH: HarmBlockThreshold.BLOCK_NONE,
-                HarmCategory.HARM_CATEGORY_SEXUALLY_EXPLICIT: HarmBlockThreshold.BLOCK_NONE,
-                HarmCategory.HARM_CATEGORY_DANGEROUS_CONTENT: HarmBlockThreshold.BLOCK_NONE,
-            }
+            generation_config=generation_config,
+            safety_settings=safety_settings
         )
+        # Modelo sem instrução do sistema, usado nas conversas de acompanhamento
+        self.model = genai.GenerativeModel(**self.model_options)
+
+    def is_rate_limited(self, exc: Exception) -> bool:
+        # Só é chamado depois de uma falha do Gemini, quando o SDK do Google já foi carregado
+        from google.api_core.exceptions import ResourceExhausted
+
+        return isinstance(exc, ResourceExhausted)
+
+    def get_model(self, system_instruction: str):
+        """
+        Retorna um modelo com a instrução do sistema definida na construção, para que ela seja
+        enviada como system_instruction (e possa ser cacheada pelo servidor) em vez de parte do conteúdo.
+        """
+        model = self.instruction_models.get(system_instruction)
+        if model is None:
+            import google.generativeai as genai
+
+            model = genai.GenerativeModel(system_instruction=system_instruction, **self.model_options)
+            self.instruction_models[system_instruction] = model
+        return model
 
     def before_load(self):
-        self.model = None
+        # Os modelos são mantidos; after_load só os recria se a chave de API ou o modelo mudarem
+        pass
 
     def cancel(self):
         self.close_requested = True
@@ -320,6 +440,8 @@ class OpenAICompatibleProvider(AIProvider):
     def __init__(self, app):
         self.close_requested = None
         self.client = None
+        # Configurações de conexão do cliente atual; after_load só cria outro se elas mudarem
+        self.client_key = None
 
         settings = [
             TextSetting(name="api_key", display_name="Chave de API", description="Chave de API para a API compatível com OpenAI."),
@@ -331,7 +453,7 @@ class OpenAICompatibleProvider(AIProvider):
         super().__init__(app, "OpenAI Compatible (Para Especialistas)", settings,
            "• Conecte-se a QUALQUER API compatível com OpenAI (v1/chat/completions).\n"
             "• Você deve obedecer aos Termos de Serviço do serviço.",
-            "openai", "Obter Chave API da OpenAI", lambda: webbrowser.open("https://platform.openai.com/account/api-keys"))
+            "openai", "Obter Chave API da OpenAI", lambda: UIUtils.open_url_async("https://platform.openai.com/account/api-keys"))
 
     def get_response(self, system_instruction: str, prompt: str | list, return_response: bool = False) -> str:
         """
@@ -342,51 +464,66 @@ class OpenAICompatibleProvider(AIProvider):
         Retorna o texto da resposta se return_response for True,
         caso contrário, emite-o via output_ready_signal.
         """
+        # Já carregado por after_load; aqui apenas resolve o nome
+        from openai import RateLimitError
+
         self.close_requested = False
 
         if isinstance(prompt, list):
             messages = prompt
         else:
-            messages = [
-                {"role": "system", "content": system_instruction},
-                {"role": "user", "content": prompt}
-            ]
+            messages = build_cacheable_messages(system_instruction, user_prompt=prompt)
 
         try:
-            response = self.client.chat.completions.create(
-                model=self.api_model,
-                messages=messages,
-                temperature=0.5,
-                stream=False
+            cache_key = self.cache_key(self.api_model, system_instruction, messages)
+            response_text = response_cache.get_or_fetch(
+                cache_key,
+                lambda: self.client.chat.completions.create(
+                    model=self.api_model,
+                    messages=messages,
+                    temperature=TEMPERATURE,
+                    stream=False
+                ).choices[0].message.content.strip()
             )
-            response_text = response.choices[0].message.content.strip()
 
-            if not return_response and not hasattr(self.app, 'current_response_window'):
+            if not return_response and self.app.current_response_window is None:
                 self.app.output_ready_signal.emit(response_text)
+                self.app.output_done_signal.emit()
             return response_text
 
+        except RateLimitError as e:
+            logging.error("Limite de taxa atingido durante a geração de conteúdo: %s", e)
+            self.app.show_message_signal.emit(
+                "Limite de Taxa Atingido",
+                "Parece que você atingiu um limite de taxa/uso da API. Por favor, tente novamente mais tarde ou ajuste suas configurações."
+            )
+            return ""
         except Exception as e:
-            error_str = str(e)
-            logging.error(f"Erro durante a geração de conteúdo: {error_str}")
-            if "exceeded" in error_str or "rate limit" in error_str:
-                self.app.show_message_signal.emit(
-                    "Limite de Taxa Atingido",
-                    "Parece que você atingiu um limite de taxa/uso da API. Por favor, tente novamente mais tarde ou ajuste suas configurações."
-                )
-            else:
-                self.app.show_message_signal.emit("Erro", f"Ocorreu um erro: {error_str}")
+            logging.error("Erro durante a geração de conteúdo: %s", e)
+            self.app.show_message_signal.emit("Erro", f"Ocorreu um erro: {e}")
             return ""
 
     def after_load(self):
+        client_key = (self.api_key, self.api_base, self.api_organisation, self.api_project)
+        if self.client is not None and client_key == self.client_key:
+            return
+
+        from openai import OpenAI
+
+        # O cliente anterior não é fechado aqui: uma requisição em andamento no pool pode ainda usá-lo.
+        # Ao ser substituído, ele e seu pool de conexões são liberados pelo coletor de lixo.
         self.client = OpenAI(
             api_key=self.api_key,
             base_url=self.api_base,
             organization=self.api_organisation,
-            project=self.api_project
+            project=self.api_project,
+            http_client=httpx.Client(limits=HTTP_LIMITS, timeout=HTTP_TIMEOUT)
         )
+        self.client_key = client_key
 
     def before_load(self):
-        self.client = None
+        # O cliente é mantido até after_load montar o substituto (veja after_load)
+        pass
 
     def cancel(self):
         self.close_requested = True
@@ -402,6 +539,7 @@ class OllamaProvider(AIProvider):
     def __init__(self, app):
         self.close_requested = None
         self.client = None
+        self.client_key = None
         self.app = app
         settings = [
             TextSetting("api_base", "URL Base da API", "http://localhost:11434", "Ex.: http://localhost:11434"),
@@ -411,7 +549,7 @@ class OllamaProvider(AIProvider):
         super().__init__(app, "Ollama (Para Especialistas)", settings,
            "• Conectar-se a um servidor Ollama (LLM local).",
             "ollama", "Instruções de Configuração do Ollama",
-            lambda: webbrowser.open("https://github.com/theJayTea/WritingTools?tab=readme-ov-file#-optional-ollama-local-llm-instructions-for-windows-v7-onwards"))
+            lambda: UIUtils.open_url_async("https://github.com/theJayTea/WritingTools?tab=readme-ov-file#-optional-ollama-local-llm-instructions-for-windows-v7-onwards"))
 
     def get_response(self, system_instruction: str, prompt: str | list, return_response: bool = False) -> str:
         """
@@ -426,27 +564,42 @@ class OllamaProvider(AIProvider):
         if isinstance(prompt, list):
             messages = prompt
         else:
-            messages = [
-                {"role": "system", "content": system_instruction},
-                {"role": "user", "content": prompt}
-            ]
+            messages = build_cacheable_messages(system_instruction, user_prompt=prompt)
 
         try:
-            response = self.client.chat(model=self.api_model, messages=messages)
-            response_text = response['message']['content'].strip()
-            if not return_response and not hasattr(self.app, 'current_response_window'):
+            cache_key = self.cache_key(self.api_model, system_instruction, messages)
+            response_text = response_cache.get_or_fetch(
+                cache_key,
+                lambda: self.client.chat(
+                    model=self.api_model,
+                    messages=messages,
+                    options={'temperature': TEMPERATURE}
+                )['message']['content'].strip()
+            )
+            if not return_response and self.app.current_response_window is None:
                 self.app.output_ready_signal.emit(response_text)
+                self.app.output_done_signal.emit()
             return response_text
         except Exception as e:
-            logging.error(f"Erro durante o chat do Ollama: {e}")
+            logging.error("Erro durante o chat do Ollama: %s", e)
             self.app.output_ready_signal.emit("Ocorreu um erro durante o chat do Ollama.")
+            self.app.output_done_signal.emit()
             return ""
 
     def after_load(self):
-        self.client = OllamaClient(host=self.api_base)
+        if self.client is not None and self.api_base == self.client_key:
+            return
+
+        from ollama import Client as OllamaClient
+
+        # O cliente do Ollama repassa estes parâmetros ao httpx.Client que mantém internamente;
+        # o cliente anterior não é fechado, pois uma requisição em andamento pode ainda usá-lo
+        self.client = OllamaClient(host=self.api_base, timeout=HTTP_TIMEOUT, limits=HTTP_LIMITS)
+        self.client_key = self.api_base
 
     def before_load(self):
-        self.client = None
+        # O cliente é mantido até after_load montar o substituto
+        pass
 
     def cancel(self):
         self.close_requested = True
@@ -0,0 +1,101 @@
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+
+DEFAULT_MAXSIZE = 256
+DEFAULT_TTL_SECONDS = 3600
+
+
+class LLMCache:
+    """
+    Cache LRU em memória para respostas dos provedores de IA, com tempo de expiração.
+    Repetir a mesma ação sobre o mesmo texto devolve a resposta anterior sem nova requisição.
+    """
+    def __init__(self, maxsize=DEFAULT_MAXSIZE, ttl_seconds=DEFAULT_TTL_SECONDS):
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()
+        # Requisições em andamento por chave; chamadas idênticas simultâneas aguardam a primeira
+        self._pending = {}
+        # As requisições rodam no pool de threads do aplicativo
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def cache_key(provider, model, temperature, system_instruction, messages):
+        """
+        Gera a chave SHA-256 de uma requisição.
+        """
+        payload = json.dumps(
+            [provider, model, temperature, system_instruction, messages],
+            sort_keys=True,
+            ensure_ascii=False
+        )
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def get(self, key):
+        """
+        Retorna a resposta armazenada ou None se não houver (ou se tiver expirado).
+        """
+        if key is None:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            stored_at, value = entry
+            if time.monotonic() - stored_at > self.ttl_seconds:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        """
+        Armazena uma resposta, descartando a menos usada recentemente quando o cache está cheio.
+        """
+        if key is None or not value:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def get_or_fetch(self, key, fetch):
+        """
+        Retorna a resposta armazenada ou executa fetch() e armazena o resultado.
+        Se uma requisição idêntica já estiver em andamento, aguarda por ela em vez de repeti-la.
+        """
+        if key is None:
+            return fetch()
+
+        value = self.get(key)
+        if value is not None:
+            return value
+
+        with self._lock:
+            event = self._pending.get(key)
+            is_owner = event is None
+            if is_owner:
+                event = self._pending[key] = threading.Event()
+
+        if not is_owner:
+            event.wait()
+            value = self.get(key)
+            # Se a primeira requisição falhou, tenta novamente por conta própria
+            return value if value is not None else fetch()
+
+        try:
+            value = fetch()
+            self.set(key, value)
+            return value
+        finally:
+            with self._lock:
+                del self._pending[key]
+            event.set()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
@@ -12,6 +12,8 @@ def run_pyinstaller_build():
         "--name=Writing Tools",
         "--clean",
         "--noconfirm",
+        # UI windows are imported dynamically (importlib), so PyInstaller can't detect them
+        "--collect-submodules", "ui",
         # Exclude unnecessary modules
         "--exclude-module", "tkinter",
         "--exclude-module", "unittest",
@@ -1,21 +1,264 @@
 import logging
+import os
 import sys
+import threading
+from contextlib import contextmanager
 
 if sys.platform.startswith("win32"):
+    import ctypes
     import winreg
+    from ctypes import wintypes
 
-class AutostartManager:
+    # Chamadas do advapi32 que abrem, alteram e fecham a chave em uma única transição ao kernel
+    advapi32 = ctypes.WinDLL('advapi32', use_last_error=True)
+
+    RegSetKeyValueW = advapi32.RegSetKeyValueW
+    RegSetKeyValueW.argtypes = [wintypes.HKEY, wintypes.LPCWSTR, wintypes.LPCWSTR,
+                                wintypes.DWORD, wintypes.LPCVOID, wintypes.DWORD]
+    RegSetKeyValueW.restype = wintypes.LONG
+
+    RegDeleteKeyValueW = advapi32.RegDeleteKeyValueW
+    RegDeleteKeyValueW.argtypes = [wintypes.HKEY, wintypes.LPCWSTR, wintypes.LPCWSTR]
+    RegDeleteKeyValueW.restype = wintypes.LONG
+
+    RegGetValueW = advapi32.RegGetValueW
+    RegGetValueW.argtypes = [wintypes.HKEY, wintypes.LPCWSTR, wintypes.LPCWSTR, wintypes.DWORD,
+                             wintypes.LPDWORD, wintypes.LPVOID, wintypes.LPDWORD]
+    RegGetValueW.restype = wintypes.LONG
+
+    RegCreateKeyExW = advapi32.RegCreateKeyExW
+    RegCreateKeyExW.argtypes = [wintypes.HKEY, wintypes.LPCWSTR, wintypes.DWORD, wintypes.LPWSTR,
+                                wintypes.DWORD, wintypes.DWORD, wintypes.LPVOID,
+                                ctypes.POINTER(wintypes.HKEY), wintypes.LPDWORD]
+    RegCreateKeyExW.restype = wintypes.LONG
+
+    RegQueryValueExW = advapi32.RegQueryValueExW
+    RegQueryValueExW.argtypes = [wintypes.HKEY, wintypes.LPCWSTR, wintypes.LPDWORD,
+                                 wintypes.LPDWORD, wintypes.LPVOID, wintypes.LPDWORD]
+    RegQueryValueExW.restype = wintypes.LONG
+
+    RegSetValueExW = advapi32.RegSetValueExW
+    RegSetValueExW.argtypes = [wintypes.HKEY, wintypes.LPCWSTR, wintypes.DWORD, wintypes.DWORD,
+                               wintypes.LPCVOID, wintypes.DWORD]
+    RegSetValueExW.restype = wintypes.LONG
+
+    RegDeleteValueW = advapi32.RegDeleteValueW
+    RegDeleteValueW.argtypes = [wintypes.HKEY, wintypes.LPCWSTR]
+    RegDeleteValueW.restype = wintypes.LONG
+
+    RegCloseKey = advapi32.RegCloseKey
+    RegCloseKey.argtypes = [wintypes.HKEY]
+    RegCloseKey.restype = wintypes.LONG
+
+    RegNotifyChangeKeyValue = advapi32.RegNotifyChangeKeyValue
+    RegNotifyChangeKeyValue.argtypes = [wintypes.HKEY, wintypes.BOOL, wintypes.DWORD,
+                                        wintypes.HANDLE, wintypes.BOOL]
+    RegNotifyChangeKeyValue.restype = wintypes.LONG
+
+    kernel32 = ctypes.WinDLL('kernel32', use_last_error=True)
+
+    CompareStringOrdinal = kernel32.CompareStringOrdinal
+    CompareStringOrdinal.argtypes = [wintypes.LPCWSTR, ctypes.c_int, wintypes.LPCWSTR,
+                                     ctypes.c_int, wintypes.BOOL]
+    CompareStringOrdinal.restype = ctypes.c_int
+
+    CreateEventW = kernel32.CreateEventW
+    CreateEventW.argtypes = [wintypes.LPVOID, wintypes.BOOL, wintypes.BOOL, wintypes.LPCWSTR]
+    CreateEventW.restype = wintypes.HANDLE
+
+    WaitForSingleObject = kernel32.WaitForSingleObject
+    WaitForSingleObject.argtypes = [wintypes.HANDLE, wintypes.DWORD]
+    WaitForSingleObject.restype = wintypes.DWORD
+
+    CloseHandle = kernel32.CloseHandle
+    CloseHandle.argtypes = [wintypes.HANDLE]
+    CloseHandle.restype = wintypes.BOOL
+
+    # COM usado para criar o atalho na pasta Inicializar quando o registro está bloqueado (GPO)
+    ole32 = ctypes.OleDLL('ole32')
+    ole32.CoUninitialize.restype = None
+
+    class GUID(ctypes.Structure):
+        _fields_ = [("Data1", wintypes.DWORD), ("Data2", wintypes.WORD),
+                    ("Data3", wintypes.WORD), ("Data4", ctypes.c_ubyte * 8)]
+
+    def make_guid(text):
+        guid = GUID()
+        ole32.CLSIDFromString(text, ctypes.byref(guid))
+        return guid
+
+    CLSID_ShellLink = make_guid("{00021401-0000-0000-C000-000000000046}")
+    IID_IShellLinkW = make_guid("{000214F9-0000-0000-C000-000000000046}")
+    IID_IPersistFile = make_guid("{0000010B-0000-0000-C000-000000000046}")
+    COINIT_APARTMENTTHREADED = 0x2
+    CLSCTX_INPROC_SERVER = 0x1
+    # Índices na vtable: IUnknown (0-2), IShellLinkW::SetPath (20), IPersistFile::Save (6)
+    VTBL_QUERY_INTERFACE = 0
+    VTBL_RELEASE = 2
+    VTBL_SHELLLINK_SET_PATH = 20
+    VTBL_PERSISTFILE_SAVE = 6
+
+    def com_call(obj, index, restype, argtypes, *args):
+        """
+        Chama o método de índice `index` na vtable de uma interface COM.
+        """
+        vtable = ctypes.cast(obj, ctypes.POINTER(ctypes.POINTER(ctypes.c_void_p))).contents
+        method = ctypes.WINFUNCTYPE(restype, ctypes.c_void_p, *argtypes)(vtable[index])
+        return method(obj, *args)
+
+    # Mesmo valor (com extensão de sinal) que o HKEY_CURRENT_USER do SDK do Windows
+    HKEY_CURRENT_USER = wintypes.HKEY(ctypes.c_long(winreg.HKEY_CURRENT_USER).value)
+    ERROR_SUCCESS = 0
+    ERROR_FILE_NOT_FOUND = 2
+    ERROR_MORE_DATA = 234
+    RRF_RT_REG_SZ = 0x00000002
+    REG_OPTION_NON_VOLATILE = 0x00000000
+    CSTR_EQUAL = 2
+    REG_NOTIFY_CHANGE_LAST_SET = 0x00000004
+    INFINITE = 0xFFFFFFFF
+    WAIT_OBJECT_0 = 0
+    # Tamanho inicial do buffer de leitura, em caracteres (MAX_PATH com folga)
+    REG_SZ_BUFFER_CHARS = 520
+
+RUN_KEY_PATH = r"Software\Microsoft\Windows\CurrentVersion\Run"
+RUN_VALUE_NAME = "WritingTools"
+
+# sys.frozen, sys._MEIPASS e sys.executable não mudam depois da inicialização
+_IS_COMPILED = hasattr(sys, 'frozen') and hasattr(sys, '_MEIPASS')
+_STARTUP_PATH = sys.executable if (sys.platform.startswith('win32') and _IS_COMPILED) else None
+
+if _STARTUP_PATH:
+    # Caminho já em UTF-16, reutilizado em todas as escritas e comparações (tamanho inclui o terminador nulo)
+    _STARTUP_PATH_W = ctypes.create_unicode_buffer(_STARTUP_PATH)
+    _STARTUP_PATH_CB = ctypes.sizeof(_STARTUP_PATH_W)
+    _STARTUP_SHORTCUT_PATH = os.path.join(os.environ.get('APPDATA', ''), 'Microsoft', 'Windows',
+                                          'Start Menu', 'Programs', 'Startup', 'WritingTools.lnk')
+
+@contextmanager
+def open_run_key(access):
+    """
+    Abre a chave Run do usuário atual (criando-a, se não existir) e garante o fechamento
+    do handle ao sair do bloco, mesmo se uma exceção for lançada.
+    """
+    key = wintypes.HKEY()
+    disposition = wintypes.DWORD()
+    result = RegCreateKeyExW(HKEY_CURRENT_USER, RUN_KEY_PATH, 0, None, REG_OPTION_NON_VOLATILE,
+                             access, None, ctypes.byref(key), ctypes.byref(disposition))
+    if result != ERROR_SUCCESS:
+        raise ctypes.WinError(result)
+    try:
+        yield key
+    finally:
+        RegCloseKey(key)
+
+def set_startup_shortcut(enable):
+    """
+    Cria ou remove o atalho do Writing Tools na pasta Inicializar do usuário.
+    Alternativa ao registro em imagens onde a chave Run está bloqueada por política de grupo.
+    Retorna True se a operação foi bem-sucedida.
+    """
+    if not enable:
+        try:
+            os.remove(_STARTUP_SHORTCUT_PATH)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logging.error(f"Falha ao remover o atalho de inicialização automática: {e}")
+            return False
+        return True
+
+    try:
+        ole32.CoInitializeEx(None, COINIT_APARTMENTTHREADED)
+        initialized = True
+    except OSError:
+        # COM já inicializado nesta thread em outro modo, o que ainda permite usá-lo
+        initialized = False
+
+    link = ctypes.c_void_p()
+    persist = ctypes.c_void_p()
+    try:
+        ole32.CoCreateInstance(ctypes.byref(CLSID_ShellLink), None, CLSCTX_INPROC_SERVER,
+                               ctypes.byref(IID_IShellLinkW), ctypes.byref(link))
+        com_call(link, VTBL_SHELLLINK_SET_PATH, ctypes.HRESULT, [wintypes.LPCWSTR], _STARTUP_PATH_W)
+        com_call(link, VTBL_QUERY_INTERFACE, ctypes.HRESULT,
+                 [ctypes.POINTER(GUID), ctypes.POINTER(ctypes.c_void_p)],
+                 ctypes.byref(IID_IPersistFile), ctypes.byref(persist))
+        com_call(persist, VTBL_PERSISTFILE_SAVE, ctypes.HRESULT, [wintypes.LPCWSTR, wintypes.BOOL],
+                 _STARTUP_SHORTCUT_PATH, True)
+        return True
+    except OSError as e:
+        logging.error(f"Falha ao criar o atalho de inicialização automática: {e}")
+        return False
+    finally:
+        for obj in (persist, link):
+            if obj:
+                com_call(obj, VTBL_RELEASE, wintypes.ULONG, [])
+        if initialized:
+            ole32.CoUninitialize()
+
+class _WindowsAutostartManager:
     """
     Gerencia a funcionalidade de inicialização automática do Writing Tools.
-    Trata a configuração e remoção das entradas de registro de inicialização automática no Windows.
+    Trata a configuração e remoção das entradas de registro de inicialização automática no Windows,
+    recorrendo a um atalho na pasta Inicializar quando o registro não pode ser alterado.
     """
-    
+
+    # Último estado conhecido (True/False), ou None se ainda não foi consultado
+    _cached_state = None
+    # Thread que descarta o cache quando a chave Run é alterada fora do aplicativo
+    _watcher_thread = None
+
+    @staticmethod
+    def invalidate_cache():
+        """
+        Descarta o estado em cache, forçando a próxima verificação a consultar o registro.
+        Deve ser chamado se a entrada puder ter sido alterada fora do aplicativo (instalador, atualizador).
+        """
+        _WindowsAutostartManager._cached_state = None
+
+    @staticmethod
+    def start_change_watcher():
+        """
+        Inicia, uma única vez, a thread que aguarda alterações na chave Run (regedit, instalador,
+        atualizador) e descarta o cache quando elas ocorrem, em vez de consultar o registro periodicamente.
+        """
+        if _WindowsAutostartManager._watcher_thread is not None:
+            return
+        _WindowsAutostartManager._watcher_thread = threading.Thread(
+            target=_WindowsAutostartManager._watch_run_key, name="AutostartWatcher", daemon=True
+        )
+        _WindowsAutostartManager._watcher_thread.start()
+
+    @staticmethod
+    def _watch_run_key():
+        """
+        Registra RegNotifyChangeKeyValue na chave Run e invalida o cache a cada notificação.
+        A notificação é de uso único, então é registrada novamente após cada sinal.
+        """
+        event = CreateEventW(None, False, False, None)
+        if not event:
+            logging.error(f"Falha ao criar o evento de monitoramento do registro: {ctypes.WinError(ctypes.get_last_error())}")
+            return
+        try:
+            with open_run_key(winreg.KEY_NOTIFY) as key:
+                while True:
+                    result = RegNotifyChangeKeyValue(key, False, REG_NOTIFY_CHANGE_LAST_SET, event, True)
+                    if result != ERROR_SUCCESS:
+                        raise ctypes.WinError(result)
+                    if WaitForSingleObject(event, INFINITE) != WAIT_OBJECT_0:
+                        break
+                    _WindowsAutostartManager._cached_state = None
+        except WindowsError as e:
+            logging.error(f"Falha ao monitorar o registro de inicialização automática: {e}")
+        finally:
+            CloseHandle(event)
+
     @staticmethod
     def is_compiled():
         """
         Verifica se estamos executando a partir de um exe compilado ou do código-fonte.
         """
-        return hasattr(sys, 'frozen') and hasattr(sys, '_MEIPASS')
+        return _IS_COMPILED
 
     @staticmethod
     def get_startup_path():
@@ -23,13 +266,7 @@ class AutostartManager:
         Retorna o caminho que deve ser usado para a inicialização automática.
         Retorna None se estiver executando a partir do código-fonte ou em um sistema que não seja Windows.
         """
-        if not sys.platform.startswith('win32'):
-            return None
-            
-        if not AutostartManager.is_compiled():
-            return None
-            
-        return sys.executable
+        return _STARTUP_PATH
 
     @staticmethod
     def set_autostart(enable: bool) -> bool:
@@ -43,40 +280,97 @@ class AutostartManager:
             bool: True se a operação foi bem-sucedida, False se falhou ou não for suportada
         """
         try:
-            startup_path = AutostartManager.get_startup_path()
-            if not startup_path:
+            if enable:
+                # Cria a chave, se necessário, e define o valor (REG_SZ inclui o terminador nulo)
+                result = RegSetKeyValueW(HKEY_CURRENT_USER, RUN_KEY_PATH, RUN_VALUE_NAME,
+                                         winreg.REG_SZ, _STARTUP_PATH_W, _STARTUP_PATH_CB)
+            else:
+                # Deleta o valor; se ele não existir, está ok
+                result = RegDeleteKeyValueW(HKEY_CURRENT_USER, RUN_KEY_PATH, RUN_VALUE_NAME)
+                if result == ERROR_FILE_NOT_FOUND:
+                    result = ERROR_SUCCESS
+
+            if result != ERROR_SUCCESS:
+                raise ctypes.WinError(result)
+
+        except WindowsError as e:
+            logging.error(f"Falha ao modificar o registro de inicialização automática: {e}")
+            if not enable:
+                # O atalho criado quando o registro estava bloqueado ainda precisa ser removido;
+                # o estado é relido na próxima consulta, pois o valor do registro pode ter ficado
+                _WindowsAutostartManager._cached_state = None
+                return set_startup_shortcut(False)
+            # Com o registro bloqueado, a inicialização automática ainda pode ser ativada pelo atalho
+            if not set_startup_shortcut(True):
                 return False
+            _WindowsAutostartManager._cached_state = True
+            return True
 
-            key_path = r"Software\Microsoft\Windows\CurrentVersion\Run"
-            
-            try:
-                if enable:
-                    # Abre/cria a chave e define o valor
-                    key = winreg.OpenKey(winreg.HKEY_CURRENT_USER, key_path, 0, 
-                                       winreg.KEY_WRITE)
-                    winreg.SetValueEx(key, "WritingTools", 0, winreg.REG_SZ, 
-                                    startup_path)
-                else:
-                    # Abre a chave e deleta o valor, se existir
-                    key = winreg.OpenKey(winreg.HKEY_CURRENT_USER, key_path, 0,
-                                       winreg.KEY_WRITE)
-                    try:
-                        winreg.DeleteValue(key, "WritingTools")
-                    except WindowsError:
-                        # O valor não existe, o que está ok
-                        pass
-                        
-                winreg.CloseKey(key)
-                return True
-                
-            except WindowsError as e:
-                logging.error(f"Falha ao modificar o registro de inicialização automática: {e}")
+        # O atalho pode ter sido criado antes, quando o registro estava bloqueado
+        if not enable and not set_startup_shortcut(False):
+            return False
+
+        _WindowsAutostartManager._cached_state = enable
+        return True
+
+    @staticmethod
+    def sync_autostart(enable: bool) -> bool:
+        """
+        Garante que a inicialização automática esteja no estado desejado.
+        Lê o valor atual e só escreve se ele for diferente, usando um único handle da chave
+        para a leitura e a escrita.
+
+        Parâmetros:
+            enable: True para ativar a inicialização automática, False para desativar
+
+        Retorna:
+            bool: True se o estado final é o desejado, False se falhou ou não for suportada
+        """
+        if _WindowsAutostartManager._cached_state == enable:
+            return True
+
+        try:
+            with open_run_key(winreg.KEY_QUERY_VALUE | winreg.KEY_SET_VALUE) as key:
+                value_type = wintypes.DWORD()
+                buffer = ctypes.create_unicode_buffer(REG_SZ_BUFFER_CHARS)
+                size = wintypes.DWORD(ctypes.sizeof(buffer))
+                result = RegQueryValueExW(key, RUN_VALUE_NAME, None, ctypes.byref(value_type),
+                                          buffer, ctypes.byref(size))
+                # Um valor maior que o buffer não pode ser o nosso caminho
+                current = (result == ERROR_SUCCESS and value_type.value == winreg.REG_SZ
+                           and CompareStringOrdinal(buffer, -1, _STARTUP_PATH_W, -1, True) == CSTR_EQUAL)
+
+                if current != enable:
+                    if enable:
+                        result = RegSetValueExW(key, RUN_VALUE_NAME, 0, winreg.REG_SZ,
+                                                _STARTUP_PATH_W, _STARTUP_PATH_CB)
+                    else:
+                        result = RegDeleteValueW(key, RUN_VALUE_NAME)
+                        if result == ERROR_FILE_NOT_FOUND:
+                            result = ERROR_SUCCESS
+
+                    if result != ERROR_SUCCESS:
+                        raise ctypes.WinError(result)
+
+        except WindowsError as e:
+            logging.error(f"Falha ao modificar o registro de inicialização automática: {e}")
+            _WindowsAutostartManager._cached_state = None
+            if not enable:
+                # O atalho criado quando o registro estava bloqueado ainda precisa ser removido
+                return set_startup_shortcut(False)
+            # Com o registro bloqueado, a inicialização automática ainda pode ser ativada pelo atalho
+            if not set_startup_shortcut(True):
                 return False
-                
-        except Exception as e:
-            logging.error(f"Erro ao gerenciar a inicialização automática: {e}")
+            _WindowsAutostartManager._cached_state = True
+            return True
+
+        # O atalho pode ter sido criado antes, quando o registro estava bloqueado
+        if not enable and not set_startup_shortcut(False):
             return False
 
+        _WindowsAutostartManager._cached_state = enable
+        return True
+
     @staticmethod
     def check_autostart() -> bool:
         """
@@ -85,25 +379,67 @@ class AutostartManager:
         Retorna:
             bool: True se a inicialização automática estiver ativada, False se estiver desativada ou não for suportada
         """
-        try:
-            startup_path = AutostartManager.get_startup_path()
-            if not startup_path:
-                return False
+        _WindowsAutostartManager.start_change_watcher()
+        cached = _WindowsAutostartManager._cached_state
+        if cached is not None:
+            return cached
 
-            try:
-                key = winreg.OpenKey(winreg.HKEY_CURRENT_USER, 
-                                   r"Software\Microsoft\Windows\CurrentVersion\Run",
-                                   0, winreg.KEY_READ)
-                value, _ = winreg.QueryValueEx(key, "WritingTools")
-                winreg.CloseKey(key)
-                
-                # Verifica se o caminho armazenado corresponde ao nosso exe atual
-                return value.lower() == startup_path.lower()
-                
-            except WindowsError:
-                # A chave ou valor não existe
-                return False
-                
-        except Exception as e:
-            logging.error(f"Erro ao verificar o status da inicialização automática: {e}")
-            return False
+        # Abre, lê e fecha a chave em uma única chamada, aceitando apenas valores REG_SZ
+        buffer = ctypes.create_unicode_buffer(REG_SZ_BUFFER_CHARS)
+        size = wintypes.DWORD(ctypes.sizeof(buffer))
+        result = RegGetValueW(HKEY_CURRENT_USER, RUN_KEY_PATH, RUN_VALUE_NAME, RRF_RT_REG_SZ,
+                              None, buffer, ctypes.byref(size))
+        if result == ERROR_MORE_DATA:
+            # Caminho maior que o buffer inicial: repete com o tamanho informado
+            buffer = ctypes.create_unicode_buffer(size.value // 2 + 1)
+            size = wintypes.DWORD(ctypes.sizeof(buffer))
+            result = RegGetValueW(HKEY_CURRENT_USER, RUN_KEY_PATH, RUN_VALUE_NAME, RRF_RT_REG_SZ,
+                                  None, buffer, ctypes.byref(size))
+
+        if result == ERROR_SUCCESS:
+            # Verifica se o caminho armazenado corresponde ao nosso exe atual (sem diferenciar maiúsculas)
+            enabled = CompareStringOrdinal(buffer, -1, _STARTUP_PATH_W, -1, True) == CSTR_EQUAL
+        else:
+            # A chave ou valor não existe (ou não é REG_SZ); verifica o atalho na pasta Inicializar
+            enabled = os.path.exists(_STARTUP_SHORTCUT_PATH)
+
+        _WindowsAutostartManager._cached_state = enabled
+        return enabled
+
+
+class _NoopAutostartManager:
+    """
+    Usado fora do Windows ou ao executar a partir do código-fonte: a inicialização automática não é suportada.
+    """
+
+    @staticmethod
+    def invalidate_cache():
+        pass
+
+    @staticmethod
+    def start_change_watcher():
+        pass
+
+    @staticmethod
+    def is_compiled():
+        return _IS_COMPILED
+
+    @staticmethod
+    def get_startup_path():
+        return None
+
+    @staticmethod
+    def set_autostart(enable: bool) -> bool:
+        return False
+
+    @staticmethod
+    def sync_autostart(enable: bool) -> bool:
+        return False
+
+    @staticmethod
+    def check_autostart() -> bool:
+        return False
+
+
+# Escolhe a implementação uma única vez, na importação
+AutostartManager = _WindowsAutostartManager if _STARTUP_PATH else _NoopAutostartManager
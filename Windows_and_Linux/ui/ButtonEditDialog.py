@@ -0,0 +1,207 @@
+from PySide6.QtWidgets import (
+    QDialog,
+    QHBoxLayout,
+    QLabel,
+    QLineEdit,
+    QPlainTextEdit,
+    QPushButton,
+    QRadioButton,
+    QVBoxLayout,
+)
+
+from ui.UIUtils import colorMode
+
+################################################################################
+# Conteúdo padrão do arquivo `options.json` para restaurar quando o usuário pressionar "Reset"
+################################################################################
+DEFAULT_OPTIONS = {
+    "Revisão": {
+        "prefix": "Revise este texto:\n\n",
+        "instruction": "Você é um assistente de revisão gramatical. Produza APENAS o texto corrigido sem comentários adicionais. Mantenha a estrutura original do texto e o estilo de escrita. Responda no mesmo idioma do texto de entrada (ex.: Inglês dos EUA, Francês). Não responda ou comente o conteúdo do texto fornecido pelo usuário. Se o texto for absolutamente incompatível com essa tarefa (ex.: completo nonsense aleatório), produza \"ERROR_TEXT_INCOMPATIBLE_WITH_REQUEST\".",
+        "icon": "icons/magnifying-glass",
+        "open_in_window": False,
+    },
+    "Reescrever": {
+        "prefix": "Reescreva isto:\n\n",
+        "instruction": "Você é um assistente de escrita. Reescreva o texto fornecido pelo usuário para melhorar a forma de expressão. Produza APENAS o texto reescrito sem comentários adicionais. Responda no mesmo idioma do texto de entrada (ex.: Inglês dos EUA, Francês). Não responda ou comente o conteúdo do texto fornecido pelo usuário. Se o texto for absolutamente incompatível com a tarefa de reescrita (ex.: completo nonsense aleatório), produza \"ERROR_TEXT_INCOMPATIBLE_WITH_REQUEST\".",
+        "icon": "icons/rewrite",
+        "open_in_window": False,
+    },
+    "Amigável": {
+        "prefix": "Torne isto mais amigável:\n\n",
+        "instruction": "Você é um assistente de escrita. Reescreva o texto fornecido pelo usuário para que fique mais amigável. Produza APENAS o texto amigável sem comentários adicionais. Responda no mesmo idioma do texto de entrada (ex.: Inglês dos EUA, Francês). Não responda ou comente o conteúdo do texto fornecido pelo usuário. Se o texto for absolutamente incompatível com a tarefa de reescrita (ex.: completo nonsense aleatório), produza \"ERROR_TEXT_INCOMPATIBLE_WITH_REQUEST\".",
+        "icon": "icons/smiley-face",
+        "open_in_window": False,
+    },
+    "Profissional": {
+        "prefix": "Torne isto mais profissional:\n\n",
+        "instruction": "Você é um assistente de escrita. Reescreva o texto fornecido pelo usuário para que fique mais profissional. Produza APENAS o texto profissional sem comentários adicionais. Responda no mesmo idioma do texto de entrada (ex.: Inglês dos EUA, Francês). Não responda ou comente o conteúdo do texto fornecido pelo usuário. Se o texto for absolutamente incompatível com a tarefa de reescrita (ex.: completo nonsense aleatório), produza \"ERROR_TEXT_INCOMPATIBLE_WITH_REQUEST\".",
+        "icon": "icons/briefcase",
+        "open_in_window": False,
+    },
+    "Conciso": {
+        "prefix": "Torne isto mais conciso:\n\n",
+        "instruction": "Você é um assistente de escrita. Reescreva o texto fornecido pelo usuário para que fique mais conciso. Produza APENAS o texto conciso sem comentários adicionais. Responda no mesmo idioma do texto de entrada (ex.: Inglês dos EUA, Francês). Não responda ou comente o conteúdo do texto fornecido pelo usuário. Se o texto for absolutamente incompatível com a tarefa de reescrita (ex.: completo nonsense aleatório), produza \"ERROR_TEXT_INCOMPATIBLE_WITH_REQUEST\".",
+        "icon": "icons/concise",
+        "open_in_window": False,
+    },
+    "Resumo": {
+        "prefix": "Resuma isto:\n\n",
+        "instruction": "Você é um assistente de resumo. Forneça um resumo sucinto do texto fornecido pelo usuário. O resumo deve ser breve, mas englobar todos os pontos-chave e insights. Para tornar o texto legível, utilize formatação Markdown (negrito, itálico, blocos de código, etc.) conforme apropriado. Você também pode adicionar um pequeno espaçamento entre os parágrafos, conforme necessário. E somente se apropriado, pode utilizar títulos (apenas os mais pequenos), listas, tabelas, etc. Não seja repetitivo ou excessivamente prolixo. Produza APENAS o resumo sem comentários adicionais. Responda no mesmo idioma do texto de entrada (ex.: Inglês dos EUA, Francês). Não responda ou comente o conteúdo do texto fornecido pelo usuário. Se o texto for absolutamente incompatível com a tarefa de sumarização (ex.: completo nonsense aleatório), produza \"ERROR_TEXT_INCOMPATIBLE_WITH_REQUEST\".",
+        "icon": "icons/summary",
+        "open_in_window": True,
+    },
+    "Pontos-chave": {
+        "prefix": "Extraia os pontos-chave disto:\n\n",
+        "instruction": "Você é um assistente que extrai os pontos-chave do texto fornecido pelo usuário. Produza APENAS os pontos-chave sem comentários adicionais. Utilize formatação Markdown (listas, negrito, itálico, blocos de código, etc.) conforme apropriado para tornar o texto legível. Não seja repetitivo ou excessivamente prolixo. Responda no mesmo idioma do texto de entrada (ex.: Inglês dos EUA, Francês). Não responda ou comente o conteúdo do texto fornecido pelo usuário. Se o texto for absolutamente incompatível com a tarefa de extração de pontos-chave (ex.: completo nonsense aleatório), produza \"ERROR_TEXT_INCOMPATIBLE_WITH_REQUEST\".",
+        "icon": "icons/keypoints",
+        "open_in_window": True,
+    },
+    "Tabela": {
+        "prefix": "Converta isto em uma tabela:\n\n",
+        "instruction": "Você é um assistente que converte o texto fornecido pelo usuário em uma tabela Markdown. Produza APENAS a tabela sem comentários adicionais. Responda no mesmo idioma do texto de entrada (ex.: Inglês dos EUA, Francês). Não responda ou comente o conteúdo do texto fornecido pelo usuário. Se o texto for completamente incompatível com essa conversão, produza \"ERROR_TEXT_INCOMPATIBLE_WITH_REQUEST\".",
+        "icon": "icons/table",
+        "open_in_window": True,
+    },
+}
+
+# Estilos fixos do diálogo, calculados uma única vez a partir do tema
+LABEL_STYLE = f"color: {'#fff' if colorMode == 'dark' else '#333'}; font-weight: bold;"
+RADIO_STYLE = f"color: {'#fff' if colorMode == 'dark' else '#333'};"
+
+# Seletores restritos pelo objectName, para que o estilo não seja avaliado nos widgets internos
+LINE_EDIT_STYLE = f"""
+    QLineEdit#ButtonNameInput {{
+        padding: 8px;
+        border: 1px solid {'#777' if colorMode == 'dark' else '#ccc'};
+        border-radius: 8px;
+        background-color: {'#333' if colorMode == 'dark' else 'white'};
+        color: {'#fff' if colorMode == 'dark' else '#000'};
+    }}
+"""
+
+PLAIN_TEXT_EDIT_STYLE = f"""
+    QPlainTextEdit#InstructionInput {{
+        padding: 8px;
+        border: 1px solid {'#777' if colorMode == 'dark' else '#ccc'};
+        border-radius: 8px;
+        background-color: {'#333' if colorMode == 'dark' else 'white'};
+        color: {'#fff' if colorMode == 'dark' else '#000'};
+    }}
+"""
+
+DIALOG_BUTTON_STYLE = f"""
+    QPushButton#DialogButton {{
+        background-color: {'#444' if colorMode == 'dark' else '#f0f0f0'};
+        color: {'#fff' if colorMode == 'dark' else '#000'};
+        border: 1px solid {'#666' if colorMode == 'dark' else '#ccc'};
+        border-radius: 5px;
+        padding: 8px;
+        min-width: 100px;
+    }}
+    QPushButton#DialogButton:hover {{
+        background-color: {'#555' if colorMode == 'dark' else '#e0e0e0'};
+    }}
+"""
+
+DIALOG_STYLE = f"""
+    QDialog#ButtonEditDialog {{
+        background-color: {'#222' if colorMode == 'dark' else '#f5f5f5'};
+        border-radius: 10px;
+    }}
+"""
+
+class ButtonEditDialog(QDialog):
+    """
+    Diálogo para editar ou criar as propriedades de um botão
+    (nome/título, instrução do sistema, exibir em janela, etc.).
+    """
+    def __init__(self, parent=None, button_data=None, title="Editar Botão"):
+        super().__init__(parent)
+        self.button_data = button_data if button_data else {
+            "prefix": "Faça esta alteração no seguinte texto:\n\n",
+            "instruction": "",
+            "icon": "icons/magnifying-glass",
+            "open_in_window": False
+        }
+        self.setWindowTitle(title)
+        self.setObjectName("ButtonEditDialog")
+        self.init_ui()
+        
+    def init_ui(self):
+        layout = QVBoxLayout(self)
+        
+        # Nome do Botão
+        name_label = QLabel("Nome do Botão:")
+        name_label.setStyleSheet(LABEL_STYLE)
+        self.name_input = QLineEdit()
+        self.name_input.setObjectName("ButtonNameInput")
+        self.name_input.setStyleSheet(LINE_EDIT_STYLE)
+        if "name" in self.button_data:
+            self.name_input.setText(self.button_data["name"])
+        layout.addWidget(name_label)
+        layout.addWidget(self.name_input)
+        
+        # Instrução (alterada para um QPlainTextEdit multilinha)
+        instruction_label = QLabel("O que sua IA deve fazer com o texto selecionado? (Instrução do Sistema)")
+        instruction_label.setStyleSheet(LABEL_STYLE)
+        self.instruction_input = QPlainTextEdit()
+        self.instruction_input.setObjectName("InstructionInput")
+        self.instruction_input.setStyleSheet(PLAIN_TEXT_EDIT_STYLE)
+        self.instruction_input.setPlainText(self.button_data.get("instruction", ""))
+        self.instruction_input.setMinimumHeight(100)
+        self.instruction_input.setPlaceholderText("""Exemplos:
+    - Corrija / melhore / explique este código.
+    - Torne-o engraçado.
+    - Adicione emojis!
+    - Tire sarro disso!
+    - Traduza para o inglês.
+    - Coloque o texto em formato de título.
+    - Se estiver todo em maiúsculas, coloque tudo em minúsculas, e vice-versa.
+    - Escreva uma resposta para isto.
+    - Analise possíveis vieses neste artigo de notícias.""")
+        layout.addWidget(instruction_label)
+        layout.addWidget(self.instruction_input)
+        
+        # open_in_window
+        display_label = QLabel("Como a resposta da sua IA deve ser exibida?")
+        display_label.setStyleSheet(LABEL_STYLE)
+        layout.addWidget(display_label)
+        
+        radio_layout = QHBoxLayout()
+        self.replace_radio = QRadioButton("Substituir o texto selecionado")
+        self.window_radio = QRadioButton("Em uma janela pop-up (com suporte para acompanhamento)")
+        for r in (self.replace_radio, self.window_radio):
+            r.setStyleSheet(RADIO_STYLE)
+        
+        self.replace_radio.setChecked(not self.button_data.get("open_in_window", False))
+        self.window_radio.setChecked(self.button_data.get("open_in_window", False))
+        
+        radio_layout.addWidget(self.replace_radio)
+        radio_layout.addWidget(self.window_radio)
+        layout.addLayout(radio_layout)
+        
+        # Botões OK & Cancelar
+        btn_layout = QHBoxLayout()
+        ok_button = QPushButton("OK")
+        cancel_button = QPushButton("Cancelar")
+        for btn in (ok_button, cancel_button):
+            btn.setObjectName("DialogButton")
+            btn.setStyleSheet(DIALOG_BUTTON_STYLE)
+        btn_layout.addWidget(ok_button)
+        btn_layout.addWidget(cancel_button)
+        layout.addLayout(btn_layout)
+        
+        ok_button.clicked.connect(self.accept)
+        cancel_button.clicked.connect(self.reject)
+        
+        self.setStyleSheet(DIALOG_STYLE)
+
+    def get_button_data(self):
+        return {
+            "name": self.name_input.text(),
+            "prefix": "Faça esta alteração no seguinte texto:\n\n",
+            "instruction": self.instruction_input.toPlainText(),
+            "icon": "icons/custom",
+            "open_in_window": self.window_radio.isChecked()
+        }
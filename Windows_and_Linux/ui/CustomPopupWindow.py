@@ -1,207 +1,169 @@
+import copy
 import json
 import logging
 import os
-import sys
 from functools import partial
 
 from PySide6 import QtCore, QtGui, QtWidgets
 from PySide6.QtCore import Qt
 from PySide6.QtWidgets import (
-    QDialog,
     QHBoxLayout,
     QLabel,
     QLineEdit,
-    QPlainTextEdit,
     QPushButton,
-    QRadioButton,
-    QVBoxLayout,
     QWidget,
 )
 
-from ui.UIUtils import ThemeBackground, colorMode
+from ui.UIUtils import APP_DIR, ThemeBackground, UIUtils, colorMode, set_themed_icon, themed_icon
+
+try:
+    import orjson
+except ImportError:  # orjson é opcional; sem ele usamos o json da biblioteca padrão
+    orjson = None
 
 _ = lambda x: x
 
-################################################################################
-# Conteúdo padrão do arquivo `options.json` para restaurar quando o usuário pressionar "Reset"
-################################################################################
-DEFAULT_OPTIONS_JSON = r"""{
-{
-  "Revisão": {
-    "prefix": "Revise este texto:\n\n",
-    "instruction": "Você é um assistente de revisão gramatical. Produza APENAS o texto corrigido sem comentários adicionais. Mantenha a estrutura original do texto e o estilo de escrita. Responda no mesmo idioma do texto de entrada (ex.: Inglês dos EUA, Francês). Não responda ou comente o conteúdo do texto fornecido pelo usuário. Se o texto for absolutamente incompatível com essa tarefa (ex.: completo nonsense aleatório), produza \"ERROR_TEXT_INCOMPATIBLE_WITH_REQUEST\".",
-    "icon": "icons/magnifying-glass",
-    "open_in_window": false
-  },
-  "Reescrever": {
-    "prefix": "Reescreva isto:\n\n",
-    "instruction": "Você é um assistente de escrita. Reescreva o texto fornecido pelo usuário para melhorar a forma de expressão. Produza APENAS o texto reescrito sem comentários adicionais. Responda no mesmo idioma do texto de entrada (ex.: Inglês dos EUA, Francês). Não responda ou comente o conteúdo do texto fornecido pelo usuário. Se o texto for absolutamente incompatível com a tarefa de reescrita (ex.: completo nonsense aleatório), produza \"ERROR_TEXT_INCOMPATIBLE_WITH_REQUEST\".",
-    "icon": "icons/rewrite",
-    "open_in_window": false
-  },
-  "Amigável": {
-    "prefix": "Torne isto mais amigável:\n\n",
-    "instruction": "Você é um assistente de escrita. Reescreva o texto fornecido pelo usuário para que fique mais amigável. Produza APENAS o texto amigável sem comentários adicionais. Responda no mesmo idioma do texto de entrada (ex.: Inglês dos EUA, Francês). Não responda ou comente o conteúdo do texto fornecido pelo usuário. Se o texto for absolutamente incompatível com a tarefa de reescrita (ex.: completo nonsense aleatório), produza \"ERROR_TEXT_INCOMPATIBLE_WITH_REQUEST\".",
-    "icon": "icons/smiley-face",
-    "open_in_window": false
-  },
-  "Profissional": {
-    "prefix": "Torne isto mais profissional:\n\n",
-    "instruction": "Você é um assistente de escrita. Reescreva o texto fornecido pelo usuário para que fique mais profissional. Produza APENAS o texto profissional sem comentários adicionais. Responda no mesmo idioma do texto de entrada (ex.: Inglês dos EUA, Francês). Não responda ou comente o conteúdo do texto fornecido pelo usuário. Se o texto for absolutamente incompatível com a tarefa de reescrita (ex.: completo nonsense aleatório), produza \"ERROR_TEXT_INCOMPATIBLE_WITH_REQUEST\".",
-    "icon": "icons/briefcase",
-    "open_in_window": false
-  },
-  "Conciso": {
-    "prefix": "Torne isto mais conciso:\n\n",
-    "instruction": "Você é um assistente de escrita. Reescreva o texto fornecido pelo usuário para que fique mais conciso. Produza APENAS o texto conciso sem comentários adicionais. Responda no mesmo idioma do texto de entrada (ex.: Inglês dos EUA, Francês). Não responda ou comente o conteúdo do texto fornecido pelo usuário. Se o texto for absolutamente incompatível com a tarefa de reescrita (ex.: completo nonsense aleatório), produza \"ERROR_TEXT_INCOMPATIBLE_WITH_REQUEST\".",
-    "icon": "icons/concise",
-    "open_in_window": false
-  },
-  "Resumo": {
-    "prefix": "Resuma isto:\n\n",
-    "instruction": "Você é um assistente de resumo. Forneça um resumo sucinto do texto fornecido pelo usuário. O resumo deve ser breve, mas englobar todos os pontos-chave e insights. Para tornar o texto legível, utilize formatação Markdown (negrito, itálico, blocos de código, etc.) conforme apropriado. Você também pode adicionar um pequeno espaçamento entre os parágrafos, conforme necessário. E somente se apropriado, pode utilizar títulos (apenas os mais pequenos), listas, tabelas, etc. Não seja repetitivo ou excessivamente prolixo. Produza APENAS o resumo sem comentários adicionais. Responda no mesmo idioma do texto de entrada (ex.: Inglês dos EUA, Francês). Não responda ou comente o conteúdo do texto fornecido pelo usuário. Se o texto for absolutamente incompatível com a tarefa de sumarização (ex.: completo nonsense aleatório), produza \"ERROR_TEXT_INCOMPATIBLE_WITH_REQUEST\".",
-    "icon": "icons/summary",
-    "open_in_window": true
-  },
-  "Pontos-chave": {
-    "prefix": "Extraia os pontos-chave disto:\n\n",
-    "instruction": "Você é um assistente que extrai os pontos-chave do texto fornecido pelo usuário. Produza APENAS os pontos-chave sem comentários adicionais. Utilize formatação Markdown (listas, negrito, itálico, blocos de código, etc.) conforme apropriado para tornar o texto legível. Não seja repetitivo ou excessivamente prolixo. Responda no mesmo idioma do texto de entrada (ex.: Inglês dos EUA, Francês). Não responda ou comente o conteúdo do texto fornecido pelo usuário. Se o texto for absolutamente incompatível com a tarefa de extração de pontos-chave (ex.: completo nonsense aleatório), produza \"ERROR_TEXT_INCOMPATIBLE_WITH_REQUEST\".",
-    "icon": "icons/keypoints",
-    "open_in_window": true
-  },
-  "Tabela": {
-    "prefix": "Converta isto em uma tabela:\n\n",
-    "instruction": "Você é um assistente que converte o texto fornecido pelo usuário em uma tabela Markdown. Produza APENAS a tabela sem comentários adicionais. Responda no mesmo idioma do texto de entrada (ex.: Inglês dos EUA, Francês). Não responda ou comente o conteúdo do texto fornecido pelo usuário. Se o texto for completamente incompatível com essa conversão, produza \"ERROR_TEXT_INCOMPATIBLE_WITH_REQUEST\".",
-    "icon": "icons/table",
-    "open_in_window": true
-  }
-}"""
-
-class ButtonEditDialog(QDialog):
-    """
-    Diálogo para editar ou criar as propriedades de um botão
-    (nome/título, instrução do sistema, exibir em janela, etc.).
-    """
-    def __init__(self, parent=None, button_data=None, title="Editar Botão"):
-        super().__init__(parent)
-        self.button_data = button_data if button_data else {
-            "prefix": "Faça esta alteração no seguinte texto:\n\n",
-            "instruction": "",
-            "icon": "icons/magnifying-glass",
-            "open_in_window": False
-        }
-        self.setWindowTitle(title)
-        self.init_ui()
-        
-    def init_ui(self):
-        layout = QVBoxLayout(self)
-        
-        # Nome do Botão
-        name_label = QLabel("Nome do Botão:")
-        name_label.setStyleSheet(f"color: {'#fff' if colorMode == 'dark' else '#333'}; font-weight: bold;")
-        self.name_input = QLineEdit()
-        self.name_input.setStyleSheet(f"""
-            QLineEdit {{
-                padding: 8px;
-                border: 1px solid {'#777' if colorMode == 'dark' else '#ccc'};
-                border-radius: 8px;
-                background-color: {'#333' if colorMode == 'dark' else 'white'};
-                color: {'#fff' if colorMode == 'dark' else '#000'};
-            }}
-        """)
-        if "name" in self.button_data:
-            self.name_input.setText(self.button_data["name"])
-        layout.addWidget(name_label)
-        layout.addWidget(self.name_input)
-        
-        # Instrução (alterada para um QPlainTextEdit multilinha)
-        instruction_label = QLabel("O que sua IA deve fazer com o texto selecionado? (Instrução do Sistema)")
-        instruction_label.setStyleSheet(f"color: {'#fff' if colorMode == 'dark' else '#333'}; font-weight: bold;")
-        self.instruction_input = QPlainTextEdit()
-        self.instruction_input.setStyleSheet(f"""
-            QPlainTextEdit {{
-                padding: 8px;
-                border: 1px solid {'#777' if colorMode == 'dark' else '#ccc'};
-                border-radius: 8px;
-                background-color: {'#333' if colorMode == 'dark' else 'white'};
-                color: {'#fff' if colorMode == 'dark' else '#000'};
-            }}
-        """)
-        self.instruction_input.setPlainText(self.button_data.get("instruction", ""))
-        self.instruction_input.setMinimumHeight(100)
-        self.instruction_input.setPlaceholderText("""Exemplos:
-    - Corrija / melhore / explique este código.
-    - Torne-o engraçado.
-    - Adicione emojis!
-    - Tire sarro disso!
-    - Traduza para o inglês.
-    - Coloque o texto em formato de título.
-    - Se estiver todo em maiúsculas, coloque tudo em minúsculas, e vice-versa.
-    - Escreva uma resposta para isto.
-    - Analise possíveis vieses neste artigo de notícias.""")
-        layout.addWidget(instruction_label)
-        layout.addWidget(self.instruction_input)
-        
-        # open_in_window
-        display_label = QLabel("Como a resposta da sua IA deve ser exibida?")
-        display_label.setStyleSheet(f"color: {'#fff' if colorMode == 'dark' else '#333'}; font-weight: bold;")
-        layout.addWidget(display_label)
-        
-        radio_layout = QHBoxLayout()
-        self.replace_radio = QRadioButton("Substituir o texto selecionado")
-        self.window_radio = QRadioButton("Em uma janela pop-up (com suporte para acompanhamento)")
-        for r in (self.replace_radio, self.window_radio):
-            r.setStyleSheet(f"color: {'#fff' if colorMode == 'dark' else '#333'};")
-        
-        self.replace_radio.setChecked(not self.button_data.get("open_in_window", False))
-        self.window_radio.setChecked(self.button_data.get("open_in_window", False))
-        
-        radio_layout.addWidget(self.replace_radio)
-        radio_layout.addWidget(self.window_radio)
-        layout.addLayout(radio_layout)
-        
-        # Botões OK & Cancelar
-        btn_layout = QHBoxLayout()
-        ok_button = QPushButton("OK")
-        cancel_button = QPushButton("Cancelar")
-        for btn in (ok_button, cancel_button):
-            btn.setStyleSheet(f"""
-                QPushButton {{
-                    background-color: {'#444' if colorMode == 'dark' else '#f0f0f0'};
-                    color: {'#fff' if colorMode == 'dark' else '#000'};
-                    border: 1px solid {'#666' if colorMode == 'dark' else '#ccc'};
-                    border-radius: 5px;
-                    padding: 8px;
-                    min-width: 100px;
-                }}
-                QPushButton:hover {{
-                    background-color: {'#555' if colorMode == 'dark' else '#e0e0e0'};
-                }}
-            """)
-        btn_layout.addWidget(ok_button)
-        btn_layout.addWidget(cancel_button)
-        layout.addLayout(btn_layout)
-        
-        ok_button.clicked.connect(self.accept)
-        cancel_button.clicked.connect(self.reject)
-        
-        self.setStyleSheet(f"""
-            QDialog {{
-                background-color: {'#222' if colorMode == 'dark' else '#f5f5f5'};
-                border-radius: 10px;
-            }}
-        """)
-
-    def get_button_data(self):
-        return {
-            "name": self.name_input.text(),
-            "prefix": "Faça esta alteração no seguinte texto:\n\n",
-            "instruction": self.instruction_input.toPlainText(),
-            "icon": "icons/custom",
-            "open_in_window": self.window_radio.isChecked()
-        }
+OPTIONS_PATH = os.path.join(APP_DIR, 'options.json')
+
+# Estilos fixos da janela, calculados uma única vez a partir do tema
+# No modo de edição os botões não têm destaque ao passar o mouse
+DRAGGABLE_BUTTON_EDIT_STYLE = f"""
+    QPushButton {{
+        background-color: {"#444" if colorMode=="dark" else "white"};
+        border: 1px solid {"#666" if colorMode=="dark" else "#ccc"};
+        border-radius: 8px;
+        padding: 10px;
+        font-size: 14px;
+        text-align: left;
+        color: {"#fff" if colorMode=="dark" else "#000"};
+    }}
+"""
+
+DRAGGABLE_BUTTON_STYLE = DRAGGABLE_BUTTON_EDIT_STYLE + f"""
+    QPushButton:hover {{
+        background-color: {"#555" if colorMode=="dark" else "#f0f0f0"};
+    }}
+"""
+
+DRAG_TARGET_STYLE = DRAGGABLE_BUTTON_EDIT_STYLE + """
+    QPushButton {
+        border: 2px dashed #666;
+    }
+"""
+
+EDIT_BUTTON_STYLE = f"""
+    QPushButton {{
+        background-color: transparent;
+        border: none;
+        border-radius: 6px;
+        padding: 0px;
+        margin-top: 3px;
+    }}
+    QPushButton:hover {{
+        background-color: {'#333' if colorMode=='dark' else '#ebebeb'};
+    }}
+"""
+
+DRAG_LABEL_STYLE = f"""
+    color: {'#fff' if colorMode=='dark' else '#333'};
+    font-size: 14px;
+    font-weight: bold;
+"""
+
+ICON_BUTTON_STYLE = f"""
+    QPushButton {{
+        background-color: transparent;
+        border: none;
+        border-radius: 6px;
+        padding: 0px;
+    }}
+    QPushButton:hover {{
+        background-color: {'#333' if colorMode=='dark' else '#ebebeb'};
+    }}
+"""
+
+CLOSE_BUTTON_STYLE = f"""
+    QPushButton {{
+        background-color: transparent;
+        color: {'#fff' if colorMode=='dark' else '#333'};
+        font-size: 20px;
+        font-weight: bold;
+        border: none;
+        border-radius: 6px;
+        padding: 0px;
+    }}
+    QPushButton:hover {{
+        background-color: {'#333' if colorMode=='dark' else '#ebebeb'};
+    }}
+"""
+
+INPUT_STYLE = f"""
+    QLineEdit {{
+        padding: 8px;
+        border: 1px solid {'#777' if colorMode=='dark' else '#ccc'};
+        border-radius: 8px;
+        background-color: {'#333' if colorMode=='dark' else 'white'};
+        color: {'#fff' if colorMode=='dark' else '#000'};
+    }}
+"""
+
+SEND_BUTTON_STYLE = f"""
+    QPushButton {{
+        background-color: {'#2e7d32' if colorMode=='dark' else '#4CAF50'};
+        border: none;
+        border-radius: 8px;
+        padding: 5px;
+    }}
+    QPushButton:hover {{
+        background-color: {'#1b5e20' if colorMode=='dark' else '#45a049'};
+    }}
+"""
+
+ADD_BUTTON_STYLE = f"""
+    QPushButton {{
+        background-color: {'#333' if colorMode=='dark' else '#e0e0e0'};
+        border: 1px solid {'#666' if colorMode=='dark' else '#ccc'};
+        border-radius: 8px;
+        padding: 10px;
+        font-size: 14px;
+        text-align: center;
+        color: {'#fff' if colorMode=='dark' else '#000'};
+        margin-top: 10px;
+    }}
+    QPushButton:hover {{
+        background-color: {'#444' if colorMode=='dark' else '#d0d0d0'};
+    }}
+"""
+
+CIRCLE_BUTTON_STYLE = f"""
+    QPushButton {{
+        background-color: {'#666' if colorMode=='dark' else '#999'};
+        border-radius: 10px;
+        min-width: 16px;
+        min-height: 16px;
+        max-width: 16px;
+        max-height: 16px;
+        padding: 1px;
+        margin: 0px;
+    }}
+    QPushButton:hover {{
+        background-color: {'#888' if colorMode=='dark' else '#bbb'};
+    }}
+"""
+
+# Último options.json lido: (st_mtime_ns, dados); evita reler e reinterpretar o arquivo a cada abertura
+_options_cache = None
 
 class DraggableButton(QtWidgets.QPushButton):
+    # Todos os botões usam a mesma fonte; as métricas são calculadas uma vez e compartilhadas
+    cached_font_metrics = None
+
+    @classmethod
+    def font_metrics(cls, font):
+        if cls.cached_font_metrics is None or cls.cached_font_metrics[0] != font:
+            cls.cached_font_metrics = (QtGui.QFont(font), QtGui.QFontMetrics(font))
+        return cls.cached_font_metrics[1]
+
     def __init__(self, parent_popup, key, text):
         super().__init__(text, parent_popup)
         self.popup = parent_popup
@@ -209,54 +171,28 @@ class DraggableButton(QtWidgets.QPushButton):
         self.drag_start_position = None
         self.setAcceptDrops(True)
         self.icon_container = None
+        # Imagem do botão exibida durante o arraste; renderizada no primeiro arraste e reaproveitada
+        self.drag_pixmap = None
+        # Posição do botão em popup.button_widgets, atualizada em rebuild_grid_layout
+        self.grid_index = None
 
         # Habilita o rastreamento do mouse e eventos de hover, e fundo estilizado
         self.setMouseTracking(True)
         self.setAttribute(QtCore.Qt.WA_Hover, True)
         self.setAttribute(QtCore.Qt.WA_StyledBackground, True)
 
-        # Define a propriedade dinâmica "hover" (padrão False)
-        self.setProperty("hover", False)
-
         # Calcula a largura com base no texto, mantendo a altura fixa
         self.setFixedHeight(40)
-        font_metrics = QtGui.QFontMetrics(self.font())
+        font_metrics = DraggableButton.font_metrics(self.font())
         text_width = font_metrics.horizontalAdvance(text)
         # Adiciona margem para o texto + ícone + padding
         self.setMinimumWidth(max(text_width + 40, 120))
 
-        # Define o estilo base utilizando a propriedade dinâmica em vez da pseudo-classe :hover
-        self.base_style = f"""
-            QPushButton {{
-                background-color: {"#444" if colorMode=="dark" else "white"};
-                border: 1px solid {"#666" if colorMode=="dark" else "#ccc"};
-                border-radius: 8px;
-                padding: 10px;
-                font-size: 14px;
-                text-align: left;
-                color: {"#fff" if colorMode=="dark" else "#000"};
-            }}
-            QPushButton[hover="true"] {{
-                background-color: {"#555" if colorMode=="dark" else "#f0f0f0"};
-            }}
-        """
+        # O destaque ao passar o mouse vem da pseudo-classe :hover, resolvida pelo próprio Qt
+        self.base_style = DRAGGABLE_BUTTON_EDIT_STYLE if parent_popup.edit_mode else DRAGGABLE_BUTTON_STYLE
         self.setStyleSheet(self.base_style)
         logging.debug("DraggableButton initialized")
 
-    def enterEvent(self, event):
-        if not self.popup.edit_mode:
-            self.setProperty("hover", True)
-            self.style().unpolish(self)
-            self.style().polish(self)
-        super().enterEvent(event)
-
-    def leaveEvent(self, event):
-        if not self.popup.edit_mode:
-            self.setProperty("hover", False)
-            self.style().unpolish(self)
-            self.style().polish(self)
-        super().leaveEvent(event)
-
     def mousePressEvent(self, event):
         if event.button() == QtCore.Qt.LeftButton:
             if self.popup.edit_mode:
@@ -276,26 +212,25 @@ class DraggableButton(QtWidgets.QPushButton):
         if self.popup.edit_mode:
             drag = QtGui.QDrag(self)
             mime_data = QtCore.QMimeData()
-            idx = self.popup.button_widgets.index(self)
-            mime_data.setData("application/x-button-index", str(idx).encode())
+            # O formato serve apenas de marcador; o botão de origem fica guardado na própria janela
+            mime_data.setData("application/x-button-index", QtCore.QByteArray())
             drag.setMimeData(mime_data)
+            self.popup.drag_source = self
 
-            pixmap = self.grab()
-            drag.setPixmap(pixmap)
+            if self.drag_pixmap is None:
+                self.drag_pixmap = self.grab()
+            drag.setPixmap(self.drag_pixmap)
             drag.setHotSpot(event.pos())
 
             self.drag_start_position = None
             drop_action = drag.exec_(QtCore.Qt.MoveAction)
+            self.popup.drag_source = None
             logging.debug(f"Drag completed with action: {drop_action}")
 
     def dragEnterEvent(self, event):
         if self.popup.edit_mode and event.mimeData().hasFormat("application/x-button-index"):
             event.acceptProposedAction()
-            self.setStyleSheet(self.base_style + """
-                QPushButton {
-                    border: 2px dashed #666;
-                }
-            """)
+            self.setStyleSheet(DRAG_TARGET_STYLE)
         else:
             event.ignore()
 
@@ -308,8 +243,13 @@ class DraggableButton(QtWidgets.QPushButton):
             event.ignore()
             return
 
-        source_idx = int(event.mimeData().data("application/x-button-index").data().decode())
-        target_idx = self.popup.button_widgets.index(self)
+        source = self.popup.drag_source
+        if source is None:
+            event.ignore()
+            return
+
+        source_idx = source.grid_index
+        target_idx = self.grid_index
 
         if source_idx != target_idx:
             bw = self.popup.button_widgets
@@ -321,12 +261,44 @@ class DraggableButton(QtWidgets.QPushButton):
         event.setDropAction(QtCore.Qt.MoveAction)
         event.acceptProposedAction()
 
+    def setText(self, text):
+        self.drag_pixmap = None
+        super().setText(text)
+
+    def setIcon(self, icon):
+        self.drag_pixmap = None
+        super().setIcon(icon)
+
     def resizeEvent(self, event):
         super().resizeEvent(event)
+        self.drag_pixmap = None
         if self.icon_container:
             self.icon_container.setGeometry(0, 0, self.width(), self.height())
 
+class OptionsLoaderSignals(QtCore.QObject):
+    loaded = QtCore.Signal(dict)
+
+class OptionsLoader(QtCore.QRunnable):
+    """
+    Lê o options.json em uma thread do pool, para que a janela seja exibida sem esperar pelo disco.
+    """
+    def __init__(self):
+        super().__init__()
+        self.signals = OptionsLoaderSignals()
+
+    def run(self):
+        try:
+            data = CustomPopupWindow.load_options()
+        except Exception as e:
+            logging.error(f"Erro ao carregar o options.json: {e}")
+            data = {}
+        self.signals.loaded.emit(data)
+
 class CustomPopupWindow(QtWidgets.QWidget):
+    # Valores consultados a cada evento; resolvidos uma única vez na definição da classe
+    _WINDOW_DEACTIVATE = QtCore.QEvent.WindowDeactivate
+    _KEY_ESC = Qt.Key_Escape
+
     def __init__(self, app, selected_text):
         super().__init__()
         self.app = app
@@ -342,6 +314,21 @@ class CustomPopupWindow(QtWidgets.QWidget):
         self.input_area = None
         
         self.button_widgets = []
+        self.drag_source = None
+        self.options_loader = None
+        self._grid_dirty = False
+        # Ordem dos botões como está no options.json, para não regravar o arquivo quando nada mudou
+        self._last_order = ()
+        # Caixas de mensagem criadas sob demanda e reaproveitadas entre cliques
+        self._info_box = None
+        self._confirm_box = None
+        # Última instrução enviada nesta invocação; evita despachar duas vezes o mesmo pedido (ex.: Enter duplo)
+        self._last_custom = None
+
+        # Um único mapeador encaminha o clique de qualquer botão para on_generic_instruction com a sua chave;
+        # mapeador e janela vivem na thread da GUI, então a conexão direta dispensa a fila de eventos
+        self.button_mapper = QtCore.QSignalMapper(self)
+        self.button_mapper.mappedString.connect(self.on_generic_instruction, Qt.DirectConnection)
 
         logging.debug('Initializing CustomPopupWindow')
         self.init_ui()
@@ -374,57 +361,25 @@ class CustomPopupWindow(QtWidgets.QWidget):
 
         # Botão "Editar"/"Concluir" (à esquerda), do mesmo tamanho que o botão de fechar
         self.edit_button = QPushButton()
-        pencil_icon = os.path.join(os.path.dirname(sys.argv[0]),
-                                'icons',
-                                'pencil' + ('_dark' if colorMode=='dark' else '_light') + '.png')
-        if os.path.exists(pencil_icon):
-            self.edit_button.setIcon(QtGui.QIcon(pencil_icon))
+        set_themed_icon(self.edit_button, 'icons/pencil')
         self.edit_button.setFixedSize(24, 24)
-        self.edit_button.setStyleSheet(f"""
-            QPushButton {{
-                background-color: transparent;
-                border: none;
-                border-radius: 6px;
-                padding: 0px;
-                margin-top: 3px;
-            }}
-            QPushButton:hover {{
-                background-color: {'#333' if colorMode=='dark' else '#ebebeb'};
-            }}
-        """)
+        self.edit_button.setStyleSheet(EDIT_BUTTON_STYLE)
         self.edit_button.clicked.connect(self.toggle_edit_mode)
         top_bar.addWidget(self.edit_button, 0, Qt.AlignLeft)
 
         # Rótulo "Arraste para reorganizar" (em negrito)
         self.drag_label = QLabel("Arraste para reorganizar")
-        self.drag_label.setStyleSheet(f"""
-            color: {'#fff' if colorMode=='dark' else '#333'};
-            font-size: 14px;
-            font-weight: bold;
-        """)
+        self.drag_label.setStyleSheet(DRAG_LABEL_STYLE)
         self.drag_label.setAlignment(Qt.AlignCenter)
         self.drag_label.hide()
         top_bar.addWidget(self.drag_label, 1, Qt.AlignVCenter | Qt.AlignHCenter)
 
         # Botão "Reset" (somente no modo de edição) - também 24x24
         self.reset_button = QPushButton()
-        reset_icon_path = os.path.join(os.path.dirname(sys.argv[0]), 'icons',
-                                    'restore' + ('_dark' if colorMode=='dark' else '_light') + '.png')
-        if os.path.exists(reset_icon_path):
-            self.reset_button.setIcon(QtGui.QIcon(reset_icon_path))
+        set_themed_icon(self.reset_button, 'icons/restore')
         self.reset_button.setText("")
         self.reset_button.setFixedSize(24, 24)
-        self.reset_button.setStyleSheet(f"""
-            QPushButton {{
-                background-color: transparent;
-                border: none;
-                border-radius: 6px;
-                padding: 0px;
-            }}
-            QPushButton:hover {{
-                background-color: {'#333' if colorMode=='dark' else '#ebebeb'};
-            }}
-        """)
+        self.reset_button.setStyleSheet(ICON_BUTTON_STYLE)
         self.reset_button.clicked.connect(self.on_reset_clicked)
         self.reset_button.hide()
         top_bar.addWidget(self.reset_button, 0, Qt.AlignRight)
@@ -432,20 +387,7 @@ class CustomPopupWindow(QtWidgets.QWidget):
         # Botão de fechar:
         self.close_button = QPushButton("×")
         self.close_button.setFixedSize(24, 24)
-        self.close_button.setStyleSheet(f"""
-            QPushButton {{
-                background-color: transparent;
-                color: {'#fff' if colorMode=='dark' else '#333'};
-                font-size: 20px;
-                font-weight: bold;
-                border: none;
-                border-radius: 6px;
-                padding: 0px;
-            }}
-            QPushButton:hover {{
-                background-color: {'#333' if colorMode=='dark' else '#ebebeb'};
-            }}
-        """)
+        self.close_button.setStyleSheet(CLOSE_BUTTON_STYLE)
         self.close_button.clicked.connect(self.close)
         top_bar.addWidget(self.close_button, 0, Qt.AlignRight)
         content_layout.addLayout(top_bar)
@@ -457,45 +399,36 @@ class CustomPopupWindow(QtWidgets.QWidget):
         
         self.custom_input = QLineEdit()
         self.custom_input.setPlaceholderText(_("Descreva sua alteração...") if self.has_text else _("Pergunte à sua IA..."))
-        self.custom_input.setStyleSheet(f"""
-            QLineEdit {{
-                padding: 8px;
-                border: 1px solid {'#777' if colorMode=='dark' else '#ccc'};
-                border-radius: 8px;
-                background-color: {'#333' if colorMode=='dark' else 'white'};
-                color: {'#fff' if colorMode=='dark' else '#000'};
-            }}
-        """)
+        self.custom_input.setStyleSheet(INPUT_STYLE)
         self.custom_input.returnPressed.connect(self.on_custom_change)
         input_layout.addWidget(self.custom_input)
         
         send_btn = QPushButton()
-        send_icon = os.path.join(os.path.dirname(sys.argv[0]),
-                                'icons',
-                                'send' + ('_dark' if colorMode=='dark' else '_light') + '.png')
-        if os.path.exists(send_icon):
-            send_btn.setIcon(QtGui.QIcon(send_icon))
-        send_btn.setStyleSheet(f"""
-            QPushButton {{
-                background-color: {'#2e7d32' if colorMode=='dark' else '#4CAF50'};
-                border: none;
-                border-radius: 8px;
-                padding: 5px;
-            }}
-            QPushButton:hover {{
-                background-color: {'#1b5e20' if colorMode=='dark' else '#45a049'};
-            }}
-        """)
+        set_themed_icon(send_btn, 'icons/send')
+        send_btn.setStyleSheet(SEND_BUTTON_STYLE)
         send_btn.setFixedSize(self.custom_input.sizeHint().height(),
                             self.custom_input.sizeHint().height())
         send_btn.clicked.connect(self.on_custom_change)
         input_layout.addWidget(send_btn)
         
         content_layout.addWidget(self.input_area)
+
+        # Grade de botões e botão "Adicionar Novo": criados uma vez e reaproveitados a cada reorganização
+        self.grid = QtWidgets.QGridLayout()
+        self.grid.setSpacing(10)
+        self.grid.setColumnMinimumWidth(0, 120)
+        self.grid.setColumnMinimumWidth(1, 120)
+        content_layout.addLayout(self.grid)
+
+        self.add_button = QPushButton("+ Adicionar Novo")
+        self.add_button.setStyleSheet(ADD_BUTTON_STYLE)
+        self.add_button.clicked.connect(self.add_new_button_clicked)
+        self.add_button.hide()
+        content_layout.addWidget(self.add_button)
         
         if self.has_text:
-            self.build_buttons_list()
-            self.rebuild_grid_layout(content_layout)
+            # Os botões são criados quando o options.json terminar de ser lido
+            self.request_options()
         else:
             self.edit_button.hide()
             self.custom_input.setMinimumWidth(300)
@@ -510,100 +443,144 @@ class CustomPopupWindow(QtWidgets.QWidget):
         
         logging.debug('CustomPopupWindow UI setup complete')
         self.installEventFilter(self)
-        QtCore.QTimer.singleShot(250, lambda: self.custom_input.setFocus())
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        # Foca a entrada assim que o Qt terminar de ativar a janela
+        QtCore.QTimer.singleShot(0, self.custom_input.setFocus)
+
+    def reset(self, selected_text):
+        """
+        Prepara a janela existente para uma nova invocação, sem reconstruir a árvore de widgets.
+        """
+        self.selected_text = selected_text
+        self.custom_input.clear()
+        self._last_custom = None
+
+        has_text = bool(selected_text.strip())
+        if has_text == self.has_text:
+            return
+        self.has_text = has_text
+        self.custom_input.setPlaceholderText(_("Descreva sua alteração...") if has_text else _("Pergunte à sua IA..."))
+
+        if has_text:
+            # Os botões só são criados na primeira vez em que há texto selecionado
+            if not self.button_widgets:
+                self.request_options()
+            self.edit_button.show()
+            self.custom_input.setMinimumWidth(0)
+        else:
+            self.edit_button.hide()
+            self.custom_input.setMinimumWidth(300)
+
+        for btn in self.button_widgets:
+            btn.setVisible(has_text)
+
+    def request_options(self):
+        """
+        Inicia a leitura do options.json no pool de threads; os botões são montados em on_options_loaded.
+        """
+        if self.options_loader is not None:
+            return
+        self.options_loader = OptionsLoader()
+        self.options_loader.signals.loaded.connect(self.on_options_loaded)
+        QtCore.QThreadPool.globalInstance().start(self.options_loader)
+
+    def on_options_loaded(self, data):
+        self.options_loader = None
+        if self.button_widgets:
+            return
+        self.build_buttons_list(data)
+        self.rebuild_grid_layout()
+        for btn in self.button_widgets:
+            btn.setVisible(self.has_text)
+        self.adjustSize()
+        # A janela foi posicionada ainda sem os botões; com o novo tamanho, é mantida dentro da tela
+        self.app.position_popup()
 
     @staticmethod
     def load_options():
-        options_path = os.path.join(os.path.dirname(sys.argv[0]), 'options.json')
-        if os.path.exists(options_path):
-            with open(options_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                logging.debug('Opções carregadas com sucesso')
-        else:
+        global _options_cache
+        try:
+            mtime = os.stat(OPTIONS_PATH).st_mtime_ns
+        except FileNotFoundError:
             logging.debug('Arquivo de opções não encontrado')
-            data = {}
-        return data
+            return {}
+
+        if _options_cache is None or _options_cache[0] != mtime:
+            with open(OPTIONS_PATH, 'rb') as f:
+                raw = f.read()
+            _options_cache = (mtime, orjson.loads(raw) if orjson is not None else json.loads(raw))
+            logging.debug('Opções carregadas com sucesso')
+        # Cópia rasa: quem chama pode adicionar ou remover botões antes de salvar
+        return dict(_options_cache[1])
 
     @staticmethod
     def save_options(options):
-        options_path = os.path.join(os.path.dirname(sys.argv[0]), 'options.json')
-        with open(options_path, 'w', encoding='utf-8') as f:
-            json.dump(options, f, indent=2, ensure_ascii=False)
+        global _options_cache
+        # Escreve em um arquivo temporário e o substitui de uma vez, para nunca deixar um options.json pela metade
+        tmp_path = OPTIONS_PATH + '.tmp'
+        if orjson is not None:
+            with open(tmp_path, 'wb') as f:
+                f.write(orjson.dumps(options, option=orjson.OPT_INDENT_2))
+                f.flush()
+                os.fsync(f.fileno())
+        else:
+            # Sem orjson, o json padrão grava direto no arquivo, sem montar a string inteira antes
+            with open(tmp_path, 'w', encoding='utf-8', buffering=65536) as f:
+                json.dump(options, f, indent=2, ensure_ascii=False)
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp_path, OPTIONS_PATH)
+        # O que acabou de ser gravado já é o conteúdo do arquivo; a próxima leitura não precisa reabri-lo
+        _options_cache = (os.stat(OPTIONS_PATH).st_mtime_ns, dict(options))
+        return options
             
-    def build_buttons_list(self):
+    def build_buttons_list(self, data=None):
         """
-        Lê o options.json, cria um DraggableButton para cada botão (exceto "Custom"),
+        Lê o options.json (ou usa os dados já lidos), cria um DraggableButton para cada botão (exceto "Custom"),
         armazenando-os em self.button_widgets na mesma ordem do arquivo JSON.
         """
+        # A grade contém apenas os botões de opção, então pode ser esvaziada de uma vez
+        UIUtils.clear_layout(self.grid)
         self.button_widgets.clear()
-        data = self.load_options()
+        if data is None:
+            data = self.load_options()
 
         for k, v in data.items():
             if k == "Custom":
                 continue
             b = DraggableButton(self, k, k)
-            icon_path = os.path.join(os.path.dirname(sys.argv[0]),
-                                    v["icon"] + ('_dark' if colorMode=='dark' else '_light') + '.png')
-            if os.path.exists(icon_path):
-                b.setIcon(QtGui.QIcon(icon_path))
-                
+            set_themed_icon(b, v["icon"])
+
+            self.button_mapper.setMapping(b, k)
             if not self.edit_mode:
-                b.clicked.connect(partial(self.on_generic_instruction, k))
+                b.clicked.connect(self.button_mapper.map)
             self.button_widgets.append(b)
+        self._last_order = tuple(b.key for b in self.button_widgets)
 
-    def rebuild_grid_layout(self, parent_layout=None):
-        """Reconstrói o layout em grade com tamanho consistente e posicionamento correto do botão 'Adicionar Novo'."""
-        if not parent_layout:
-            parent_layout = self.background.layout()
-
-        for i in reversed(range(parent_layout.count())):
-            item = parent_layout.itemAt(i)
-            if isinstance(item, QtWidgets.QGridLayout):
-                grid = item
-                for j in reversed(range(grid.count())):
-                    w = grid.itemAt(j).widget()
-                    if w:
-                        grid.removeWidget(w)
-                parent_layout.removeItem(grid)
-            elif (item.widget() and isinstance(item.widget(), QPushButton) 
-                and item.widget().text() == "+ Add New"):
-                item.widget().deleteLater()
-
-        grid = QtWidgets.QGridLayout()
-        grid.setSpacing(10)
-        grid.setColumnMinimumWidth(0, 120)
-        grid.setColumnMinimumWidth(1, 120)
-        
-        row = 0
-        col = 0
-        for b in self.button_widgets:
-            grid.addWidget(b, row, col)
-            col += 1
-            if col > 1:
-                col = 0
-                row += 1
-        
-        parent_layout.addLayout(grid)
-        
-        if self.edit_mode and self.has_text:
-            add_btn = QPushButton("+ Adicionar Novo")
-            add_btn.setStyleSheet(f"""
-                QPushButton {{
-                    background-color: {'#333' if colorMode=='dark' else '#e0e0e0'};
-                    border: 1px solid {'#666' if colorMode=='dark' else '#ccc'};
-                    border-radius: 8px;
-                    padding: 10px;
-                    font-size: 14px;
-                    text-align: center;
-                    color: {'#fff' if colorMode=='dark' else '#000'};
-                    margin-top: 10px;
-                }}
-                QPushButton:hover {{
-                    background-color: {'#444' if colorMode=='dark' else '#d0d0d0'};
-                }}
-            """)
-            add_btn.clicked.connect(self.add_new_button_clicked)
-            parent_layout.addWidget(add_btn)
+    def _schedule_grid_rebuild(self):
+        """Agenda uma única reorganização da grade para a próxima volta do loop de eventos."""
+        if not self._grid_dirty:
+            self._grid_dirty = True
+            QtCore.QTimer.singleShot(0, self._flush_grid)
+
+    def _flush_grid(self):
+        self._grid_dirty = False
+        self.rebuild_grid_layout()
+
+    def rebuild_grid_layout(self):
+        """Reposiciona os botões na grade existente e exibe o botão 'Adicionar Novo' no modo de edição."""
+        # Com o layout desativado, o Qt recalcula a grade uma única vez ao reativá-lo
+        self.grid.setEnabled(False)
+        while self.grid.takeAt(0) is not None:
+            pass
+        for i, b in enumerate(self.button_widgets):
+            self.grid.addWidget(b, i // 2, i % 2)
+            b.grid_index = i
+        self.grid.setEnabled(True)
+
+        self.add_button.setVisible(self.edit_mode and self.has_text)
 
     def add_edit_delete_icons(self, btn):
         """Adiciona ícones de edição/exclusão como sobreposições com espaçamento adequado."""
@@ -611,49 +588,48 @@ class CustomPopupWindow(QtWidgets.QWidget):
             btn.icon_container.deleteLater()
         
         btn.icon_container = QtWidgets.QWidget(btn)
+        btn.drag_pixmap = None
         btn.icon_container.setAttribute(QtCore.Qt.WA_TransparentForMouseEvents, False)
         
         btn.icon_container.setGeometry(0, 0, btn.width(), btn.height())
         
-        circle_style = f"""
-            QPushButton {{
-                background-color: {'#666' if colorMode=='dark' else '#999'};
-                border-radius: 10px;
-                min-width: 16px;
-                min-height: 16px;
-                max-width: 16px;
-                max-height: 16px;
-                padding: 1px;
-                margin: 0px;
-            }}
-            QPushButton:hover {{
-                background-color: {'#888' if colorMode=='dark' else '#bbb'};
-            }}
-        """
-        
         edit_btn = QPushButton(btn.icon_container)
         edit_btn.setGeometry(3, 3, 16, 16)
-        pencil_icon = os.path.join(os.path.dirname(sys.argv[0]),
-                        'icons', 'pencil' + ('_dark' if colorMode=='dark' else '_light') + '.png')
-        if os.path.exists(pencil_icon):
-            edit_btn.setIcon(QtGui.QIcon(pencil_icon))
-        edit_btn.setStyleSheet(circle_style)
+        set_themed_icon(edit_btn, 'icons/pencil')
+        edit_btn.setStyleSheet(CIRCLE_BUTTON_STYLE)
         edit_btn.clicked.connect(partial(self.edit_button_clicked, btn))
         edit_btn.show()
         
         delete_btn = QPushButton(btn.icon_container)
         delete_btn.setGeometry(btn.width() - 23, 3, 16, 16)
-        del_icon = os.path.join(os.path.dirname(sys.argv[0]),
-                                'icons', 'cross' + ('_dark' if colorMode=='dark' else '_light') + '.png')
-        if os.path.exists(del_icon):
-            delete_btn.setIcon(QtGui.QIcon(del_icon))
-        delete_btn.setStyleSheet(circle_style)
+        set_themed_icon(delete_btn, 'icons/cross')
+        delete_btn.setStyleSheet(CIRCLE_BUTTON_STYLE)
         delete_btn.clicked.connect(partial(self.delete_button_clicked, btn))
         delete_btn.show()
         
         btn.icon_container.raise_()
         btn.icon_container.show()
 
+    def show_info(self, title, text):
+        """Exibe um aviso com botão OK, reaproveitando a mesma caixa de mensagem."""
+        if self._info_box is None:
+            self._info_box = QtWidgets.QMessageBox(self)
+            self._info_box.setIcon(QtWidgets.QMessageBox.Information)
+            self._info_box.setStandardButtons(QtWidgets.QMessageBox.Ok)
+        self._info_box.setWindowTitle(title)
+        self._info_box.setText(text)
+        self._info_box.exec_()
+
+    def ask_confirmation(self, title, text):
+        """Pergunta Sim/Não (padrão Não) e retorna True se o usuário confirmar."""
+        if self._confirm_box is None:
+            self._confirm_box = QtWidgets.QMessageBox(self)
+            self._confirm_box.setStandardButtons(QtWidgets.QMessageBox.Yes | QtWidgets.QMessageBox.No)
+        self._confirm_box.setDefaultButton(QtWidgets.QMessageBox.No)
+        self._confirm_box.setWindowTitle(title)
+        self._confirm_box.setText(text)
+        return self._confirm_box.exec_() == QtWidgets.QMessageBox.Yes
+
     def toggle_edit_mode(self):
         """Alterna o modo de edição com rótulos de botão e estado aprimorados."""
         self.edit_mode = not self.edit_mode
@@ -663,17 +639,7 @@ class CustomPopupWindow(QtWidgets.QWidget):
             icon_name = "check"
             self.edit_button.setText("")
             self.edit_button.setFixedSize(36, 36)
-            self.edit_button.setStyleSheet(f"""
-                QPushButton {{
-                    background-color: transparent;
-                    border: none;
-                    border-radius: 6px;
-                    padding: 0px;
-                }}
-                QPushButton:hover {{
-                    background-color: {'#333' if colorMode=='dark' else '#ebebeb'};
-                }}
-            """)
+            self.edit_button.setStyleSheet(ICON_BUTTON_STYLE)
             self.close_button.hide()
             self.reset_button.show()
             self.drag_label.show()
@@ -686,62 +652,53 @@ class CustomPopupWindow(QtWidgets.QWidget):
             self.reset_button.hide()
             self.drag_label.hide()
 
-            msg = QtWidgets.QMessageBox()
-            msg.setWindowTitle("Encerrando para aplicar as mudanças...")
-            msg.setText("O Writing Tools precisa ser reiniciado para aplicar suas mudanças e agora será encerrado.\nPor favor, reinicie o Writing Tools.exe para ver suas mudanças.")
-            msg.setStandardButtons(QtWidgets.QMessageBox.Ok)
-            msg.exec_()
+            self.show_info(
+                "Encerrando para aplicar as mudanças...",
+                "O Writing Tools precisa ser reiniciado para aplicar suas mudanças e agora será encerrado.\nPor favor, reinicie o Writing Tools.exe para ver suas mudanças."
+            )
 
-            self.app.load_options()
+            # A ordem arrastada já foi salva em update_json_from_grid; a leitura vem do cache
+            self.app.apply_options(self.load_options())
             self.close()
             QtCore.QTimer.singleShot(100, self.app.exit_app)
             return
 
-        icon_path = os.path.join(
-            os.path.dirname(sys.argv[0]),
-            'icons',
-            f"{icon_name}_{'dark' if colorMode=='dark' else 'light'}.png"
-        )
-        if os.path.exists(icon_path):
-            self.edit_button.setIcon(QtGui.QIcon(icon_path))
+        set_themed_icon(self.edit_button, f'icons/{icon_name}')
 
         self.input_area.setVisible(not self.edit_mode)
 
+        # Fora do modo de edição cada botão tem exatamente uma conexão (com o mapeador), e no modo de edição nenhuma;
+        # por isso basta desconectar esse slot, sem tentar e capturar exceções em cada botão
         for btn in self.button_widgets:
-            try:
-                btn.clicked.disconnect()
-            except:
-                pass
-
             if not self.edit_mode:
-                btn.clicked.connect(partial(self.on_generic_instruction, btn.key))
+                btn.clicked.connect(self.button_mapper.map)
                 if hasattr(btn, 'icon_container') and btn.icon_container:
                     btn.icon_container.deleteLater()
                     btn.icon_container = None
             else:
+                btn.clicked.disconnect(self.button_mapper.map)
                 self.add_edit_delete_icons(btn)
 
+            btn.base_style = DRAGGABLE_BUTTON_EDIT_STYLE if self.edit_mode else DRAGGABLE_BUTTON_STYLE
             btn.setStyleSheet(btn.base_style)
 
         self.rebuild_grid_layout()
 
     def on_reset_clicked(self):
         """
-        Redefine o arquivo `options.json` para o DEFAULT_OPTIONS_JSON e, em seguida, exibe mensagem e reinicia.
+        Redefine o arquivo `options.json` para os padrões de DEFAULT_OPTIONS e, em seguida, exibe mensagem e reinicia.
         """
-        confirm_box = QtWidgets.QMessageBox()
-        confirm_box.setWindowTitle("Confirmar Redefinição para os Padrões e Encerramento?")
-        confirm_box.setText("Para redefinir os botões para a configuração original, o Writing Tools precisará ser encerrado, então você precisará reiniciar o Writing Tools.exe.\nTem certeza de que deseja continuar?")
-        confirm_box.setStandardButtons(QtWidgets.QMessageBox.Yes | QtWidgets.QMessageBox.No)
-        confirm_box.setDefaultButton(QtWidgets.QMessageBox.No)
-        
-        if confirm_box.exec_() == QtWidgets.QMessageBox.Yes:
+        if self.ask_confirmation(
+            "Confirmar Redefinição para os Padrões e Encerramento?",
+            "Para redefinir os botões para a configuração original, o Writing Tools precisará ser encerrado, então você precisará reiniciar o Writing Tools.exe.\nTem certeza de que deseja continuar?"
+        ):
             try:
                 logging.debug('Redefinindo para as opções padrão do options.json')
-                default_data = json.loads(DEFAULT_OPTIONS_JSON)
-                self.save_options(default_data)
+                # O diálogo de edição e os padrões só são carregados quando realmente necessários
+                from ui.ButtonEditDialog import DEFAULT_OPTIONS
+                default_data = copy.deepcopy(DEFAULT_OPTIONS)
+                self.app.apply_options(self.save_options(default_data))
 
-                self.app.load_options()
                 self.close()
                 QtCore.QTimer.singleShot(100, self.app.exit_app)
             
@@ -753,6 +710,7 @@ class CustomPopupWindow(QtWidgets.QWidget):
                 error_msg.exec_()
 
     def add_new_button_clicked(self):
+        from ui.ButtonEditDialog import ButtonEditDialog
         dialog = ButtonEditDialog(self, title="Adicionar Novo Botão")
         if dialog.exec_():
             bd = dialog.get_button_data()
@@ -763,20 +721,18 @@ class CustomPopupWindow(QtWidgets.QWidget):
                 "icon": bd["icon"],
                 "open_in_window": bd["open_in_window"]
             }
-            self.save_options(data)
+            self.app.apply_options(self.save_options(data))
 
             self.build_buttons_list()
-            self.rebuild_grid_layout()
+            self._schedule_grid_rebuild()
 
             self.hide()
             
-            QtWidgets.QMessageBox.information(
-                self, 
+            self.show_info(
                 "Encerrando para aplicar o novo botão...",
                 "O Writing Tools precisa ser reiniciado para aplicar seu novo botão e agora será encerrado.\nPor favor, reinicie o Writing Tools.exe para ver seu novo botão."
             )
 
-            self.app.load_options()
             self.close()
             QtCore.QTimer.singleShot(100, self.app.exit_app)
 
@@ -784,9 +740,10 @@ class CustomPopupWindow(QtWidgets.QWidget):
         """O usuário clicou no pequeno ícone de lápis sobre um botão."""
         key = btn.key
         data = self.load_options()
-        bd = data[key]
+        bd = dict(data[key])
         bd["name"] = key
         
+        from ui.ButtonEditDialog import ButtonEditDialog
         dialog = ButtonEditDialog(self, bd)
         if dialog.exec_():
             new_data = dialog.get_button_data()
@@ -799,37 +756,32 @@ class CustomPopupWindow(QtWidgets.QWidget):
                 "icon": new_data["icon"],
                 "open_in_window": new_data["open_in_window"]
             }
-            self.save_options(data)
+            self.app.apply_options(self.save_options(data))
 
             self.build_buttons_list()
-            self.rebuild_grid_layout()
+            self._schedule_grid_rebuild()
 
             self.hide()
 
-            QtWidgets.QMessageBox.information(
-                self, 
+            self.show_info(
                 "Encerrando para aplicar as mudanças neste botão...",
                 "O Writing Tools precisa ser reiniciado para aplicar suas mudanças e agora será encerrado.\nPor favor, reinicie o Writing Tools.exe para ver suas mudanças."
             )
 
-            self.app.load_options()
             self.close()
             QtCore.QTimer.singleShot(100, self.app.exit_app)
 
     def delete_button_clicked(self, btn):
         """Trata a exclusão de um botão."""
         key = btn.key
-        confirm = QtWidgets.QMessageBox()
-        confirm.setWindowTitle("Confirmar Exclusão e Encerramento?")
-        confirm.setText(f"Para excluir o botão '{key}', o Writing Tools precisará ser encerrado, então você precisará reiniciar o Writing Tools.exe.\nTem certeza de que deseja continuar?")
-        confirm.setStandardButtons(QtWidgets.QMessageBox.Yes | QtWidgets.QMessageBox.No)
-        confirm.setDefaultButton(QtWidgets.QMessageBox.No)
-        
-        if confirm.exec_() == QtWidgets.QMessageBox.Yes:
+        if self.ask_confirmation(
+            "Confirmar Exclusão e Encerramento?",
+            f"Para excluir o botão '{key}', o Writing Tools precisará ser encerrado, então você precisará reiniciar o Writing Tools.exe.\nTem certeza de que deseja continuar?"
+        ):
             try:
                 data = self.load_options()
                 del data[key]
-                self.save_options(data)
+                self.app.apply_options(self.save_options(data))
 
                 for btn_ in self.button_widgets[:]:
                     if btn_.key == key:
@@ -837,8 +789,8 @@ class CustomPopupWindow(QtWidgets.QWidget):
                             btn_.icon_container.deleteLater()
                         btn_.deleteLater()
                         self.button_widgets.remove(btn_)
+                self._schedule_grid_rebuild()
                 
-                self.app.load_options()
                 self.close()
                 QtCore.QTimer.singleShot(100, self.app.exit_app)
                 
@@ -854,15 +806,19 @@ class CustomPopupWindow(QtWidgets.QWidget):
         Chamado após a reorganização por drag & drop. Reflete a nova ordem no options.json,
         para que a disposição personalizada do usuário seja mantida.
         """
+        order = tuple(b.key for b in self.button_widgets)
+        if order == self._last_order:
+            return
+
         data = self.load_options()
-        new_data = {"Custom": data["Custom"]} if "Custom" in data else {}
-        for b in self.button_widgets:
-            new_data[b.key] = data[b.key]
-        self.save_options(new_data)
+        keys = (("Custom",) if "Custom" in data else ()) + order
+        self.save_options({k: data[k] for k in keys})
+        self._last_order = order
 
     def on_custom_change(self):
         txt = self.custom_input.text().strip()
-        if txt:
+        if txt and txt != self._last_custom:
+            self._last_custom = txt
             self.app.process_option('Custom', self.selected_text, txt)
             self.close()
 
@@ -872,14 +828,14 @@ class CustomPopupWindow(QtWidgets.QWidget):
             self.close()
 
     def eventFilter(self, obj, event):
-        if event.type() == QtCore.QEvent.WindowDeactivate:
+        if event.type() == self._WINDOW_DEACTIVATE:
             if not self.edit_mode:
                 self.hide()
                 return True
         return super().eventFilter(obj, event)
 
     def keyPressEvent(self, event):
-        if event.key() == QtCore.Qt.Key_Escape:
+        if event.key() == self._KEY_ESC:
             self.close()
         else:
             super().keyPressEvent(event)
@@ -3,10 +3,22 @@ import logging
 from PySide6 import QtCore, QtWidgets
 from PySide6.QtWidgets import QHBoxLayout, QRadioButton
 
-from ui.UIUtils import UIUtils, colorMode
+from ui.UIUtils import BORDER, INPUT_BG, INPUT_TEXT, TEXT_COLOR, UIUtils
 
 _ = lambda x: x
 
+# Folhas de estilo da tela de boas-vindas, montadas uma única vez para o tema em uso
+TITLE_STYLE = f"font-size: 24px; font-weight: bold; color: {TEXT_COLOR};"
+TEXT_STYLE = f"font-size: 16px; color: {TEXT_COLOR};"
+RADIO_STYLE = f"color: {TEXT_COLOR};"
+SHORTCUT_INPUT_STYLE = f"""
+    font-size: 16px;
+    padding: 5px;
+    background-color: {INPUT_BG};
+    color: {INPUT_TEXT};
+    border: 1px solid {BORDER};
+"""
+
 class OnboardingWindow(QtWidgets.QWidget):
     # Sinal de fechamento
     close_signal = QtCore.Signal()
@@ -37,10 +49,9 @@ class OnboardingWindow(QtWidgets.QWidget):
         self.show_welcome_screen()
 
     def show_welcome_screen(self):
-        UIUtils.clear_layout(self.content_layout)
-
+        # Chamada uma única vez, logo após init_ui criar o layout vazio: não há nada a limpar
         title_label = QtWidgets.QLabel(_("Bem-vindo ao Writing Tools") + "!")
-        title_label.setStyleSheet(f"font-size: 24px; font-weight: bold; color: {'#ffffff' if colorMode == 'dark' else '#333333'};")
+        title_label.setStyleSheet(TITLE_STYLE)
         self.content_layout.addWidget(title_label, alignment=QtCore.Qt.AlignmentFlag.AlignCenter)
 
         features_text = f"""
@@ -56,53 +67,34 @@ class OnboardingWindow(QtWidgets.QWidget):
             - {_('QUALQUER API compatível com OpenAI — incluindo LLMs locais!')}
         """
         features_label = QtWidgets.QLabel(features_text)
-        features_label.setStyleSheet(f"font-size: 16px; color: {'#ffffff' if colorMode == 'dark' else '#333333'};")
+        features_label.setStyleSheet(TEXT_STYLE)
         features_label.setAlignment(QtCore.Qt.AlignmentFlag.AlignLeft)
         self.content_layout.addWidget(features_label)
 
         shortcut_label = QtWidgets.QLabel("Personalize sua tecla de atalho (padrão: \"ctrl+space\"):")
-        shortcut_label.setStyleSheet(f"font-size: 16px; color: {'#ffffff' if colorMode == 'dark' else '#333333'};")
+        shortcut_label.setStyleSheet(TEXT_STYLE)
         self.content_layout.addWidget(shortcut_label)
 
         self.shortcut_input = QtWidgets.QLineEdit(self.shortcut)
-        self.shortcut_input.setStyleSheet(f"""
-            font-size: 16px;
-            padding: 5px;
-            background-color: {'#444' if colorMode == 'dark' else 'white'};
-            color: {'#ffffff' if colorMode == 'dark' else '#000000'};
-            border: 1px solid {'#666' if colorMode == 'dark' else '#ccc'};
-        """)
+        self.shortcut_input.setStyleSheet(SHORTCUT_INPUT_STYLE)
         self.content_layout.addWidget(self.shortcut_input)
 
         theme_label = QtWidgets.QLabel(_("Escolha seu tema:"))
-        theme_label.setStyleSheet(f"font-size: 16px; color: {'#ffffff' if colorMode == 'dark' else '#333333'};")
+        theme_label.setStyleSheet(TEXT_STYLE)
         self.content_layout.addWidget(theme_label)
 
         theme_layout = QHBoxLayout()
         gradient_radio = QRadioButton(_("Gradiente"))
         plain_radio = QRadioButton(_("Simples"))
-        gradient_radio.setStyleSheet(f"color: {'#ffffff' if colorMode == 'dark' else '#333333'};")
-        plain_radio.setStyleSheet(f"color: {'#ffffff' if colorMode == 'dark' else '#333333'};")
+        gradient_radio.setStyleSheet(RADIO_STYLE)
+        plain_radio.setStyleSheet(RADIO_STYLE)
         gradient_radio.setChecked(self.theme == 'gradient')
         plain_radio.setChecked(self.theme == 'plain')
         theme_layout.addWidget(gradient_radio)
         theme_layout.addWidget(plain_radio)
         self.content_layout.addLayout(theme_layout)
 
-        next_button = QtWidgets.QPushButton(_('Próximo'))
-        next_button.setStyleSheet("""
-            QPushButton {
-                background-color: #4CAF50;
-                color: white;
-                padding: 10px;
-                font-size: 16px;
-                border: none;
-                border-radius: 5px;
-            }
-            QPushButton:hover {
-                background-color: #45a049;
-            }
-        """)
+        next_button = UIUtils.make_primary_button(_('Próximo'))
         next_button.clicked.connect(lambda: self.on_next_clicked(gradient_radio.isChecked()))
         self.content_layout.addWidget(next_button)
 
@@ -1,16 +1,134 @@
+import functools
 import logging
-import os
-import sys
 
 import markdown2
-from PySide6 import QtCore, QtGui, QtWidgets
+from PySide6 import QtCore, QtWidgets
 from PySide6.QtCore import Qt, Slot
 from PySide6.QtWidgets import QScrollArea
 
-from ui.UIUtils import UIUtils, colorMode
+from ui.UIUtils import UIUtils, colorMode, set_themed_icon
 
 _ = lambda x: x
 
+# Um único conversor (com a extensão de tabelas já carregada) para todas as mensagens
+_md_converter = markdown2.Markdown(extras=['tables'])
+
+
+@functools.lru_cache(maxsize=256)
+def _render_md(text):
+    """Converte Markdown em HTML, reaproveitando o resultado de textos já renderizados."""
+    return _md_converter.convert(text)
+
+
+# Moldura dos visualizadores de mensagem (o tamanho da fonte vem do zoom, via setFont)
+_MESSAGE_STYLE_TEMPLATE = f"""
+    QTextBrowser {{{{
+        background-color: {{background}};
+        color: {'#ffffff' if colorMode == 'dark' else '#000000'};
+        border: {{border}};
+        border-radius: 8px;
+        padding: 8px;
+        margin: 0px;
+    }}}}
+"""
+USER_MESSAGE_STYLE = _MESSAGE_STYLE_TEMPLATE.format(background='transparent', border='none')
+ASSISTANT_MESSAGE_STYLE = _MESSAGE_STYLE_TEMPLATE.format(
+    background='#333' if colorMode == 'dark' else 'white',
+    border='1px solid ' + ('#555' if colorMode == 'dark' else '#ccc')
+)
+
+# Estilos para tabelas, aplicados ao documento HTML de cada mensagem
+MESSAGE_DOCUMENT_STYLE = f"""
+    table {{
+        border-collapse: collapse;
+        width: 100%;
+        margin: 10px 0;
+    }}
+    th, td {{
+        border: 1px solid {'#555' if colorMode == 'dark' else '#ccc'};
+        padding: 8px;
+        text-align: left;
+    }}
+    th {{
+        background-color: {'#444' if colorMode == 'dark' else '#f5f5f5'};
+        font-weight: bold;
+    }}
+"""
+
+# Folhas de estilo da janela, montadas uma única vez para o tema em uso
+TITLE_STYLE = f"font-size: 20px; font-weight: bold; color: {'#ffffff' if colorMode == 'dark' else '#333333'};"
+HINT_STYLE = f"color: {'#aaaaaa' if colorMode == 'dark' else '#666666'}; font-size: 14px;"
+ZOOM_LABEL_STYLE = f"""
+    color: {'#aaaaaa' if colorMode == 'dark' else '#666666'};
+    font-size: 14px;
+    margin-right: 5px;
+"""
+BUTTON_STYLE = f"""
+    QPushButton {{
+        background-color: {'#444' if colorMode == 'dark' else '#f0f0f0'};
+        color: {'#ffffff' if colorMode == 'dark' else '#000000'};
+        border: 1px solid {'#666' if colorMode == 'dark' else '#ccc'};
+        border-radius: 5px;
+        padding: 8px;
+        font-size: 14px;
+    }}
+    QPushButton:hover {{
+        background-color: {'#555' if colorMode == 'dark' else '#e0e0e0'};
+    }}
+"""
+LOADING_LABEL_STYLE = f"""
+    QLabel {{
+        color: {'#ffffff' if colorMode == 'dark' else '#333333'};
+        font-size: 18px;
+        padding: 20px;
+    }}
+"""
+INPUT_STYLE = f"""
+    QLineEdit {{
+        padding: 8px;
+        border: 1px solid {'#777' if colorMode == 'dark' else '#ccc'};
+        border-radius: 8px;
+        background-color: {'#333' if colorMode == 'dark' else 'white'};
+        color: {'#ffffff' if colorMode == 'dark' else '#000000'};
+        font-size: 14px;
+    }}
+"""
+SEND_BUTTON_STYLE = f"""
+    QPushButton {{
+        background-color: {'#2e7d32' if colorMode == 'dark' else '#4CAF50'};
+        border: none;
+        border-radius: 8px;
+        padding: 5px;
+    }}
+    QPushButton:hover {{
+        background-color: {'#1b5e20' if colorMode == 'dark' else '#45a049'};
+    }}
+"""
+SCROLL_AREA_STYLE = """
+    QScrollArea {
+        background-color: transparent;
+        border: none;
+    }
+    QScrollArea > QWidget > QWidget {
+        background-color: transparent;
+    }
+    QScrollBar:vertical {
+        background-color: transparent;
+        width: 12px;
+        margin: 0px;
+    }
+    QScrollBar::handle:vertical {
+        background-color: rgba(128, 128, 128, 0.5);
+        min-height: 20px;
+        border-radius: 6px;
+        margin: 2px;
+    }
+    QScrollBar::add-line:vertical, QScrollBar::sub-line:vertical {
+        height: 0px;
+    }
+"""
+
+
 class MarkdownTextBrowser(QtWidgets.QTextBrowser):
     """Visualizador de texto aprimorado para exibir conteúdo Markdown com melhor dimensionamento"""
     
@@ -21,6 +139,11 @@ class MarkdownTextBrowser(QtWidgets.QTextBrowser):
         self.zoom_factor = 1.2
         self.base_font_size = 14
         self.is_user_message = is_user_message
+        # Última medição (largura, zoom, revisão do documento); se nada mudou, a altura atual continua válida
+        self._last_measure = None
+        # Ancestrais localizados na primeira consulta; a mensagem não muda de lugar depois de inserida
+        self._response_window = None
+        self._scroll_area = None
         
         # Remover barras de rolagem para evitar espaço extra
         self.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
@@ -32,55 +155,29 @@ class MarkdownTextBrowser(QtWidgets.QTextBrowser):
             QtWidgets.QSizePolicy.Policy.Minimum
         )
         
+        # Durante o arraste da janela, só o último redimensionamento recalcula o documento
+        self._resize_timer = QtCore.QTimer(self)
+        self._resize_timer.setSingleShot(True)
+        self._resize_timer.setInterval(50)
+        self._resize_timer.timeout.connect(self._update_size)
+        
+        self.setStyleSheet(USER_MESSAGE_STYLE if is_user_message else ASSISTANT_MESSAGE_STYLE)
+        self.document().setDefaultStyleSheet(MESSAGE_DOCUMENT_STYLE)
         self._apply_zoom()
         
     def _apply_zoom(self):
-        new_size = int(self.base_font_size * self.zoom_factor)
-        
-        # Atualiza o stylesheet com estilo para tabelas
-        self.setStyleSheet(f"""
-            QTextBrowser {{
-                background-color: {('transparent' if self.is_user_message else '#333' if colorMode == 'dark' else 'white')};
-                color: {'#ffffff' if colorMode == 'dark' else '#000000'};
-                border: {('none' if self.is_user_message else '1px solid ' + ('#555' if colorMode == 'dark' else '#ccc'))};
-                border-radius: 8px;
-                padding: 8px;
-                margin: 0px;
-                font-size: {new_size}px;
-                line-height: 1.3;
-                width: 100%;
-            }}
-
-            /* Estilos para tabelas */
-            table {{
-                border-collapse: collapse;
-                width: 100%;
-                margin: 10px 0;
-            }}
-            
-            th, td {{
-                border: 1px solid {'#555' if colorMode == 'dark' else '#ccc'};
-                padding: 8px;
-                text-align: left;
-            }}
-            
-            th {{
-                background-color: {'#444' if colorMode == 'dark' else '#f5f5f5'};
-                font-weight: bold;
-            }}
-            
-            tr:nth-child(even) {{
-                background-color: {'#3a3a3a' if colorMode == 'dark' else '#f9f9f9'};
-            }}
-            
-            tr:hover {{
-                background-color: {'#484848' if colorMode == 'dark' else '#f0f0f0'};
-            }}
-        """)
+        # Só o tamanho da fonte muda com o zoom; as folhas de estilo são aplicadas uma vez no construtor
+        font = self.font()
+        font.setPixelSize(int(self.base_font_size * self.zoom_factor))
+        self.setFont(font)
         
-    def _update_size(self):
+    def _update_size(self, notify_scroll_area=True):
         # Calcula a largura correta do documento
         available_width = self.viewport().width() - 16  # Considera o padding
+        measure = (available_width, self.zoom_factor, self.document().revision())
+        if measure == self._last_measure:
+            return
+        self._last_measure = measure
         self.document().setTextWidth(available_width)
         
         # Obtém a altura precisa do conteúdo
@@ -95,18 +192,14 @@ class MarkdownTextBrowser(QtWidgets.QTextBrowser):
             self.setMaximumHeight(new_height)  # Força a altura fixa
             
             # Atualiza a área de rolagem, se necessário
-            scroll_area = self.get_scroll_area()
+            scroll_area = self.get_scroll_area() if notify_scroll_area else None
             if scroll_area:
                 scroll_area.update_content_height()
                 
     def wheelEvent(self, event):
         if event.modifiers() == Qt.KeyboardModifier.ControlModifier:
             delta = event.angleDelta().y()
-            # Obtém a janela de resposta principal
-            parent = self.parent()
-            while parent and not isinstance(parent, ResponseWindow):
-                parent = parent.parent()
-                
+            parent = self.get_response_window()
             if parent:
                 if delta > 0:
                     parent.zoom_all_messages('in')
@@ -118,39 +211,31 @@ class MarkdownTextBrowser(QtWidgets.QTextBrowser):
             if self.parent():
                 self.parent().wheelEvent(event)
             
-    def zoom_in(self):
-        old_factor = self.zoom_factor
-        self.zoom_factor = min(3.0, self.zoom_factor * 1.1)
-        if old_factor != self.zoom_factor:
-            self._apply_zoom()
-            self._update_size()
-        
-    def zoom_out(self):
-        old_factor = self.zoom_factor
-        self.zoom_factor = max(0.5, self.zoom_factor / 1.1)
-        if old_factor != self.zoom_factor:
-            self._apply_zoom()
-            self._update_size()
-        
-    def reset_zoom(self):
-        old_factor = self.zoom_factor
-        self.zoom_factor = 1.2  # Redefine para o zoom padrão
-        if old_factor != self.zoom_factor:
-            self._apply_zoom()
-            self._update_size()
-    
-    def get_scroll_area(self):
-        """Localiza o ChatContentScrollArea pai"""
+    def _find_ancestor(self, cls):
         parent = self.parent()
-        while parent:
-            if isinstance(parent, ChatContentScrollArea):
-                return parent
+        while parent and not isinstance(parent, cls):
             parent = parent.parent()
-        return None
+        return parent
+
+    def get_response_window(self):
+        """Localiza a ResponseWindow principal"""
+        if self._response_window is None:
+            self._response_window = self._find_ancestor(ResponseWindow)
+        return self._response_window
+
+    def get_scroll_area(self):
+        """Localiza o ChatContentScrollArea pai"""
+        if self._scroll_area is None:
+            self._scroll_area = self._find_ancestor(ChatContentScrollArea)
+        return self._scroll_area
         
     def resizeEvent(self, event):
         super().resizeEvent(event)
-        self._update_size()
+        if self._last_measure is None:
+            # Primeira largura real da mensagem recém-inserida: mede na hora, antes de rolar até ela
+            self._update_size()
+        else:
+            self._resize_timer.start()
 
 
 class ChatContentScrollArea(QScrollArea):
@@ -160,6 +245,11 @@ class ChatContentScrollArea(QScrollArea):
         super().__init__(parent)
         self.content_widget = None
         self.layout = None
+        # Mensagens na ordem de inserção, para não percorrer o layout a cada zoom ou recálculo de altura
+        self.message_containers = []
+        self.text_displays = []
+        # Alturas fixadas das mensagens no último cálculo da altura total
+        self._content_height_key = None
         self.setup_ui()
         
     def setup_ui(self):
@@ -182,31 +272,12 @@ class ChatContentScrollArea(QScrollArea):
         self.layout.addStretch()
         
         # Estilização aprimorada da área de rolagem
-        self.setStyleSheet("""
-            QScrollArea {
-                background-color: transparent;
-                border: none;
-            }
-            QScrollArea > QWidget > QWidget {
-                background-color: transparent;
-            }
-            QScrollBar:vertical {
-                background-color: transparent;
-                width: 12px;
-                margin: 0px;
-            }
-            QScrollBar::handle:vertical {
-                background-color: rgba(128, 128, 128, 0.5);
-                min-height: 20px;
-                border-radius: 6px;
-                margin: 2px;
-            }
-            QScrollBar::add-line:vertical, QScrollBar::sub-line:vertical {
-                height: 0px;
-            }
-        """)
+        self.setStyleSheet(SCROLL_AREA_STYLE)
 
     def add_message(self, text, is_user=False):
+        # Suspende as repinturas enquanto a mensagem é montada; o Qt repinta uma única vez ao reativar
+        self.setUpdatesEnabled(False)
+        
         # Remove o stretch inferior
         self.layout.takeAt(self.layout.count() - 1)
         
@@ -225,24 +296,24 @@ class ChatContentScrollArea(QScrollArea):
         # Cria o display de texto com largura atualizada
         text_display = MarkdownTextBrowser(is_user_message=is_user)
         
-        # Ativa a extensão de tabelas no markdown2
-        html = markdown2.markdown(text, extras=['tables'])
-        text_display.setHtml(html)
-        
-        # Calcula o tamanho adequado do display de texto usando a largura total
-        text_display.document().setTextWidth(self.width() - 20)
-        doc_size = text_display.document().size()
-        text_display.setMinimumHeight(int(doc_size.height() + 16))
+        if is_user:
+            # Perguntas do usuário são exibidas como digitadas, sem passar pelo markdown2
+            text_display.setPlainText(text)
+        else:
+            text_display.setHtml(_render_md(text))
         
+        # A altura é calculada uma única vez em _update_size, quando o layout der a largura real ao widget
         msg_layout.addWidget(text_display)
         
         self.layout.addWidget(msg_container)
         self.layout.addStretch()
+        self.message_containers.append(msg_container)
+        self.text_displays.append(text_display)
         
-        if hasattr(self.parent(), 'current_text_display'):
-            self.parent().current_text_display = text_display
-            
-        QtCore.QTimer.singleShot(50, self.post_message_updates)
+        self.setUpdatesEnabled(True)
+        
+        # Na próxima volta do loop de eventos o layout pendente já foi aplicado e a mensagem medida
+        QtCore.QTimer.singleShot(0, self.post_message_updates)
         
         return text_display
 
@@ -254,17 +325,17 @@ class ChatContentScrollArea(QScrollArea):
 
     def update_content_height(self):
         """Recalcula a altura total do conteúdo com cálculo aprimorado de espaçamento"""
-        total_height = 0
+        # Cada mensagem tem altura fixa (definida em _update_size); se nenhuma mudou, o total também não mudou
+        key = tuple(text_display.minimumHeight() for text_display in self.text_displays)
+        if key == self._content_height_key:
+            return
+        self._content_height_key = key
         
         # Calcula a altura de todas as mensagens
-        for i in range(self.layout.count() - 1):  # Ignora o item stretch
-            item = self.layout.itemAt(i)
-            if item and item.widget():
-                widget_height = item.widget().sizeHint().height()
-                total_height += widget_height
+        total_height = sum(container.sizeHint().height() for container in self.message_containers)
         
         # Adiciona o espaçamento entre mensagens e margens
-        total_height += (self.layout.spacing() * (self.layout.count() - 2))
+        total_height += (self.layout.spacing() * (len(self.message_containers) - 1))
         total_height += self.layout.contentsMargins().top() + self.layout.contentsMargins().bottom()
         
         # Define a altura mínima com algum padding
@@ -279,23 +350,9 @@ class ChatContentScrollArea(QScrollArea):
         vsb = self.verticalScrollBar()
         vsb.setValue(vsb.maximum())
 
-    def resizeEvent(self, event):
-        """Trata eventos de redimensionamento com cálculos de largura aprimorados"""
-        super().resizeEvent(event)
-        
-        # Atualiza a largura para todos os displays de mensagem
-        available_width = self.width() - 40  # Considera as margens
-        for i in range(self.layout.count() - 1):  # Ignora o item stretch
-            item = self.layout.itemAt(i)
-            if item and item.widget():
-                container = item.widget()
-                text_display = container.layout().itemAt(0).widget()
-                if isinstance(text_display, MarkdownTextBrowser):
-                    # Recalcula a largura e altura do texto
-                    text_display.document().setTextWidth(available_width)
-                    doc_size = text_display.document().size()
-                    text_display.setMinimumHeight(int(doc_size.height() + 20))
-                    
+    # Não há resizeEvent próprio: cada MarkdownTextBrowser recalcula o seu documento em _update_size
+    # quando o layout muda a sua largura, então refazer aqui o layout de todas as mensagens só duplicava o trabalho
+
 
 class ResponseWindow(QtWidgets.QWidget):
     """Janela de resposta aprimorada com dimensionamento e controle de zoom melhorados"""
@@ -312,12 +369,18 @@ class ResponseWindow(QtWidgets.QWidget):
         self.loading_container = None
         self.chat_area = None
         self.chat_history = []
+        # Primeira resposta do modelo; não muda depois de conhecida
+        self.first_response = None
+        # Zoom compartilhado por todas as mensagens da janela
+        self.zoom_factor = 1.2
 
         # Configura a animação de "Pensando" com o conjunto completo de pontos
         self.thinking_timer = QtCore.QTimer(self)
         self.thinking_timer.timeout.connect(self.update_thinking_dots)
         self.thinking_dots_state = 0
         self.thinking_dots = ["", ".", "..", "..."]
+        # Os quatro textos possíveis da animação, montados uma única vez
+        self.thinking_texts = [_("Pensando") + dots for dots in self.thinking_dots]
         self.thinking_timer.setInterval(300)
 
         self.init_ui()
@@ -346,18 +409,14 @@ class ResponseWindow(QtWidgets.QWidget):
         top_bar = QtWidgets.QHBoxLayout()
         
         title_label = QtWidgets.QLabel(self.option)
-        title_label.setStyleSheet(f"font-size: 20px; font-weight: bold; color: {'#ffffff' if colorMode == 'dark' else '#333333'};")
+        title_label.setStyleSheet(TITLE_STYLE)
         top_bar.addWidget(title_label)
         
         top_bar.addStretch()
 
         # Rótulo de zoom
         zoom_label = QtWidgets.QLabel("Zoom:")
-        zoom_label.setStyleSheet(f"""
-            color: {'#aaaaaa' if colorMode == 'dark' else '#666666'};
-            font-size: 14px;
-            margin-right: 5px;
-        """)
+        zoom_label.setStyleSheet(ZOOM_LABEL_STYLE)
         top_bar.addWidget(zoom_label)
         
         # Controles de zoom com ordem alterada
@@ -369,7 +428,7 @@ class ResponseWindow(QtWidgets.QWidget):
             
         for icon, tooltip, action in zoom_controls:
             btn = QtWidgets.QPushButton()
-            btn.setIcon(QtGui.QIcon(os.path.join(os.path.dirname(sys.argv[0]), 'icons', icon + ('_dark' if colorMode == 'dark' else '_light') + '.png')))
+            set_themed_icon(btn, 'icons/' + icon)
             btn.setStyleSheet(self.get_button_style())
             btn.setToolTip(tooltip)
             btn.clicked.connect(action)
@@ -381,7 +440,7 @@ class ResponseWindow(QtWidgets.QWidget):
         # Barra de cópia com texto compatível
         copy_bar = QtWidgets.QHBoxLayout()
         copy_hint = QtWidgets.QLabel(_("Selecione para copiar com formatação"))
-        copy_hint.setStyleSheet(f"color: {'#aaaaaa' if colorMode == 'dark' else '#666666'}; font-size: 14px;")
+        copy_hint.setStyleSheet(HINT_STYLE)
         copy_bar.addWidget(copy_hint)
         copy_bar.addStretch()
         
@@ -397,14 +456,10 @@ class ResponseWindow(QtWidgets.QWidget):
         loading_layout.setContentsMargins(0, 0, 0, 0)
         
         self.loading_label = QtWidgets.QLabel(_("Pensando"))
-        self.loading_label.setStyleSheet(f"""
-            QLabel {{
-                color: {'#ffffff' if colorMode == 'dark' else '#333333'};
-                font-size: 18px;
-                padding: 20px;
-            }}
-        """)
+        self.loading_label.setStyleSheet(LOADING_LABEL_STYLE)
         self.loading_label.setAlignment(Qt.AlignLeft)
+        # Largura fixa: a troca dos pontos não invalida o layout dos widgets pais
+        self.loading_label.setFixedWidth(180)
         
         loading_inner_container = QtWidgets.QWidget()
         loading_inner_container.setFixedWidth(180)
@@ -431,32 +486,13 @@ class ResponseWindow(QtWidgets.QWidget):
         
         self.input_field = QtWidgets.QLineEdit()
         self.input_field.setPlaceholderText(_("Faça uma pergunta de acompanhamento") + "...")
-        self.input_field.setStyleSheet(f"""
-            QLineEdit {{
-                padding: 8px;
-                border: 1px solid {'#777' if colorMode == 'dark' else '#ccc'};
-                border-radius: 8px;
-                background-color: {'#333' if colorMode == 'dark' else 'white'};
-                color: {'#ffffff' if colorMode == 'dark' else '#000000'};
-                font-size: 14px;
-            }}
-        """)
+        self.input_field.setStyleSheet(INPUT_STYLE)
         self.input_field.returnPressed.connect(self.send_message)
         bottom_bar.addWidget(self.input_field)
         
         send_button = QtWidgets.QPushButton()
-        send_button.setIcon(QtGui.QIcon(os.path.join(os.path.dirname(sys.argv[0]), 'icons', 'send' + ('_dark' if colorMode == 'dark' else '_light') + '.png')))
-        send_button.setStyleSheet(f"""
-            QPushButton {{
-                background-color: {'#2e7d32' if colorMode == 'dark' else '#4CAF50'};
-                border: none;
-                border-radius: 8px;
-                padding: 5px;
-            }}
-            QPushButton:hover {{
-                background-color: {'#1b5e20' if colorMode == 'dark' else '#45a049'};
-            }}
-        """)
+        set_themed_icon(send_button, 'icons/send')
+        send_button.setStyleSheet(SEND_BUTTON_STYLE)
         send_button.setFixedSize(self.input_field.sizeHint().height(), self.input_field.sizeHint().height())
         send_button.clicked.connect(self.send_message)
         bottom_bar.addWidget(send_button)
@@ -466,13 +502,16 @@ class ResponseWindow(QtWidgets.QWidget):
     # Método para obter o texto da primeira resposta
     def get_first_response_text(self):
         """Obtém o texto da primeira resposta do modelo a partir do histórico de chat"""
+        if self.first_response is not None:
+            return self.first_response
         try:
             if not self.chat_history:
                 return None
                 
             for msg in self.chat_history:
                 if msg["role"] == "assistant":
-                    return msg["content"]
+                    self.first_response = msg["content"]
+                    return self.first_response
                     
             return None
         except Exception as e:
@@ -486,29 +525,17 @@ class ResponseWindow(QtWidgets.QWidget):
             QtWidgets.QApplication.clipboard().setText(response_text)
 
     def get_button_style(self):
-        return f"""
-            QPushButton {{
-                background-color: {'#444' if colorMode == 'dark' else '#f0f0f0'};
-                color: {'#ffffff' if colorMode == 'dark' else '#000000'};
-                border: 1px solid {'#666' if colorMode == 'dark' else '#ccc'};
-                border-radius: 5px;
-                padding: 8px;
-                font-size: 14px;
-            }}
-            QPushButton:hover {{
-                background-color: {'#555' if colorMode == 'dark' else '#e0e0e0'};
-            }}
-        """
+        return BUTTON_STYLE
 
     def update_thinking_dots(self):
         """Atualiza os pontos da animação de 'Pensando' com ciclo adequado"""
         self.thinking_dots_state = (self.thinking_dots_state + 1) % len(self.thinking_dots)
-        dots = self.thinking_dots[self.thinking_dots_state]
+        text = self.thinking_texts[self.thinking_dots_state]
         
         if self.loading_label.isVisible():
-            self.loading_label.setText(_("Pensando") + f"{dots}")
+            self.loading_label.setText(text)
         else:
-            self.input_field.setPlaceholderText(_("Pensando") + f"{dots}")
+            self.input_field.setPlaceholderText(text)
     
     def start_thinking_animation(self, initial=False):
         """Inicia a animação de 'Pensando' para carga inicial ou perguntas de acompanhamento"""
@@ -538,17 +565,21 @@ class ResponseWindow(QtWidgets.QWidget):
 
     def zoom_all_messages(self, action='in'):
         """Aplica a ação de zoom a todas as mensagens no chat"""
-        for i in range(self.chat_area.layout.count() - 1):  # Ignora o item stretch
-            item = self.chat_area.layout.itemAt(i)
-            if item and item.widget():
-                text_display = item.widget().layout().itemAt(0).widget()
-                if isinstance(text_display, MarkdownTextBrowser):
-                    if action == 'in':
-                        text_display.zoom_in()
-                    elif action == 'out':
-                        text_display.zoom_out()
-                    else:
-                        text_display.reset_zoom()
+        if action == 'in':
+            zoom_factor = min(3.0, self.zoom_factor * 1.1)
+        elif action == 'out':
+            zoom_factor = max(0.5, self.zoom_factor / 1.1)
+        else:
+            zoom_factor = 1.2  # Redefine para o zoom padrão
+        if zoom_factor == self.zoom_factor:
+            return
+        self.zoom_factor = zoom_factor
+
+        for text_display in self.chat_area.text_displays:
+            text_display.zoom_factor = zoom_factor
+            text_display._apply_zoom()
+            # A altura total da área de rolagem é recalculada uma única vez, abaixo
+            text_display._update_size(notify_scroll_area=False)
         
         self.chat_area.update_content_height()
         
@@ -608,26 +639,29 @@ class ResponseWindow(QtWidgets.QWidget):
             {"role": "user", "content": f"{self.option}: {self.selected_text}"},
             {"role": "assistant", "content": text}
         ]
+        self.first_response = text
         
         self.stop_thinking_animation()
         text_display = self.chat_area.add_message(text)
         
-        if hasattr(self.app.config, 'response_window_zoom'):
-            text_display.zoom_factor = self.app.config['response_window_zoom']
-            text_display._apply_zoom()
+        if 'response_window_zoom' in self.app.config:
+            self.zoom_factor = self.app.config['response_window_zoom']
+        text_display.zoom_factor = self.zoom_factor
+        text_display._apply_zoom()
         
         QtCore.QTimer.singleShot(100, self._adjust_window_height)
         
-    @Slot(str)
-    def handle_followup_response(self, response_text):
+    @Slot(object, str)
+    def handle_followup_response(self, response_window, response_text):
         """Trata a resposta de acompanhamento da IA com layout aprimorado"""
+        # O sinal é do aplicativo e chega a todas as janelas abertas; só a que perguntou a exibe
+        if response_window is not self:
+            return
         if response_text:
             self.loading_label.setVisible(False)
             text_display = self.chat_area.add_message(response_text)
-            
-            if hasattr(self, 'current_text_display'):
-                text_display.zoom_factor = self.current_text_display.zoom_factor
-                text_display._apply_zoom()
+            text_display.zoom_factor = self.zoom_factor
+            text_display._apply_zoom()
             
             if len(self.chat_history) > 0 and self.chat_history[-1]["role"] != "assistant":
                 self.chat_history.append({
@@ -650,9 +684,8 @@ class ResponseWindow(QtWidgets.QWidget):
         self.input_field.clear()
         
         text_display = self.chat_area.add_message(message, is_user=True)
-        if hasattr(self, 'current_text_display'):
-            text_display.zoom_factor = self.current_text_display.zoom_factor
-            text_display._apply_zoom()
+        text_display.zoom_factor = self.zoom_factor
+        text_display._apply_zoom()
         
         self.chat_history.append({"role": "user", "content": message})
         self.start_thinking_animation()
@@ -660,24 +693,24 @@ class ResponseWindow(QtWidgets.QWidget):
         
     def copy_as_markdown(self):
         """Copia a conversa como Markdown"""
-        markdown_text = ""
-        for msg in self.chat_history:
-            if msg["role"] == "user":
-                markdown_text += f"**Usuário**: {msg['content']}\n\n"
-            else:
-                markdown_text += f"**Assistente**: {msg['content']}\n\n"
-                
+        markdown_text = "".join(
+            f"**{'Usuário' if msg['role'] == 'user' else 'Assistente'}**: {msg['content']}\n\n"
+            for msg in self.chat_history
+        )
+
         QtWidgets.QApplication.clipboard().setText(markdown_text)
         
     def closeEvent(self, event):
         """Trata o evento de fechamento da janela"""
-        if hasattr(self, 'current_text_display'):
-            self.app.config['response_window_zoom'] = self.current_text_display.zoom_factor
-            self.app.save_config(self.app.config)
+        if self.app.config.get('response_window_zoom', 1.2) != self.zoom_factor:
+            self.app.config['response_window_zoom'] = self.zoom_factor
+            # A gravação em disco não atrasa o fechamento da janela
+            self.app.save_config_in_background(self.app.config)
 
         self.chat_history = []
+        self.first_response = None
         
-        if hasattr(self.app, 'current_response_window'):
-            delattr(self.app, 'current_response_window')
+        if self.app.current_response_window is self:
+            self.app.current_response_window = None
         
         super().closeEvent(event)
@@ -1,16 +1,58 @@
-import os
-import sys
-
 from aiprovider import AIProvider
 from PySide6 import QtCore, QtWidgets
-from PySide6.QtGui import QImage
 from PySide6.QtWidgets import QHBoxLayout, QRadioButton, QScrollArea
 
 from ui.AutostartManager import AutostartManager
-from ui.UIUtils import UIUtils, colorMode
+from ui.UIUtils import BORDER, BUTTON_BG, BUTTON_HOVER, INPUT_BG, INPUT_TEXT, NOTICE_COLOR, UIUtils, rounded_icon_pixmap
 
 _ = lambda x: x
 
+# Folhas de estilo da janela, montadas uma única vez para o tema em uso
+# (textos simples usam UIUtils.set_text_style; só os widgets compostos passam por QSS)
+INPUT_STYLE = f"""
+    font-size: 16px;
+    padding: 5px;
+    background-color: {INPUT_BG};
+    color: {INPUT_TEXT};
+    border: 1px solid {BORDER};
+"""
+PROVIDER_BUTTON_STYLE = f"""
+    QPushButton {{
+        background-color: {BUTTON_BG};
+        color: white;
+        padding: 10px;
+        font-size: 16px;
+        border: none;
+        border-radius: 5px;
+    }}
+    QPushButton:hover {{
+        background-color: {BUTTON_HOVER};
+    }}
+"""
+SCROLL_AREA_STYLE = """
+    QScrollArea {
+        background: transparent;
+        border: none;
+    }
+    QScrollArea > QWidget > QWidget {
+        background: transparent;
+    }
+    QScrollBar:vertical {
+        background-color: transparent;
+        width: 12px;
+        margin: 0px;
+    }
+    QScrollBar::handle:vertical {
+        background-color: rgba(128, 128, 128, 0.5);
+        min-height: 20px;
+        border-radius: 6px;
+        margin: 2px;
+    }
+    QScrollBar::add-line:vertical, QScrollBar::sub-line:vertical {
+        height: 0px;
+    }
+"""
+
 class SettingsWindow(QtWidgets.QWidget):
     """
     A janela de configurações do aplicativo.
@@ -21,12 +63,15 @@ class SettingsWindow(QtWidgets.QWidget):
     def __init__(self, app, providers_only=False):
         super().__init__()
         self.app = app
-        self.current_provider_layout = None
         self.providers_only = providers_only
+        # Modo em que a janela foi montada; save_settings altera providers_only depois da configuração inicial
+        self.built_providers_only = providers_only
         self.gradient_radio = None
         self.plain_radio = None
         self.provider_dropdown = None
-        self.provider_container = None
+        self.provider_stack = None
+        # Página de cada provedor, montada na primeira vez em que ele é selecionado
+        self.provider_pages = {}
         self.autostart_checkbox = None
         self.shortcut_input = None
         self.init_ui()
@@ -35,16 +80,48 @@ class SettingsWindow(QtWidgets.QWidget):
     def retranslate_ui(self):
         self.setWindowTitle(_("Configurações"))
 
-    def init_provider_ui(self, provider: AIProvider, layout):
+    @QtCore.Slot(int)
+    def show_provider_page(self, index):
         """
-        Inicializa a interface do provedor, incluindo logotipo, nome, descrição e todas as configurações.
+        Exibe a página do provedor selecionado, montando-a apenas na primeira vez.
         """
-        if self.current_provider_layout:
-            self.current_provider_layout.setParent(None)
-            UIUtils.clear_layout(self.current_provider_layout)
-            self.current_provider_layout.deleteLater()
+        provider = self.app.providers[index]
+        # Com a janela visível, a troca é pintada uma única vez, depois de montada e posicionada
+        self.provider_stack.setUpdatesEnabled(False)
+        try:
+            page = self.provider_pages.get(provider.provider_name)
+            if page is None:
+                page = QtWidgets.QWidget()
+                page_layout = QtWidgets.QVBoxLayout(page)
+                page_layout.setContentsMargins(0, 0, 0, 0)
+                self.init_provider_ui(provider, page_layout)
+                self.provider_stack.addWidget(page)
+                self.provider_pages[provider.provider_name] = page
+
+            # Só a página visível conta para a altura da pilha; as outras não reservam espaço na rolagem
+            current = self.provider_stack.currentWidget()
+            if current is not None and current is not page:
+                current.setSizePolicy(QtWidgets.QSizePolicy.Policy.Ignored, QtWidgets.QSizePolicy.Policy.Ignored)
+            page.setSizePolicy(QtWidgets.QSizePolicy.Policy.Preferred, QtWidgets.QSizePolicy.Policy.Preferred)
+            self.provider_stack.setCurrentWidget(page)
+            self.provider_stack.adjustSize()
+        finally:
+            self.provider_stack.setUpdatesEnabled(True)
 
-        self.current_provider_layout = QtWidgets.QVBoxLayout()
+    @staticmethod
+    def make_provider_button(text, action):
+        """
+        Cria um botão de ação do provedor já estilizado e conectado.
+        """
+        button = QtWidgets.QPushButton(text)
+        button.setStyleSheet(PROVIDER_BUTTON_STYLE)
+        button.clicked.connect(action)
+        return button
+
+    def init_provider_ui(self, provider: AIProvider, layout):
+        """
+        Monta no layout fornecido a interface do provedor, incluindo logotipo, nome, descrição e todas as configurações.
+        """
 
         # Cria um layout horizontal para o logotipo e o nome do provedor
         provider_header_layout = QtWidgets.QHBoxLayout()
@@ -52,87 +129,44 @@ class SettingsWindow(QtWidgets.QWidget):
         provider_header_layout.setAlignment(QtCore.Qt.AlignmentFlag.AlignCenter)
 
         if provider.logo:
-            logo_path = os.path.join(os.path.dirname(sys.argv[0]), 'icons', f"provider_{provider.logo}.png")
-            if os.path.exists(logo_path):
-                targetPixmap = UIUtils.resize_and_round_image(QImage(logo_path), 30, 15)
+            targetPixmap = rounded_icon_pixmap(f"provider_{provider.logo}.png", 30, 15)
+            if targetPixmap is not None:
                 logo_label = QtWidgets.QLabel()
                 logo_label.setPixmap(targetPixmap)
                 logo_label.setAlignment(QtCore.Qt.AlignmentFlag.AlignVCenter)
                 provider_header_layout.addWidget(logo_label)
 
         provider_name_label = QtWidgets.QLabel(provider.provider_name)
-        provider_name_label.setStyleSheet(f"font-size: 18px; font-weight: bold; color: {'#ffffff' if colorMode == 'dark' else '#333333'};")
+        UIUtils.set_text_style(provider_name_label, 18, bold=True)
         provider_name_label.setAlignment(QtCore.Qt.AlignmentFlag.AlignVCenter)
         provider_header_layout.addWidget(provider_name_label)
 
-        self.current_provider_layout.addLayout(provider_header_layout)
+        layout.addLayout(provider_header_layout)
 
         if provider.description:
             description_label = QtWidgets.QLabel(provider.description)
-            description_label.setStyleSheet(f"font-size: 16px; color: {'#ffffff' if colorMode == 'dark' else '#333333'}; text-align: center;")
+            UIUtils.set_text_style(description_label, 16)
             description_label.setWordWrap(True)
-            self.current_provider_layout.addWidget(description_label)
+            layout.addWidget(description_label)
 
         if hasattr(provider, 'ollama_button_text'):
             # Cria um contêiner para os botões
             button_layout = QtWidgets.QHBoxLayout()
             
             # Adiciona o botão de configuração do Ollama
-            ollama_button = QtWidgets.QPushButton(provider.ollama_button_text)
-            ollama_button.setStyleSheet(f"""
-                QPushButton {{
-                    background-color: {'#4CAF50' if colorMode == 'dark' else '#008CBA'};
-                    color: white;
-                    padding: 10px;
-                    font-size: 16px;
-                    border: none;
-                    border-radius: 5px;
-                }}
-                QPushButton:hover {{
-                    background-color: {'#45a049' if colorMode == 'dark' else '#007095'};
-                }}
-            """)
-            ollama_button.clicked.connect(provider.ollama_button_action)
+            ollama_button = self.make_provider_button(provider.ollama_button_text, provider.ollama_button_action)
             button_layout.addWidget(ollama_button)
             
             # Adiciona o botão original
-            main_button = QtWidgets.QPushButton(provider.button_text)
-            main_button.setStyleSheet(f"""
-                QPushButton {{
-                    background-color: {'#4CAF50' if colorMode == 'dark' else '#008CBA'};
-                    color: white;
-                    padding: 10px;
-                    font-size: 16px;
-                    border: none;
-                    border-radius: 5px;
-                }}
-                QPushButton:hover {{
-                    background-color: {'#45a049' if colorMode == 'dark' else '#007095'};
-                }}
-            """)
-            main_button.clicked.connect(provider.button_action)
+            main_button = self.make_provider_button(provider.button_text, provider.button_action)
             button_layout.addWidget(main_button)
             
-            self.current_provider_layout.addLayout(button_layout)
+            layout.addLayout(button_layout)
         else:
             # Lógica original para botão único
             if provider.button_text:
-                button = QtWidgets.QPushButton(provider.button_text)
-                button.setStyleSheet(f"""
-                    QPushButton {{
-                        background-color: {'#4CAF50' if colorMode == 'dark' else '#008CBA'};
-                        color: white;
-                        padding: 10px;
-                        font-size: 16px;
-                        border: none;
-                        border-radius: 5px;
-                    }}
-                    QPushButton:hover {{
-                        background-color: {'#45a049' if colorMode == 'dark' else '#007095'};
-                    }}
-                """)
-                button.clicked.connect(provider.button_action)
-                self.current_provider_layout.addWidget(button, alignment=QtCore.Qt.AlignmentFlag.AlignCenter)
+                button = self.make_provider_button(provider.button_text, provider.button_action)
+                layout.addWidget(button, alignment=QtCore.Qt.AlignmentFlag.AlignCenter)
 
         # Inicializa a configuração se necessário
         if "providers" not in self.app.config:
@@ -143,9 +177,7 @@ class SettingsWindow(QtWidgets.QWidget):
         # Adiciona as configurações do provedor
         for setting in provider.settings:
             setting.set_value(self.app.config["providers"][provider.provider_name].get(setting.name, setting.default_value))
-            setting.render_to_layout(self.current_provider_layout)
-
-        layout.addLayout(self.current_provider_layout)
+            setting.render_to_layout(layout)
 
     def init_ui(self):
         """
@@ -169,36 +201,11 @@ class SettingsWindow(QtWidgets.QWidget):
         scroll_area.setFrameShape(QtWidgets.QFrame.Shape.NoFrame)
         scroll_area.setHorizontalScrollBarPolicy(QtCore.Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
 
-        # Cria o widget para o conteúdo rolável
-        scroll_content = QtWidgets.QWidget()
-        scroll_content.setStyleSheet("background: transparent;")
-        
         # Estiliza a área de rolagem para transparência
-        scroll_area.setStyleSheet("""
-            QScrollArea {
-                background: transparent;
-                border: none;
-            }
-            QScrollArea > QWidget > QWidget {
-                background: transparent;
-            }
-            QScrollBar:vertical {
-                background-color: transparent;
-                width: 12px;
-                margin: 0px;
-            }
-            QScrollBar::handle:vertical {
-                background-color: rgba(128, 128, 128, 0.5);
-                min-height: 20px;
-                border-radius: 6px;
-                margin: 2px;
-            }
-            QScrollBar::add-line:vertical, QScrollBar::sub-line:vertical {
-                height: 0px;
-            }
-        """)
+        scroll_area.setStyleSheet(SCROLL_AREA_STYLE)
 
         # Cria um widget para conter o conteúdo rolável
+        # A transparência vem da regra QScrollArea > QWidget > QWidget de SCROLL_AREA_STYLE
         scroll_content = QtWidgets.QWidget()
         content_layout = QtWidgets.QVBoxLayout(scroll_content)
         content_layout.setContentsMargins(30, 30, 30, 30)
@@ -206,42 +213,36 @@ class SettingsWindow(QtWidgets.QWidget):
 
         if not self.providers_only:
             title_label = QtWidgets.QLabel(_("Configurações"))
-            title_label.setStyleSheet(f"font-size: 24px; font-weight: bold; color: {'#ffffff' if colorMode == 'dark' else '#333333'};")
+            UIUtils.set_text_style(title_label, 24, bold=True)
             content_layout.addWidget(title_label, alignment=QtCore.Qt.AlignmentFlag.AlignCenter)
 
             # Adiciona a caixa de seleção de inicialização automática para a versão compilada no Windows
             if AutostartManager.get_startup_path():
                 self.autostart_checkbox = QtWidgets.QCheckBox(_("Iniciar com o Sistema"))
-                self.autostart_checkbox.setStyleSheet(f"font-size: 16px; color: {'#ffffff' if colorMode == 'dark' else '#333333'};")
+                UIUtils.set_text_style(self.autostart_checkbox, 16)
                 self.autostart_checkbox.setChecked(AutostartManager.check_autostart())
                 self.autostart_checkbox.stateChanged.connect(self.toggle_autostart)
                 content_layout.addWidget(self.autostart_checkbox)
 
             # Adiciona o campo de entrada para a tecla de atalho
             shortcut_label = QtWidgets.QLabel(_("Tecla de Atalho:"))
-            shortcut_label.setStyleSheet(f"font-size: 16px; color: {'#ffffff' if colorMode == 'dark' else '#333333'};")
+            UIUtils.set_text_style(shortcut_label, 16)
             content_layout.addWidget(shortcut_label)
 
             self.shortcut_input = QtWidgets.QLineEdit(self.app.config.get('shortcut', 'ctrl+space'))
-            self.shortcut_input.setStyleSheet(f"""
-                font-size: 16px;
-                padding: 5px;
-                background-color: {'#444' if colorMode == 'dark' else 'white'};
-                color: {'#ffffff' if colorMode == 'dark' else '#000000'};
-                border: 1px solid {'#666' if colorMode == 'dark' else '#ccc'};
-            """)
+            self.shortcut_input.setStyleSheet(INPUT_STYLE)
             content_layout.addWidget(self.shortcut_input)
 
             # Adiciona a seleção de tema de fundo
             theme_label = QtWidgets.QLabel(_("Tema de Fundo:"))
-            theme_label.setStyleSheet(f"font-size: 16px; color: {'#ffffff' if colorMode == 'dark' else '#333333'};")
+            UIUtils.set_text_style(theme_label, 16)
             content_layout.addWidget(theme_label)
 
             theme_layout = QHBoxLayout()
             self.gradient_radio = QRadioButton(_("Gradiente Difuso"))
             self.plain_radio = QRadioButton(_("Simples"))
-            self.gradient_radio.setStyleSheet(f"color: {'#ffffff' if colorMode == 'dark' else '#333333'};")
-            self.plain_radio.setStyleSheet(f"color: {'#ffffff' if colorMode == 'dark' else '#333333'};")
+            UIUtils.set_text_style(self.gradient_radio)
+            UIUtils.set_text_style(self.plain_radio)
             current_theme = self.app.config.get('theme', 'gradient')
             self.gradient_radio.setChecked(current_theme == 'gradient')
             self.plain_radio.setChecked(current_theme == 'plain')
@@ -251,17 +252,11 @@ class SettingsWindow(QtWidgets.QWidget):
 
         # Adiciona a seleção de provedor de IA
         provider_label = QtWidgets.QLabel(_("Escolha o Provedor de IA:"))
-        provider_label.setStyleSheet(f"font-size: 16px; color: {'#ffffff' if colorMode == 'dark' else '#333333'};")
+        UIUtils.set_text_style(provider_label, 16)
         content_layout.addWidget(provider_label)
 
         self.provider_dropdown = QtWidgets.QComboBox()
-        self.provider_dropdown.setStyleSheet(f"""
-            font-size: 16px;
-            padding: 5px;
-            background-color: {'#444' if colorMode == 'dark' else 'white'};
-            color: {'#ffffff' if colorMode == 'dark' else '#000000'};
-            border: 1px solid {'#666' if colorMode == 'dark' else '#ccc'};
-        """)
+        self.provider_dropdown.setStyleSheet(INPUT_STYLE)
         self.provider_dropdown.setInsertPolicy(QtWidgets.QComboBox.InsertPolicy.NoInsert)
 
         current_provider = self.app.config.get('provider', self.app.providers[0].provider_name)
@@ -271,29 +266,20 @@ class SettingsWindow(QtWidgets.QWidget):
         content_layout.addWidget(self.provider_dropdown)
 
         # Adiciona um separador horizontal
-        line = QtWidgets.QFrame()
-        line.setFrameShape(QtWidgets.QFrame.Shape.HLine)
-        line.setFrameShadow(QtWidgets.QFrame.Shadow.Sunken)
-        content_layout.addWidget(line)
+        content_layout.addWidget(UIUtils.make_hline())
 
-        # Cria o contêiner para a interface do provedor
-        self.provider_container = QtWidgets.QVBoxLayout()
-        content_layout.addLayout(self.provider_container)
+        # Cria a pilha com as páginas dos provedores
+        self.provider_stack = QtWidgets.QStackedWidget()
+        content_layout.addWidget(self.provider_stack)
 
         # Inicializa a interface do provedor
-        provider_instance = self.app.providers[self.provider_dropdown.currentIndex()]
-        self.init_provider_ui(provider_instance, self.provider_container)
+        self.show_provider_page(self.provider_dropdown.currentIndex())
 
         # Conecta a alteração do provedor na lista
-        self.provider_dropdown.currentIndexChanged.connect(
-            lambda: self.init_provider_ui(self.app.providers[self.provider_dropdown.currentIndex()], self.provider_container)
-        )
+        self.provider_dropdown.currentIndexChanged.connect(self.show_provider_page)
 
         # Adiciona outro separador horizontal
-        line = QtWidgets.QFrame()
-        line.setFrameShape(QtWidgets.QFrame.Shape.HLine)
-        line.setFrameShadow(QtWidgets.QFrame.Shadow.Sunken)
-        content_layout.addWidget(line)
+        content_layout.addWidget(UIUtils.make_hline())
 
         # Configura a área rolável com o conteúdo
         scroll_area.setWidget(scroll_content)
@@ -307,20 +293,7 @@ class SettingsWindow(QtWidgets.QWidget):
         bottom_layout.setSpacing(10)
 
         # Adiciona o botão de salvar ao contêiner inferior
-        save_button = QtWidgets.QPushButton((_('Concluir Configuração da IA') if self.providers_only else _('Salvar')))
-        save_button.setStyleSheet("""
-            QPushButton {
-                background-color: #4CAF50;
-                color: white;
-                padding: 10px;
-                font-size: 16px;
-                border: none;
-                border-radius: 5px;
-            }
-            QPushButton:hover {
-                background-color: #45a049;
-            }
-        """)
+        save_button = UIUtils.make_primary_button(_('Concluir Configuração da IA') if self.providers_only else _('Salvar'))
         save_button.clicked.connect(self.save_settings)
         bottom_layout.addWidget(save_button)
 
@@ -330,7 +303,7 @@ class SettingsWindow(QtWidgets.QWidget):
             "</p>"
 
             restart_notice = QtWidgets.QLabel(restart_text)
-            restart_notice.setStyleSheet(f"font-size: 15px; color: {'#cccccc' if colorMode == 'dark' else '#555555'}; font-style: italic;")
+            UIUtils.set_text_style(restart_notice, 15, NOTICE_COLOR, italic=True)
             restart_notice.setWordWrap(True)
             bottom_layout.addWidget(restart_notice)
 
@@ -342,10 +315,37 @@ class SettingsWindow(QtWidgets.QWidget):
         desired_height = min(720, max_height)  # Limita a 720px ou 85% da altura da tela
         self.resize(592, desired_height)  # Usa uma largura exata de 592px para uma boa apresentação
 
+    def sync_from_config(self):
+        """
+        Atualiza os campos de uma janela reaproveitada com os valores atuais da configuração,
+        descartando alterações que não foram salvas.
+        """
+        if not self.providers_only:
+            if self.autostart_checkbox:
+                self.autostart_checkbox.blockSignals(True)
+                self.autostart_checkbox.setChecked(AutostartManager.check_autostart())
+                self.autostart_checkbox.blockSignals(False)
+            self.shortcut_input.setText(self.app.config.get('shortcut', 'ctrl+space'))
+            current_theme = self.app.config.get('theme', 'gradient')
+            self.gradient_radio.setChecked(current_theme == 'gradient')
+            self.plain_radio.setChecked(current_theme == 'plain')
+
+        current_provider = self.app.config.get('provider', self.app.providers[0].provider_name)
+        self.provider_dropdown.setCurrentIndex(self.provider_dropdown.findText(current_provider))
+
+        providers_config = self.app.config.get("providers", {})
+        for provider in self.app.providers:
+            if provider.provider_name not in self.provider_pages:
+                continue
+            provider_config = providers_config.get(provider.provider_name, {})
+            for setting in provider.settings:
+                setting.set_value(provider_config.get(setting.name, setting.default_value))
+                setting.update_widget()
+
     @staticmethod
     def toggle_autostart(state):
         """Alterna a configuração de inicialização automática."""
-        AutostartManager.set_autostart(state == 2)
+        AutostartManager.sync_autostart(state == 2)
 
     def save_settings(self):
         """Salva as configurações atuais."""
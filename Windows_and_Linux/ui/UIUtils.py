@@ -1,5 +1,8 @@
+import functools
 import os
 import sys
+import threading
+import webbrowser
 
 from PySide6 import QtGui, QtCore, QtWidgets
 from PySide6.QtGui import QImage, QPixmap
@@ -7,6 +10,109 @@ from PySide6.QtGui import QImage, QPixmap
 import darkdetect
 colorMode = 'dark' if darkdetect.isDark() else 'light'
 
+# Cores compartilhadas pelas folhas de estilo, resolvidas uma única vez para o tema em uso
+IS_DARK = colorMode == 'dark'
+TEXT_COLOR = '#ffffff' if IS_DARK else '#333333'
+INPUT_BG = '#444' if IS_DARK else 'white'
+INPUT_TEXT = '#ffffff' if IS_DARK else '#000000'
+BORDER = '#666' if IS_DARK else '#ccc'
+BUTTON_BG = '#4CAF50' if IS_DARK else '#008CBA'
+BUTTON_HOVER = '#45a049' if IS_DARK else '#007095'
+NOTICE_COLOR = '#cccccc' if IS_DARK else '#555555'
+
+# Botão de ação principal (Salvar, Próximo), igual nos dois temas
+PRIMARY_BUTTON_STYLE = """
+    QPushButton {
+        background-color: #4CAF50;
+        color: white;
+        padding: 10px;
+        font-size: 16px;
+        border: none;
+        border-radius: 5px;
+    }
+    QPushButton:hover {
+        background-color: #45a049;
+    }
+"""
+
+# Caminhos do aplicativo, resolvidos uma única vez na importação
+APP_DIR = os.path.dirname(os.path.abspath(sys.argv[0]))
+ICON_DIR = os.path.join(APP_DIR, 'icons')
+APP_ICON_PATH = os.path.join(ICON_DIR, 'app_icon.png')
+# Imagens de fundo do tema gradiente, por (é popup, modo escuro)
+BG_PATHS = {
+    (False, False): os.path.join(APP_DIR, 'background.png'),
+    (False, True): os.path.join(APP_DIR, 'background_dark.png'),
+    (True, False): os.path.join(APP_DIR, 'background_popup.png'),
+    (True, True): os.path.join(APP_DIR, 'background_popup_dark.png'),
+}
+
+
+@functools.lru_cache(maxsize=1)
+def available_icons():
+    """
+    Lista a pasta de ícones uma única vez; as verificações seguintes não acessam o disco.
+    """
+    try:
+        return frozenset(os.listdir(ICON_DIR))
+    except FileNotFoundError:
+        return frozenset()
+
+
+@functools.lru_cache(maxsize=None)
+def themed_icon(rel):
+    """
+    Retorna o QIcon compartilhado da variante clara/escura de `rel` (ex.: 'icons/pencil'),
+    ou None se o arquivo não existir.
+    """
+    directory, name = os.path.split(rel)
+    filename = name + ('_dark' if colorMode == 'dark' else '_light') + '.png'
+    if directory == 'icons':
+        if filename not in available_icons():
+            return None
+        return QtGui.QIcon(os.path.join(ICON_DIR, filename))
+    path = os.path.join(APP_DIR, directory, filename)
+    return QtGui.QIcon(path) if os.path.exists(path) else None
+
+
+@functools.lru_cache(maxsize=None)
+def rounded_icon_pixmap(filename, image_size, rounding_amount):
+    """
+    Retorna o QPixmap redimensionado e arredondado de icons/`filename`, gerado uma única vez,
+    ou None se o arquivo não existir.
+    """
+    if filename not in available_icons():
+        return None
+    return UIUtils.resize_and_round_image(QImage(os.path.join(ICON_DIR, filename)), image_size, rounding_amount)
+
+
+@functools.lru_cache(maxsize=None)
+def background_pixmap(is_popup):
+    """
+    Retorna a imagem de fundo do tema gradiente (da janela ou do popup), lida do disco uma única vez.
+    """
+    return QtGui.QPixmap(BG_PATHS[(is_popup, IS_DARK)])
+
+
+@functools.lru_cache(maxsize=None)
+def rounded_clip_path(image_size, rounding_amount):
+    """
+    Retorna o contorno arredondado usado para recortar imagens de um tamanho, montado uma única vez.
+    """
+    clip_path = QtGui.QPainterPath()
+    clip_path.addRoundedRect(0, 0, image_size, image_size, rounding_amount, rounding_amount)
+    return clip_path
+
+
+def set_themed_icon(button, rel):
+    """
+    Aplica ao botão o ícone temático de `rel`, se existir.
+    """
+    icon = themed_icon(rel)
+    if icon is not None:
+        button.setIcon(icon)
+
+
 class UIUtils:
     @classmethod
     def clear_layout(cls, layout):
@@ -21,16 +127,56 @@ class UIUtils:
             else:
                 child.widget().deleteLater()
 
+    @classmethod
+    def set_text_style(cls, widget, pixel_size=None, color=TEXT_COLOR, bold=False, italic=False):
+        """
+        Define a fonte e a cor do texto pela paleta, sem passar pelo analisador de folhas de estilo.
+        """
+        font = widget.font()
+        if pixel_size:
+            font.setPixelSize(pixel_size)
+        font.setBold(bold)
+        font.setItalic(italic)
+        widget.setFont(font)
+        palette = widget.palette()
+        palette.setColor(QtGui.QPalette.ColorRole.WindowText, QtGui.QColor(color))
+        widget.setPalette(palette)
+
+    @classmethod
+    def make_hline(cls):
+        """
+        Cria um separador horizontal.
+        """
+        line = QtWidgets.QFrame()
+        line.setFrameShape(QtWidgets.QFrame.Shape.HLine)
+        line.setFrameShadow(QtWidgets.QFrame.Shadow.Sunken)
+        return line
+
+    @classmethod
+    def make_primary_button(cls, text):
+        """
+        Cria um botão de ação principal já estilizado.
+        """
+        button = QtWidgets.QPushButton(text)
+        button.setStyleSheet(PRIMARY_BUTTON_STYLE)
+        return button
+
+    @classmethod
+    def open_url_async(cls, url):
+        """
+        Abre a URL no navegador em uma thread separada, sem bloquear a interface
+        (no Linux, o xdg-open pode levar centenas de milissegundos).
+        """
+        threading.Thread(target=webbrowser.open, args=(url,), daemon=True).start()
+
     @classmethod
     def resize_and_round_image(cls, image, image_size=100, rounding_amount=50):
         image = image.scaledToWidth(image_size)
-        clipPath = QtGui.QPainterPath()
-        clipPath.addRoundedRect(0, 0, image_size, image_size, rounding_amount, rounding_amount)
         target = QImage(image_size, image_size, QImage.Format_ARGB32)
         target.fill(QtCore.Qt.GlobalColor.transparent)
         painter = QtGui.QPainter(target)
         painter.setRenderHint(QtGui.QPainter.RenderHint.Antialiasing)
-        painter.setClipPath(clipPath)
+        painter.setClipPath(rounded_clip_path(image_size, rounding_amount))
         painter.drawImage(0, 0, image)
         painter.end()
         targetPixmap = QPixmap.fromImage(target)
@@ -39,9 +185,8 @@ class UIUtils:
     @classmethod
     def setup_window_and_layout(cls, base: QtWidgets.QWidget):
         # Define o ícone da janela
-        icon_path = os.path.join(os.path.dirname(sys.argv[0]), 'icons', 'app_icon.png')
-        if os.path.exists(icon_path):
-            base.setWindowIcon(QtGui.QIcon(icon_path))
+        if 'app_icon.png' in available_icons():
+            base.setWindowIcon(QtGui.QIcon(APP_ICON_PATH))
         main_layout = QtWidgets.QVBoxLayout(base)
         main_layout.setContentsMargins(0, 0, 0, 0)
         base.background = ThemeBackground(base, 'gradient')
@@ -58,6 +203,24 @@ class ThemeBackground(QtWidgets.QWidget):
         self.theme = theme
         self.is_popup = is_popup
         self.border_radius = border_radius
+        # Fundo já escalado para o tamanho atual: (largura, altura, escala do dispositivo, pixmap)
+        self.scaled_background = None
+
+    def get_scaled_background(self):
+        """
+        Retorna o fundo escalado para o tamanho do widget, refazendo a escala só quando o tamanho muda.
+        """
+        dpr = self.devicePixelRatioF()
+        width, height = self.width(), self.height()
+        if self.scaled_background is None or self.scaled_background[:3] != (width, height, dpr):
+            pixmap = background_pixmap(self.is_popup).scaled(
+                int(width * dpr), int(height * dpr),
+                QtCore.Qt.AspectRatioMode.IgnoreAspectRatio,
+                QtCore.Qt.TransformationMode.SmoothTransformation
+            )
+            pixmap.setDevicePixelRatio(dpr)
+            self.scaled_background = (width, height, dpr, pixmap)
+        return self.scaled_background[3]
 
     def paintEvent(self, event):
         """
@@ -67,17 +230,12 @@ class ThemeBackground(QtWidgets.QWidget):
         painter.setRenderHint(QtGui.QPainter.RenderHint.Antialiasing, True)
         painter.setRenderHint(QtGui.QPainter.RenderHint.SmoothPixmapTransform, True)
         if self.theme == 'gradient':
-            if self.is_popup:
-                background_image = QtGui.QPixmap(os.path.join(os.path.dirname(sys.argv[0]),
-                                                               'background_popup_dark.png' if colorMode == 'dark' else 'background_popup.png'))
-            else:
-                background_image = QtGui.QPixmap(os.path.join(os.path.dirname(sys.argv[0]),
-                                                               'background_dark.png' if colorMode == 'dark' else 'background.png'))
+            background_image = self.get_scaled_background()
             # Adiciona um caminho/borda utilizando o qual o raio da borda será desenhado
             path = QtGui.QPainterPath()
             path.addRoundedRect(0, 0, self.width(), self.height(), self.border_radius, self.border_radius)
             painter.setClipPath(path)
-            painter.drawPixmap(self.rect(), background_image)
+            painter.drawPixmap(0, 0, background_image)
         else:
             if colorMode == 'dark':
                 color = QtGui.QColor(35, 35, 35)  # Cor para modo escuro
@@ -1,74 +1,114 @@
 import logging
-import threading
-import time
 from urllib.error import HTTPError
-from urllib.request import URLError, urlopen
+from urllib.request import Request, URLError, urlopen
+
+from PySide6 import QtCore
 
 CURRENT_VERSION = 7
 UPDATE_CHECK_URL = "https://raw.githubusercontent.com/theJayTea/WritingTools/main/Windows_and_Linux/Latest_Version_for_Update_Check.txt"
 UPDATE_DOWNLOAD_URL = "https://github.com/theJayTea/WritingTools/releases"
+# Novas tentativas após falha, com espera de 2s, 4s, ... agendada em um QTimer
+MAX_RETRIES = 2
+RETRY_BASE_DELAY = 2
+MAX_VERSION_BYTES = 16
+
+class UpdateFetcherSignals(QtCore.QObject):
+    fetched = QtCore.Signal(object, int)
+
+class UpdateFetcher(QtCore.QRunnable):
+    """
+    Busca a versão mais recente em uma thread do pool; o resultado volta à thread da interface por sinal.
+    """
+    def __init__(self, fetch, attempt):
+        super().__init__()
+        self.fetch = fetch
+        self.attempt = attempt
+        self.signals = UpdateFetcherSignals()
+
+    def run(self):
+        self.signals.fetched.emit(self.fetch(), self.attempt)
 
-class UpdateChecker:
+class UpdateChecker(QtCore.QObject):
     def __init__(self, app):
+        super().__init__()
         self.app = app
-        
+        self.fetcher = None
+        # Validadores da última resposta, para que o GitHub possa responder 304 sem reenviar o arquivo
+        self._etag = app.config.get('update_etag')
+        self._last_mod = app.config.get('update_last_mod')
+        self._cached_version = app.config.get('update_cached_version')
+
     def _fetch_latest_version(self):
         """
-        Busca o número da versão mais recente no GitHub.
+        Busca o número da versão mais recente no GitHub com uma requisição condicional.
         Retorna o número da versão ou None se falhar.
         """
+        headers = {}
+        if self._cached_version is not None:
+            if self._etag:
+                headers['If-None-Match'] = self._etag
+            if self._last_mod:
+                headers['If-Modified-Since'] = self._last_mod
         try:
-            with urlopen(UPDATE_CHECK_URL, timeout=5) as response:
-                data = response.read().decode('utf-8').strip()
+            with urlopen(Request(UPDATE_CHECK_URL, headers=headers), timeout=5) as response:
+                # O arquivo contém só um número pequeno; limitar a leitura evita baixar um corpo inesperado
+                data = response.read(MAX_VERSION_BYTES)
                 try:
-                    return int(data)
+                    version = int(data)
                 except ValueError:
-                    logging.warning(f"Formato de número de versão inválido: {data}")
+                    logging.warning(f"Formato de número de versão inválido: {data!r}")
                     return None
-        except (URLError, HTTPError) as e:
+                self._etag = response.headers.get('ETag')
+                self._last_mod = response.headers.get('Last-Modified')
+                self._cached_version = version
+                return version
+        except HTTPError as e:
+            if e.code == 304:
+                # Arquivo inalterado desde a última verificação
+                return self._cached_version
+            logging.warning(f"Falha ao buscar informações de versão: {e}")
+            return None
+        except URLError as e:
             logging.warning(f"Falha ao buscar informações de versão: {e}")
             return None
         except Exception as e:
             logging.error(f"Erro inesperado ao verificar atualizações: {e}")
             return None
 
-    def _retry_fetch_version(self):
+    @QtCore.Slot(object, int)
+    def on_version_fetched(self, latest_version, attempt):
         """
-        Tenta buscar a versão com uma única nova tentativa.
+        Recebe, na thread da interface, o resultado da busca e atualiza a configuração conforme necessário.
+        Em caso de falha, agenda uma nova tentativa com espera exponencial sem ocupar nenhuma thread.
         """
-        result = self._fetch_latest_version()
-        if result is None:
-            # Aguarda 2 segundos antes de tentar novamente
-            time.sleep(2)
-            result = self._fetch_latest_version()
-        return result
-
-    def check_updates(self):
-        """
-        Verifica se uma atualização está disponível.
-        Sempre compara com o valor na nuvem e atualiza a configuração conforme necessário.
-        Retorna True se uma atualização estiver disponível.
-        """
-        latest_version = self._retry_fetch_version()
-        
+        self.fetcher = None
         if latest_version is None:
-            return False
+            if attempt < MAX_RETRIES:
+                QtCore.QTimer.singleShot(RETRY_BASE_DELAY * 1000 * 2 ** attempt,
+                                         lambda: self.check_updates_async(attempt + 1))
+            return
             
         update_available = latest_version > CURRENT_VERSION
-        
+
+        config = self.app.config
+        new_values = {
+            'update_etag': self._etag,
+            'update_last_mod': self._last_mod,
+            'update_cached_version': latest_version,
+        }
         # Sempre atualiza a configuração com o status atualizado
-        if "update_available" in self.app.config or update_available:
-            self.app.config["update_available"] = update_available
-            self.app.save_config(self.app.config)
-            
-        return update_available
+        if "update_available" in config or update_available:
+            new_values["update_available"] = update_available
+
+        # Só grava no disco quando algo mudou (no caso comum, a resposta foi 304)
+        if any(config.get(k) != v for k, v in new_values.items()):
+            config.update(new_values)
+            self.app.save_config(config)
 
-    def check_updates_async(self):
+    def check_updates_async(self, attempt=0):
         """
-        Realiza a verificação de atualizações em uma thread em segundo plano.
+        Realiza a verificação de atualizações no pool de threads global.
         """
-        def check_thread():
-            self.check_updates()
-            
-        thread = threading.Thread(target=check_thread, daemon=True)
-        thread.start()
+        self.fetcher = UpdateFetcher(self._fetch_latest_version, attempt)
+        self.fetcher.signals.fetched.connect(self.on_version_fetched)
+        QtCore.QThreadPool.globalInstance().start(self.fetcher)